@@ -0,0 +1,351 @@
+"""Local job-queue HTTP API around the scraper engine
+
+Run with:  python api_server.py
+
+Endpoints (JSON unless noted):
+    POST   /jobs                   submit {"business_tag", "region", "city", "district", "list_only"}
+    GET    /jobs                   list jobs
+    GET    /jobs/{id}              job status
+    GET    /jobs/{id}/results      paginated results (?page=1&page_size=100)
+    GET    /jobs/{id}/events       live status/results as server-sent events
+    DELETE /jobs/{id}              cancel a queued or running job
+
+Finished jobs are dropped after API_FINISHED_JOB_TTL_MINUTES or beyond
+API_MAX_FINISHED_JOBS - fetch their results before then.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from config import *
+from scraper import GoogleMapsScraper, SearchSession
+from models import BusinessRecord
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+
+class BadRequest(ValueError):
+    """Malformed HTTP request - answered with 400"""
+
+
+class Job:
+    """One submitted search with its results and live subscribers"""
+
+    def __init__(self, params: Dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = JOB_QUEUED
+        self.message = ''
+        self.results: List[BusinessRecord] = []
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.session: Optional[SearchSession] = None
+        self.subscribers: List[asyncio.Queue] = []
+
+    def summary(self) -> Dict:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'message': self.message,
+            'params': self.params,
+            'result_count': len(self.results),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+    def publish(self, event: str, payload):
+        for subscriber in self.subscribers:
+            subscriber.put_nowait((event, payload))
+
+
+class JobManager:
+    """Queue of jobs run as concurrent sessions on one shared scraper browser"""
+
+    def __init__(self, concurrency: int = API_CONCURRENT_JOBS):
+        self.concurrency = concurrency
+        self.jobs: Dict[str, Job] = {}
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.scraper = GoogleMapsScraper()
+        self._workers: List[asyncio.Task] = []
+
+    def start(self):
+        for _ in range(self.concurrency):
+            self._workers.append(asyncio.create_task(self._serve()))
+
+    async def close(self):
+        for task in self._workers:
+            task.cancel()
+        self.scraper.stop()
+        await self.scraper.close()
+
+    def submit(self, params: Dict) -> Job:
+        self.evict()
+        job = Job(params)
+        self.jobs[job.id] = job
+        self.queue.put_nowait(job)
+        return job
+
+    def cancel(self, job: Job):
+        if job.status == JOB_QUEUED:
+            self._finish(job, JOB_CANCELLED)
+        elif job.status == JOB_RUNNING and job.session:
+            job.session.stop()
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        job.publish('complete', job.summary())
+        self.evict()
+
+    def evict(self):
+        """Forget finished jobs past API_FINISHED_JOB_TTL_MINUTES or beyond API_MAX_FINISHED_JOBS"""
+        expired_before = time.time() - API_FINISHED_JOB_TTL_MINUTES * 60
+        finished = sorted((job for job in self.jobs.values() if job.status in FINISHED_STATES),
+                          key=lambda job: job.finished_at)
+        excess = len(finished) - API_MAX_FINISHED_JOBS
+        for index, job in enumerate(finished):
+            if index < excess or job.finished_at < expired_before:
+                del self.jobs[job.id]
+
+    async def _serve(self):
+        """Job slot - runs queued jobs one after another, each in its own session"""
+        while True:
+            job = await self.queue.get()
+            if job.status != JOB_QUEUED:
+                continue  # Cancelled while waiting
+
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            job.publish('status', job.summary())
+
+            def on_status(message, job=job):
+                job.message = message
+                job.publish('status', {'message': message})
+
+            def on_data(record, job=job):
+                job.results.append(record)
+                job.publish('data', record.to_dict())
+
+            # The job keeps its own results
+            job.session = self.scraper.new_session(keep_results=False, on_status_update=on_status, on_data_found=on_data)
+            try:
+                await self.scraper.search(**job.params, session=job.session)
+                self._finish(job, JOB_DONE if job.session.is_running else JOB_CANCELLED)
+            except Exception as e:
+                job.message = f"Search error: {e}"
+                self._finish(job, JOB_FAILED)
+            finally:
+                job.session = None
+
+
+class ApiServer:
+    """Minimal HTTP/1.1 front end (stdlib only) for the job manager"""
+
+    def __init__(self, manager: JobManager):
+        self.manager = manager
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            method, path, query, body = request
+            await self._route(writer, method, path, query, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except BadRequest as e:
+            try:
+                await self._send_json(writer, 400, {'error': str(e)})
+            except ConnectionError:
+                pass
+        except Exception as e:
+            print(f"API error: {e}")
+            try:
+                await self._send_json(writer, 500, {'error': 'internal server error'})
+            except ConnectionError:
+                pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _read_request(self, reader) -> Optional[Tuple[str, str, Dict, bytes]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise BadRequest('malformed request line')
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise BadRequest('invalid Content-Length')
+        body = await reader.readexactly(length) if length else b''
+        url = urlparse(target)
+        return method.upper(), url.path.rstrip('/') or '/', parse_qs(url.query), body
+
+    async def _route(self, writer, method: str, path: str, query: Dict, body: bytes):
+        parts = [part for part in path.split('/') if part]
+        if not parts or parts[0] != 'jobs':
+            return await self._send_json(writer, 404, {'error': 'not found'})
+
+        if len(parts) == 1:
+            if method == 'POST':
+                return await self._submit(writer, body)
+            if method == 'GET':
+                jobs = [job.summary() for job in self.manager.jobs.values()]
+                return await self._send_json(writer, 200, {'jobs': jobs})
+            return await self._send_json(writer, 405, {'error': 'method not allowed'})
+
+        job = self.manager.jobs.get(parts[1])
+        if not job:
+            return await self._send_json(writer, 404, {'error': 'job not found'})
+
+        if len(parts) == 2 and method == 'GET':
+            return await self._send_json(writer, 200, job.summary())
+        if len(parts) == 2 and method == 'DELETE':
+            self.manager.cancel(job)
+            return await self._send_json(writer, 200, job.summary())
+        if len(parts) == 3 and parts[2] == 'results' and method == 'GET':
+            return await self._send_results(writer, job, query)
+        if len(parts) == 3 and parts[2] == 'events' and method == 'GET':
+            return await self._stream_events(writer, job)
+        return await self._send_json(writer, 404, {'error': 'not found'})
+
+    async def _submit(self, writer, body: bytes):
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            return await self._send_json(writer, 400, {'error': 'body must be JSON'})
+        if not isinstance(payload, dict):
+            return await self._send_json(writer, 400, {'error': 'body must be a JSON object'})
+
+        params = {
+            'business_tag': str(payload.get('business_tag', '')).strip(),
+            'region': str(payload.get('region', '')).strip(),
+            'city': str(payload.get('city', '')).strip(),
+            'district': str(payload.get('district', '') or '').strip(),
+            'list_only': bool(payload.get('list_only', False)),
+        }
+        if not params['business_tag'] or not params['city']:
+            return await self._send_json(writer, 400, {'error': 'business_tag and city are required'})
+
+        job = self.manager.submit(params)
+        await self._send_json(writer, 201, job.summary())
+
+    async def _send_results(self, writer, job: Job, query: Dict):
+        try:
+            page = max(1, int(query.get('page', ['1'])[0]))
+            page_size = int(query.get('page_size', [str(API_PAGE_SIZE)])[0])
+        except ValueError:
+            return await self._send_json(writer, 400, {'error': 'page and page_size must be integers'})
+        page_size = min(max(1, page_size), API_MAX_PAGE_SIZE)
+
+        start = (page - 1) * page_size
+        await self._send_json(writer, 200, {
+            'job_id': job.id,
+            'status': job.status,
+            'page': page,
+            'page_size': page_size,
+            'total': len(job.results),
+            'items': [record.to_dict() for record in job.results[start:start + page_size]],
+        })
+
+    async def _stream_events(self, writer, job: Job):
+        """Server-sent events: replay results so far, then stream until the job finishes"""
+        writer.write(b'HTTP/1.1 200 OK\r\n'
+                     b'Content-Type: text/event-stream\r\n'
+                     b'Cache-Control: no-cache\r\n'
+                     b'Connection: close\r\n\r\n')
+
+        subscriber: asyncio.Queue = asyncio.Queue()
+        job.subscribers.append(subscriber)
+        try:
+            self._write_event(writer, 'status', job.summary())
+            for record in list(job.results):
+                self._write_event(writer, 'data', record.to_dict())
+            if job.status in FINISHED_STATES:
+                self._write_event(writer, 'complete', job.summary())
+                await writer.drain()
+                return
+            await writer.drain()
+
+            while True:
+                try:
+                    event, payload = await asyncio.wait_for(subscriber.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    writer.write(b': keep-alive\n\n')
+                    await writer.drain()
+                    continue
+                self._write_event(writer, event, payload)
+                # Send everything already queued before waiting on the socket
+                while not subscriber.empty():
+                    event, payload = subscriber.get_nowait()
+                    self._write_event(writer, event, payload)
+                await writer.drain()
+                if event == 'complete':
+                    return
+        finally:
+            job.subscribers.remove(subscriber)
+
+    @staticmethod
+    def _write_event(writer, event: str, payload):
+        data = json.dumps(payload, ensure_ascii=False)
+        writer.write(f"event: {event}\ndata: {data}\n\n".encode('utf-8'))
+
+    @staticmethod
+    async def _send_json(writer, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+
+
+async def serve(host: str = API_HOST, port: int = API_PORT):
+    """Run the API until interrupted"""
+    manager = JobManager()
+    manager.start()
+    api = ApiServer(manager)
+    server = await asyncio.start_server(api.handle, host, port)
+    print(f"Job API listening on http://{host}:{port} ({manager.concurrency} concurrent jobs)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await manager.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,117 @@
+"""Headless batch runner - run one or more searches without the desktop UI
+
+Examples:
+    python batch.py --tag "Dental Clinic" --region Makkah --city Jeddah
+    python batch.py --queries campaigns.csv     # columns: tag,region,city,district
+    python batch.py --queries campaigns.csv --parallel 3   # 3 searches at once, one browser
+    python batch.py --tag "Cafe" --city Riyadh --list-only   # result cards only, no place pages
+    python batch.py --dead-letters exports/dead_letters/<run_id>.json
+    python batch.py --tag "Cafe" --city Riyadh --profile   # hot spots + traces in exports/profiles/
+
+With BROWSER_MODE = "server" every run reuses the shared warm browser
+(see browser_server.py) instead of cold-starting Chromium.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import time
+from typing import Dict, List, Optional
+from scraper import GoogleMapsScraper
+from exporter import export_to_excel
+
+
+def load_queries(args) -> List[Dict]:
+    """Build the list of searches from the command line or a CSV file"""
+    if args.queries:
+        with open(args.queries, newline='', encoding='utf-8-sig') as f:
+            return [
+                {
+                    'tag': row.get('tag', '').strip(),
+                    'region': row.get('region', '').strip(),
+                    'city': row.get('city', '').strip(),
+                    'district': (row.get('district') or '').strip(),
+                }
+                for row in csv.DictReader(f)
+                if row.get('tag') and row.get('city')
+            ]
+    if not (args.tag and args.city):
+        return []
+    return [{'tag': args.tag, 'region': args.region or '', 'city': args.city, 'district': args.district or ''}]
+
+
+async def run_dead_letters(path: str):
+    """Re-run only the failed places saved by an earlier run"""
+    scraper = GoogleMapsScraper()
+    session = scraper.session
+    session.on_status_update = lambda message: print(f"    {message}")
+    try:
+        await scraper.rerun_dead_letters(path)
+        if session.results:
+            filepath = export_to_excel(session.results)
+            print(f"    Exported {len(session.results)} rows -> {filepath}")
+    finally:
+        await scraper.close()
+
+
+async def run_batch(queries: List[Dict], list_only: bool = False, parallel: int = 1, profile: bool = False,
+                    summary_path: Optional[str] = None):
+    """Run the searches on a single browser, up to `parallel` at a time"""
+    scraper = GoogleMapsScraper()
+    scraper.profile = scraper.profile or profile
+    slots = asyncio.Semaphore(max(1, parallel))
+    summary = []
+    started = time.monotonic()
+
+    async def run_query(index: int, query: Dict):
+        label = f"[{index}/{len(queries)}]"
+        # Own session per search - dedup state and results never mix
+        session = scraper.new_session(on_status_update=lambda message: print(f"    {label} {message}"))
+        async with slots:
+            print(f"{label} {query['tag']} | {query['city']} {query['district']}".rstrip())
+            await scraper.search(query['tag'], query['region'], query['city'], query['district'],
+                                 list_only=list_only, session=session)
+        meter = session.meter.snapshot()
+        summary.append({**query, 'results': len(session.results), 'dead_letters': len(session.dead_letters),
+                        'queued': meter['queued'], 'done': meter['done'], 'seconds': meter['elapsed_seconds']})
+        if session.results:
+            filepath = export_to_excel(session.results)
+            print(f"    {label} Exported {len(session.results)} rows -> {filepath}")
+
+    try:
+        await asyncio.gather(*(run_query(index, query) for index, query in enumerate(queries, 1)))
+    finally:
+        await scraper.close()
+        if summary_path:
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump({'seconds': time.monotonic() - started, 'queries': summary}, f, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Google Maps searches without the desktop UI")
+    parser.add_argument('--tag', help="Business type, e.g. 'Dental Clinic'")
+    parser.add_argument('--region', help="Region / province")
+    parser.add_argument('--city', help="City")
+    parser.add_argument('--district', help="District (optional)")
+    parser.add_argument('--queries', help="CSV file with tag,region,city,district columns")
+    parser.add_argument('--list-only', action='store_true', help="Take records from the result cards only (fast, no phones/emails)")
+    parser.add_argument('--parallel', type=int, default=1, help="Searches to run at once (they share MAX_CONCURRENT_PAGES)")
+    parser.add_argument('--profile', action='store_true', help="Write a profile (hot spots, slow callbacks, page traces) per run")
+    parser.add_argument('--summary', help="Write per-search counts and timings to this JSON file")
+    parser.add_argument('--dead-letters', help="Re-run the failed places saved in this file")
+    args = parser.parse_args()
+
+    if args.dead_letters:
+        asyncio.run(run_dead_letters(args.dead_letters))
+        return
+
+    queries = load_queries(args)
+    if not queries:
+        parser.error("give --tag and --city, or --queries FILE")
+    asyncio.run(run_batch(queries, list_only=args.list_only, parallel=args.parallel,
+                          profile=args.profile, summary_path=args.summary))
+
+
+if __name__ == "__main__":
+    main()
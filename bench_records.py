@@ -0,0 +1,53 @@
+"""Memory benchmark - legacy result dicts vs BusinessRecord
+
+Run with:  python bench_records.py [count]     (default 50000)
+"""
+
+import sys
+import tracemalloc
+from models import BusinessRecord
+
+
+def legacy_row(i: int) -> dict:
+    """Result dict as the engine produced it before BusinessRecord"""
+    return {
+        'name': f"Business {i}",
+        'phone': f"+966 5{i:08d}",
+        'address': f"{i} King Fahd Rd, Riyadh",
+        'website': f"https://business{i}.example.sa" if i % 2 else 'N/A',
+        'emails': f"info@business{i}.example.sa" if i % 3 else 'N/A',
+        'socials': 'N/A',
+        'latitude': f"{24.7 + i / 1e6:.7f}",
+        'longitude': f"{46.6 + i / 1e6:.7f}",
+        'rating': f"{3 + (i % 20) / 10:.1f}",
+        'url': f"https://www.google.com/maps/place/business-{i}",
+    }
+
+
+def record(i: int) -> BusinessRecord:
+    return BusinessRecord.from_dict(legacy_row(i))
+
+
+def measure(factory, count: int) -> int:
+    """Bytes still allocated after building count items"""
+    tracemalloc.start()
+    items = [factory(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    legacy = measure(legacy_row, count)
+    compact = measure(record, count)
+
+    print(f"{count:,} records")
+    print(f"  dict rows       : {legacy / 1e6:8.1f} MB  ({legacy / count:6.0f} B/record)")
+    print(f"  BusinessRecord  : {compact / 1e6:8.1f} MB  ({compact / count:6.0f} B/record)")
+    print(f"  saved           : {(legacy - compact) / 1e6:8.1f} MB  ({100 * (legacy - compact) / legacy:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
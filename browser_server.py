@@ -0,0 +1,126 @@
+"""Long-lived shared Chromium for warm reconnects across app restarts and batch runs
+
+Usage:
+    python browser_server.py start     # launch the shared browser (no-op if running)
+    python browser_server.py status    # health check
+    python browser_server.py stop      # close the shared browser
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+from config import *
+
+
+def endpoint_url(port: int = BROWSER_SERVER_PORT) -> str:
+    """CDP endpoint of the shared browser"""
+    return f"http://127.0.0.1:{port}"
+
+
+def server_version(port: int = BROWSER_SERVER_PORT, timeout: float = 0.5) -> Optional[Dict]:
+    """Health check - DevTools version document, or None if the server is not answering"""
+    try:
+        with urllib.request.urlopen(f"{endpoint_url(port)}/json/version", timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def launch_server(executable: str, args: List[str], port: int = BROWSER_SERVER_PORT,
+                  profile_dir: str = BROWSER_PROFILE_DIR, headless: bool = HEADLESS) -> subprocess.Popen:
+    """Start a detached Chromium that outlives the current process"""
+    profile_path = Path(profile_dir).absolute()
+    profile_path.mkdir(parents=True, exist_ok=True)
+
+    command = [
+        executable,
+        f'--remote-debugging-port={port}',
+        '--remote-debugging-address=127.0.0.1',
+        f'--user-data-dir={profile_path}',
+        '--no-first-run',
+        '--no-default-browser-check',
+        *args,
+    ]
+    if headless:
+        command.append('--headless=new')
+    command.append('about:blank')
+
+    kwargs = {}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
+
+
+async def wait_until_ready(port: int = BROWSER_SERVER_PORT, timeout: float = 15.0) -> bool:
+    """Poll the health check until the server answers or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if await asyncio.to_thread(server_version, port):
+            return True
+        await asyncio.sleep(0.2)
+    return False
+
+
+async def _start():
+    if server_version():
+        print(f"Shared browser already running at {endpoint_url()}")
+        return 0
+
+    from playwright.async_api import async_playwright
+    from scraper import SERVER_BROWSER_ARGS
+
+    async with async_playwright() as playwright:
+        executable = playwright.chromium.executable_path
+    launch_server(executable, SERVER_BROWSER_ARGS)
+    if await wait_until_ready():
+        print(f"Shared browser started at {endpoint_url()}")
+        return 0
+    print("Shared browser did not start in time")
+    return 1
+
+
+async def _stop():
+    if not server_version():
+        print("Shared browser is not running")
+        return 0
+
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.connect_over_cdp(endpoint_url())
+        session = await browser.new_browser_cdp_session()
+        try:
+            await session.send('Browser.close')
+        except Exception:
+            pass  # The connection drops while the browser exits
+    print("Shared browser stopped")
+    return 0
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'start':
+        sys.exit(asyncio.run(_start()))
+    elif command == 'stop':
+        sys.exit(asyncio.run(_stop()))
+    elif command == 'status':
+        version = server_version()
+        if version:
+            print(f"Running at {endpoint_url()} - {version.get('Browser', 'unknown')}")
+            sys.exit(0)
+        print("Not running")
+        sys.exit(1)
+    else:
+        print(__doc__)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Calibrate concurrency and timing settings for this machine and network
+
+Runs short probe searches (batch.py in a subprocess, capped at
+CALIBRATION_PROBE_RESULTS places) over a grid of settings, measures extracted
+places per minute and the failed-place share, and writes the best combination
+to TUNED_PROFILE_PATH - config.py loads it at startup in place of the defaults.
+
+By default one setting group is tuned at a time (the best value is kept before
+moving to the next group); --full-grid tries every combination.
+
+Examples:
+    python calibrate.py --tag "Cafe" --region Riyadh --city Riyadh --headless
+    python calibrate.py --tag "Dental Clinic" --city Jeddah --full-grid --repeats 2
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from config import *
+
+# Setting groups and the candidate values tried for each
+GRID = {
+    'pages': [{'MAX_CONCURRENT_PAGES': n} for n in (3, 4, 6, 8)],
+    'scroll': [{'SCROLL_PAUSE_MIN': low, 'SCROLL_PAUSE_MAX': high} for low, high in ((1.0, 2.0), (1.5, 2.5), (2.0, 3.5))],
+    'click': [{'CLICK_DELAY_MIN': low, 'CLICK_DELAY_MAX': high} for low, high in ((0.5, 1.0), (1.0, 2.0))],
+    'scroll_attempts': [{'MAX_SCROLL_ATTEMPTS': n} for n in (8, 15)],
+    'website': [{'WEBSITE_TIMEOUT': site, 'CONTACT_PAGE_TIMEOUT': contact} for site, contact in ((6000, 4000), (10000, 6000))],
+    'navigation': [{'PLACE_NAVIGATION': 'page'}] + [{'PLACE_NAVIGATION': 'panel', 'PANEL_TABS': n} for n in (2, 4)],
+}
+
+BATCH_SCRIPT = Path(__file__).with_name('batch.py')
+
+
+def current_settings() -> Dict:
+    """The tunables as loaded now - the defaults or the current tuned profile"""
+    return {name: globals()[name] for name in TUNABLE_SETTINGS}
+
+
+def run_trial(settings: Dict, args) -> Dict:
+    """One probe search with these settings - returns yield/min and error rate"""
+    overrides = dict(settings, MAX_RESULTS=args.probe_results)
+    if args.headless:
+        overrides['HEADLESS'] = True
+    env = dict(os.environ, SCRAPER_SETTINGS=json.dumps(overrides), SCRAPER_TUNED_PROFILE='off')
+
+    fd, summary_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    command = [sys.executable, str(BATCH_SCRIPT), '--tag', args.tag, '--region', args.region or '',
+               '--city', args.city, '--summary', summary_path]
+    started = time.monotonic()
+    try:
+        subprocess.run(command, env=env, timeout=args.trial_timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(summary_path, encoding='utf-8') as f:
+            summary = json.load(f)
+    except (subprocess.TimeoutExpired, OSError, ValueError):
+        summary = {'queries': []}
+    finally:
+        os.remove(summary_path)
+
+    seconds = time.monotonic() - started
+    results = sum(q['results'] for q in summary['queries'])
+    done = sum(q['done'] for q in summary['queries'])
+    failed = sum(q['dead_letters'] for q in summary['queries'])
+    return {
+        'settings': settings,
+        'results': results,
+        'seconds': round(seconds, 1),
+        'yield_per_min': round(results / seconds * 60, 2) if seconds else 0.0,
+        'error_rate': round(failed / done, 3) if done else 1.0,
+    }
+
+
+def measure(settings: Dict, args, trials: List[Dict]) -> Dict:
+    """Average of --repeats trials (each logged in `trials`)"""
+    runs = [run_trial(settings, args) for _ in range(args.repeats)]
+    trials.extend(runs)
+    result = {
+        'settings': settings,
+        'yield_per_min': sum(r['yield_per_min'] for r in runs) / len(runs),
+        'error_rate': max(r['error_rate'] for r in runs),
+    }
+    ok = result['error_rate'] <= args.max_error_rate
+    print(f"  {result['yield_per_min']:7.1f}/min  errors {result['error_rate']:5.1%}  "
+          f"{'' if ok else '(rejected) '}{json.dumps(settings)}")
+    return result
+
+
+def best_of(results: List[Dict], max_error_rate: float) -> Optional[Dict]:
+    usable = [r for r in results if r['error_rate'] <= max_error_rate and r['yield_per_min'] > 0]
+    return max(usable, key=lambda r: r['yield_per_min']) if usable else None
+
+
+def calibrate(args) -> Optional[Dict]:
+    """Search the grid and return the best measured result"""
+    trials: List[Dict] = []
+    if args.full_grid:
+        results = []
+        for combination in itertools.product(*GRID.values()):
+            settings = current_settings()
+            for group in combination:
+                settings.update(group)
+            results.append(measure(settings, args, trials))
+        best = best_of(results, args.max_error_rate)
+    else:
+        best = None
+        settings = current_settings()
+        measured: Dict[str, Dict] = {}
+        for group, candidates in GRID.items():
+            print(f"[{group}]")
+            results = []
+            for candidate in candidates:
+                trial_settings = dict(settings, **candidate)
+                key = json.dumps(trial_settings, sort_keys=True)
+                if key not in measured:
+                    measured[key] = measure(trial_settings, args, trials)
+                results.append(measured[key])
+            group_best = best_of(results, args.max_error_rate)
+            if group_best:
+                best = group_best
+                settings = dict(group_best['settings'])
+    if best:
+        best['trials'] = trials
+    return best
+
+
+def write_profile(best: Dict, args, path: str = TUNED_PROFILE_PATH):
+    profile = {
+        'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': platform.node(),
+        'probe': {'tag': args.tag, 'region': args.region, 'city': args.city, 'results': args.probe_results},
+        'settings': best['settings'],
+        'yield_per_min': round(best['yield_per_min'], 2),
+        'error_rate': best['error_rate'],
+        'trials': best['trials'],
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune concurrency and timing settings with probe searches")
+    parser.add_argument('--tag', required=True, help="Business type for the probe searches")
+    parser.add_argument('--region', default='', help="Region / province")
+    parser.add_argument('--city', required=True, help="City")
+    parser.add_argument('--probe-results', type=int, default=CALIBRATION_PROBE_RESULTS, help="Places per probe search")
+    parser.add_argument('--repeats', type=int, default=1, help="Probe searches per setting combination")
+    parser.add_argument('--max-error-rate', type=float, default=CALIBRATION_MAX_ERROR_RATE)
+    parser.add_argument('--trial-timeout', type=float, default=600, help="Seconds before a probe is abandoned")
+    parser.add_argument('--full-grid', action='store_true', help="Try every combination instead of one group at a time")
+    parser.add_argument('--headless', action='store_true', help="Run the probes without a visible browser")
+    parser.add_argument('--output', default=TUNED_PROFILE_PATH)
+    args = parser.parse_args()
+
+    best = calibrate(args)
+    if not best:
+        print("No setting combination stayed under the error limit - profile not written")
+        sys.exit(1)
+    write_profile(best, args, args.output)
+    print(f"Best: {best['yield_per_min']:.1f} places/min, errors {best['error_rate']:.1%}")
+    print(f"Tuned profile written to {args.output} (SCRAPER_TUNED_PROFILE=off to ignore it)")
+
+
+if __name__ == "__main__":
+    main()
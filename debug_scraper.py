@@ -1,175 +1,194 @@
-"""Debug script to analyze Google Maps page structure - Fixed version"""
+"""Selector health and latency profiler for the Google Maps pages the engine reads
 
+Runs the engine's own selector lists (scraper.py) against a results page and a
+place page - live, or saved with --save-html for offline runs - and times each
+selector, counts its matches and keeps sample values. Writes a JSON report and
+exits with 1 when a primary (first-listed) selector of a required field stops
+matching, 2 when a page could not be loaded.
+
+Examples:
+    python debug_scraper.py                                   # live search with the default query
+    python debug_scraper.py --query "Dental Clinic Jeddah" --save-html cache/pages
+    python debug_scraper.py --results-html cache/pages/results.html --place-html cache/pages/place.html
+"""
+
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
 from urllib.parse import quote
+from config import *
+from scraper import (
+    GoogleMapsScraper, CONTAINER_SELECTORS, LINK_SELECTORS, NAME_SELECTORS, PHONE_SELECTORS,
+    ADDRESS_SELECTORS, CATEGORY_SELECTOR, WEBSITE_SELECTOR,
+)
+
+DEFAULT_QUERY = "شركة مركبات المحميدية جدة"
+
+RESULTS_FIELDS = {
+    'container': CONTAINER_SELECTORS,
+    'link': LINK_SELECTORS,
+}
+
+PLACE_FIELDS = {
+    'name': NAME_SELECTORS,
+    'phone': PHONE_SELECTORS,
+    'address': ADDRESS_SELECTORS,
+    'category': [CATEGORY_SELECTOR],
+    'website': [WEBSITE_SELECTOR],
+}
+
+# Fields every page has - a miss here breaks every place (others vary per business)
+REQUIRED_FIELDS = ('container', 'link', 'name', 'address')
+
+SAMPLE_VALUES = 3
+
+EXIT_OK = 0
+EXIT_PRIMARY_MISS = 1
+EXIT_LOAD_FAILED = 2
+
 
-async def debug_maps():
-    print("=" * 60)
-    print("DEBUG: Starting Google Maps Analysis")
-    print("=" * 60)
-    
-    playwright = await async_playwright().start()
-    
-    browser = await playwright.chromium.launch(
-        headless=False,
-        args=['--disable-blink-features=AutomationControlled']
-    )
-    
-    context = await browser.new_context(
-        viewport={'width': 1920, 'height': 1080},
-        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-        locale='en-US',
-    )
-    
-    page = await context.new_page()
-    
-    # Search query
-    query = "شركة مركبات المحميدية جدة"
-    maps_url = f"https://www.google.com/maps/search/{quote(query)}?hl=en"
-    
-    print(f"\n1. Navigating to: {maps_url}")
-    
-    # FIX: Use domcontentloaded instead of networkidle
-    await page.goto(maps_url, wait_until='domcontentloaded', timeout=30000)
-    print(f"   Page DOM loaded!")
-    
-    print(f"\n2. Current URL: {page.url}")
-    
-    # Wait for results panel
-    print("\n3. Waiting for results panel...")
+async def probe_selector(page, selector: str, timeout: int) -> Dict:
+    """Time until the selector matches (a miss costs the full timeout), its count and samples"""
+    started = time.perf_counter()
     try:
-        await page.wait_for_selector('div.m6QErb, div[role="feed"], div.Nv2PK', timeout=15000)
-        print("   Results panel found!")
-    except:
-        print("   WARNING: Results panel not detected via selector")
-    
-    # Additional wait for dynamic content
-    print("\n4. Waiting 5 seconds for dynamic content...")
-    await asyncio.sleep(5)
-    
-    # Check for various container selectors
-    print("\n5. Testing container selectors:")
-    container_selectors = [
-        'div[role="feed"]',
-        'div[role="main"]',
-        'div.m6QErb',
-        'div.m6QErb.DxyBCb',
-        'div[aria-label*="Results"]',
-        'div.Nv2PK',
-        'div.ecceSd',
-    ]
-    
-    for selector in container_selectors:
+        await page.wait_for_selector(selector, state='attached', timeout=timeout)
+        wait_ms = (time.perf_counter() - started) * 1000
+    except Exception:
+        wait_ms = None
+    locator = page.locator(selector)
+    count = await locator.count()
+    samples = []
+    for element in (await locator.all())[:SAMPLE_VALUES]:
         try:
-            count = await page.locator(selector).count()
-            print(f"   {selector}: {count} found")
-        except Exception as e:
-            print(f"   {selector}: ERROR - {str(e)[:50]}")
-    
-    # Check for link selectors
-    print("\n6. Testing link selectors:")
-    link_selectors = [
-        'a[href*="/maps/place/"]',
-        'a.hfpxzc',
-        'a[data-value]',
-        'div.Nv2PK a',
-        'a[href*="maps"]',
-        'div.bfdHYd a',
-        'a[jsaction]',
-    ]
-    
-    for selector in link_selectors:
-        try:
-            count = await page.locator(selector).count()
-            print(f"   {selector}: {count} found")
-            if count > 0 and count < 10:
-                links = await page.locator(selector).all()
-                for i, link in enumerate(links[:3]):
-                    href = await link.get_attribute('href')
-                    if href:
-                        print(f"      Sample {i+1}: {href[:80]}...")
-        except Exception as e:
-            print(f"   {selector}: ERROR - {str(e)[:50]}")
-    
-    # Try to find ALL links on the page
-    print("\n7. All links containing 'place' or 'maps':")
-    try:
-        all_links = await page.locator('a').all()
-        print(f"   Total <a> tags on page: {len(all_links)}")
-        
-        place_links = []
-        for link in all_links[:100]:  # Check first 100
-            try:
-                href = await link.get_attribute('href')
-                if href and ('place' in href or '/maps/' in href):
-                    place_links.append(href)
-            except:
-                pass
-        
-        print(f"   Links with 'place' or '/maps/': {len(place_links)}")
-        for i, href in enumerate(place_links[:5]):
-            print(f"      {i+1}: {href[:100]}...")
-    except Exception as e:
-        print(f"   ERROR: {str(e)}")
-    
-    # Check page content for links
-    print("\n8. Searching in page HTML:")
-    try:
-        content = await page.content()
-        import re
-        
-        # Find all href patterns
-        hrefs = re.findall(r'href="([^"]*place[^"]*)"', content)
-        print(f"   Found {len(hrefs)} href patterns with 'place'")
-        for href in hrefs[:5]:
-            print(f"      {href[:100]}...")
-        
-        # Check for specific patterns
-        patterns = [
-            (r'/maps/place/', "Standard place links"),
-            (r'data-value=', "Data-value attributes"),
-            (r'role="feed"', "Feed role containers"),
-            (r'class="[^"]*hfpxzc[^"]*"', "hfpxzc class"),
-            (r'class="[^"]*Nv2PK[^"]*"', "Nv2PK class (result cards)"),
-        ]
-        
-        print("\n   Pattern matches in HTML:")
-        for pattern, desc in patterns:
-            matches = len(re.findall(pattern, content))
-            print(f"      {desc}: {matches}")
-    except Exception as e:
-        print(f"   ERROR: {str(e)}")
-    
-    # Try scrolling and check again
-    print("\n9. Scrolling the results panel...")
+            value = await element.get_attribute('href', timeout=500) or await element.inner_text(timeout=500)
+            samples.append(value.strip()[:120])
+        except Exception:
+            continue
+    return {
+        'selector': selector,
+        'hits': count,
+        'wait_ms': round(wait_ms, 1) if wait_ms is not None else None,
+        'cost_ms': round((time.perf_counter() - started) * 1000, 1),
+        'samples': samples,
+    }
+
+
+async def probe_fields(page, fields: Dict[str, List[str]], timeout: int) -> Dict[str, List[Dict]]:
+    return {field: [await probe_selector(page, selector, timeout) for selector in selectors]
+            for field, selectors in fields.items()}
+
+
+async def load(page, source: str, is_file: bool) -> float:
+    """Open a live URL or a saved .html file - returns load time in ms"""
+    started = time.perf_counter()
+    url = Path(source).resolve().as_uri() if is_file else source
+    await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def first_place_url(results: Dict[str, List[Dict]]) -> Optional[str]:
+    for entry in results.get('link', []):
+        for sample in entry['samples']:
+            if '/maps/place/' in sample:
+                return sample if sample.startswith('http') else f"https://www.google.com{sample}"
+    return None
+
+
+def check(report: Dict) -> List[str]:
+    """'page.field: selector' for required fields whose primary selector missed"""
+    misses = []
+    for page_name in ('results_page', 'place_page'):
+        for field, entries in report.get(page_name, {}).get('fields', {}).items():
+            if field in REQUIRED_FIELDS and entries and entries[0]['hits'] == 0:
+                misses.append(f"{page_name}.{field}: {entries[0]['selector']}")
+    return misses
+
+
+def print_report(report: Dict):
+    for page_name in ('results_page', 'place_page'):
+        section = report.get(page_name)
+        if not section:
+            continue
+        print(f"\n{page_name} - {section['source']} (loaded in {section['load_ms']:.0f} ms)")
+        for field, entries in section['fields'].items():
+            for index, entry in enumerate(entries):
+                marker = '*' if index == 0 else ' '
+                wait = f"{entry['wait_ms']:.0f} ms" if entry['wait_ms'] is not None else "miss"
+                print(f"  {marker} {field:<10} {entry['hits']:>4} hits  {wait:>8}  {entry['selector']}")
+    if report['primary_misses']:
+        print("\nPrimary selectors not matching:")
+        for miss in report['primary_misses']:
+            print(f"  {miss}")
+
+
+async def profile(args) -> Dict:
+    scraper = GoogleMapsScraper()
+    report = {'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'timeout_ms': args.timeout}
     try:
-        # Find scrollable container
-        scrollable = page.locator('div.m6QErb').first
-        if await scrollable.count() > 0:
-            for i in range(3):
-                await scrollable.evaluate('el => el.scrollBy(0, 500)')
-                await asyncio.sleep(1)
-            
-            # Check links again
-            links_after = await page.locator('a[href*="/maps/place/"]').count()
-            links_hfpxzc = await page.locator('a.hfpxzc').count()
-            print(f"   Links after scroll (a[href*='/maps/place/']): {links_after}")
-            print(f"   Links after scroll (a.hfpxzc): {links_hfpxzc}")
+        await scraper.ensure_browser()
+        page = await scraper.context.new_page()
+
+        if args.results_html:
+            source, is_file = args.results_html, True
         else:
-            print("   Could not find scrollable container")
+            source, is_file = f"https://www.google.com/maps/search/{quote(args.query)}?hl=en", False
+        load_ms = await load(page, source, is_file)
+        if not is_file:
+            await scraper._handle_cookie_consent(page)
+        fields = await probe_fields(page, RESULTS_FIELDS, args.timeout)
+        report['results_page'] = {'source': source, 'load_ms': load_ms, 'fields': fields}
+        if args.save_html:
+            Path(args.save_html).mkdir(parents=True, exist_ok=True)
+            (Path(args.save_html) / 'results.html').write_text(await page.content(), encoding='utf-8')
+
+        place_source, is_file = (args.place_html, True) if args.place_html else (args.place_url or first_place_url(fields), False)
+        if place_source:
+            load_ms = await load(page, place_source, is_file)
+            fields = await probe_fields(page, PLACE_FIELDS, args.timeout)
+            report['place_page'] = {'source': place_source, 'load_ms': load_ms, 'fields': fields}
+            if args.save_html:
+                (Path(args.save_html) / 'place.html').write_text(await page.content(), encoding='utf-8')
+    finally:
+        await scraper.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the engine's selectors against live or saved Maps pages")
+    parser.add_argument('--query', default=DEFAULT_QUERY, help="Search for the live results page")
+    parser.add_argument('--results-html', help="Saved results page instead of a live search")
+    parser.add_argument('--place-url', help="Place page to check (default: first result)")
+    parser.add_argument('--place-html', help="Saved place page")
+    parser.add_argument('--save-html', metavar='DIR', help="Save the checked pages for offline runs")
+    parser.add_argument('--timeout', type=int, default=SELECTOR_PROBE_TIMEOUT, help="Wait per selector (ms)")
+    parser.add_argument('--report', default=SELECTOR_REPORT_PATH, help="JSON report path")
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(profile(args))
     except Exception as e:
-        print(f"   Scroll error: {str(e)}")
-    
-    print("\n" + "=" * 60)
-    print("DEBUG COMPLETE - Check the browser window")
-    print("Press Enter to close...")
-    print("=" * 60)
-    
-    input()
-    
-    await browser.close()
-    await playwright.stop()
+        print(f"Could not load the pages: {e}")
+        sys.exit(EXIT_LOAD_FAILED)
+
+    report['primary_misses'] = check(report)
+    report['ok'] = not report['primary_misses'] and 'place_page' in report
+    Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+
+    print_report(report)
+    print(f"\nReport written to {args.report}")
+    if report['primary_misses']:
+        sys.exit(EXIT_PRIMARY_MISS)
+    if 'place_page' not in report:
+        print("No place page to check (no place link found)")
+        sys.exit(EXIT_LOAD_FAILED)
+    sys.exit(EXIT_OK)
+
 
 if __name__ == "__main__":
-    asyncio.run(debug_maps())
+    main()
@@ -0,0 +1,110 @@
+"""Structured JSONL log of engine events, written by a background thread
+
+Every line is one event:
+    {"ts": 1760000000.123, "run_id": "...", "stage": "place", "place_id": "0x..:0x..",
+     "duration": 4.21, "outcome": "ok", ...}
+Stages: run, scroll, selector, place, retry, dead_letter, website, browser, status.
+
+Callers only put a dict on a queue - JSON encoding, writing and rotation
+(EVENT_LOG_MAX_BYTES, EVENT_LOG_BACKUPS old files) happen on the writer thread,
+so logging never blocks the event loop. Post-mortem example:
+    jq -c 'select(.stage == "place" and .outcome != "ok")' logs/events.jsonl
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from config import *
+
+_STOP = object()
+MAX_BATCH = 1000
+
+
+class EventLog:
+    """Non-blocking JSONL event sink with size-based rotation"""
+
+    def __init__(self, path: str = EVENT_LOG_PATH, max_bytes: int = EVENT_LOG_MAX_BYTES,
+                 backups: int = EVENT_LOG_BACKUPS, enabled: bool = EVENT_LOG_ENABLED):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.enabled = enabled
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def emit(self, stage: str, run_id: Optional[str] = None, **fields):
+        """Queue one event - fields that are None are left out"""
+        if not self.enabled:
+            return
+        event = {'ts': round(time.time(), 3), 'run_id': run_id, 'stage': stage}
+        event.update(fields)
+        self._queue.put(event)
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='event-log', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(self.path, 'a', encoding='utf-8')
+        try:
+            while True:
+                # Block for the first event, then take whatever else is queued
+                batch = [self._queue.get()]
+                while len(batch) < MAX_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(event is _STOP for event in batch)
+                lines = [
+                    json.dumps({k: v for k, v in event.items() if v is not None}, ensure_ascii=False, default=str)
+                    for event in batch if event is not _STOP
+                ]
+                if lines:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+                    if f.tell() >= self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.path, 'a', encoding='utf-8')
+                if stop:
+                    return
+        finally:
+            f.close()
+
+    def _rotate(self):
+        """events.jsonl -> events.1.jsonl -> ... -> events.<backups>.jsonl (dropped)"""
+        def backup(index: int) -> Path:
+            return self.path.with_name(f"{self.path.stem}.{index}{self.path.suffix}")
+
+        try:
+            if backup(self.backups).exists():
+                backup(self.backups).unlink()
+            for index in range(self.backups - 1, 0, -1):
+                if backup(index).exists():
+                    os.replace(backup(index), backup(index + 1))
+            os.replace(self.path, backup(1))
+        except OSError:
+            pass
+
+    def close(self, timeout: float = 5.0):
+        """Write everything queued so far and stop the writer (the next emit restarts it)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+
+# Shared by every engine in the process
+event_log = EventLog()
@@ -0,0 +1,45 @@
+"""Excel export shared by the desktop app and batch runs"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import List
+from config import *
+from models import BusinessRecord
+
+COLUMNS_MAP = {
+    'name': 'Business Name',
+    'phone': 'Phone',
+    'address': 'Address',
+    'category': 'Category',
+    'website': 'Website',
+    'emails': 'Email',
+    'socials': 'Social Media',
+    'latitude': 'Lat',
+    'longitude': 'Lng',
+    'rating': 'Rating',
+    'review_count': 'Reviews',
+    'url': 'Maps URL',
+}
+
+
+def export_to_excel(records: List[BusinessRecord], prefix: str = "business_leads") -> Path:
+    """Write records to a timestamped .xlsx file in OUTPUT_DIR and return its path"""
+    # pandas/openpyxl are heavy - only load them on first export
+    import pandas as pd
+
+    output_dir = Path(OUTPUT_DIR)
+    output_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = output_dir / f"{prefix}_{timestamp}.xlsx"
+    counter = 2
+    while filepath.exists():
+        # Parallel batch searches can finish within the same second
+        filepath = output_dir / f"{prefix}_{timestamp}_{counter}.xlsx"
+        counter += 1
+
+    df = pd.DataFrame.from_records(record.to_dict() for record in records)
+    existing_cols = [c for c in COLUMNS_MAP.keys() if c in df.columns]
+    df = df[existing_cols]
+    df.rename(columns=COLUMNS_MAP, inplace=True)
+    df.to_excel(filepath, index=False, engine='openpyxl')
+    return filepath
@@ -0,0 +1,89 @@
+"""Per-host politeness limiter for external website visits"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from config import *
+
+# Responses that mean "slow down" rather than "this site is broken"
+THROTTLE_STATUSES = (429, 503)
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host of a URL without the www. prefix"""
+    try:
+        host = (urlparse(url).hostname or '').lower()
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def is_aggregator_host(host: str) -> bool:
+    """Check if a host is a shared profile/storefront platform"""
+    return any(host == agg or host.endswith('.' + agg) for agg in AGGREGATOR_HOSTS)
+
+
+class _HostState:
+    """Concurrency slot, pacing and backoff bookkeeping for one host"""
+
+    __slots__ = ('semaphore', 'next_request_at', 'blocked_until', 'strikes')
+
+    def __init__(self, max_concurrent: int):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.next_request_at = 0.0
+        self.blocked_until = 0.0
+        self.strikes = 0
+
+
+class HostLimiter:
+    """Limit parallel tabs and request rate per host, backing off on 429/503"""
+
+    def __init__(self, max_concurrent: int = HOST_MAX_CONCURRENT,
+                 min_interval: float = HOST_MIN_INTERVAL):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self.hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = _HostState(self.max_concurrent)
+            self.hosts[host] = state
+        return state
+
+    def blocked_for(self, host: str) -> float:
+        """Seconds left before the host may be contacted again (0 if free)"""
+        state = self.hosts.get(host)
+        if not state:
+            return 0.0
+        return max(0.0, state.blocked_until - time.monotonic())
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """Hold one of the host's concurrency slots, spaced by min_interval"""
+        state = self._state(host)
+        async with state.semaphore:
+            now = time.monotonic()
+            wait = state.next_request_at - now
+            state.next_request_at = max(now, state.next_request_at) + self.min_interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield
+
+    def report(self, host: str, status: Optional[int], retry_after: Optional[str] = None):
+        """Record a response status and adapt the host's backoff"""
+        state = self._state(host)
+        if status in THROTTLE_STATUSES:
+            state.strikes += 1
+            backoff = min(HOST_BACKOFF_BASE * (2 ** (state.strikes - 1)), HOST_BACKOFF_MAX)
+            try:
+                # Honour Retry-After (seconds form) when the server sends one
+                if retry_after:
+                    backoff = min(max(backoff, float(retry_after)), HOST_BACKOFF_MAX)
+            except ValueError:
+                pass
+            state.blocked_until = time.monotonic() + backoff
+        elif status is not None and status < 400:
+            state.strikes = max(0, state.strikes - 1)
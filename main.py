@@ -1,14 +1,21 @@
 """Enterprise Business Data Extraction Platform - Premium UI for Flet 0.80+"""
 
+import startup_profile
+startup_profile.install()
+
 import flet as ft
 from flet import Colors, Icons
 import asyncio
-import pandas as pd
 from datetime import datetime
-from pathlib import Path
 from scraper import GoogleMapsScraper
+from exporter import export_to_excel
+from models import BusinessRecord
+from throughput import format_duration
+from worker import ScraperWorker, EVENT_STATUS, EVENT_DATA, EVENT_ENRICHED, EVENT_ERROR, EVENT_COMPLETE, EVENT_METRICS
 from config import *
 
+startup_profile.mark("module imports done")
+
 # --- Premium Enterprise Theme Constants ---
 class AppTheme:
     PRIMARY = "#4F46E5"
@@ -34,8 +41,12 @@ class AppTheme:
 class ScraperApp:
     def __init__(self, page: ft.Page):
         self.page = page
-        self.scraper = GoogleMapsScraper()
-        self.data_rows = []
+        self.worker = ScraperWorker() if USE_WORKER_PROCESS else None
+        self.scraper = None if self.worker else GoogleMapsScraper()
+        # In-process mode the UI shares the engine's record list instead of copying it
+        self.data_rows = [] if self.worker else self.scraper.session.results
+        self.selected_urls = set()  # Rows picked for enrichment after a list-only search
+        self.stopping = False  # Stop pressed, waiting for the engine to finish the run
         self.is_arabic = True
         self.search_start_time = None
         
@@ -60,11 +71,17 @@ class ScraperApp:
                 'status_ready': 'النظام جاهز - في انتظار بدء الحملة',
                 'status_running': 'جارٍ استخراج البيانات...',
                 'status_stopped': 'تم إيقاف العملية',
+                'status_stopping': 'جارٍ إيقاف العملية...',
                 'results_title': 'نتائج الاستخراج المباشرة',
                 'stats_total': 'إجمالي الشركات',
                 'stats_phones': 'أرقام التواصل',
                 'stats_emails': 'البريد الإلكتروني',
                 'stats_websites': 'المواقع الإلكترونية',
+                'tp_rate': 'شركة / دقيقة',
+                'tp_progress': 'المنجز / الإجمالي',
+                'tp_eta': 'الوقت المتبقي',
+                'tp_place': 'متوسط زمن الشركة',
+                'tp_website': 'متوسط زيارة الموقع',
                 'col_num': '#',
                 'col_name': 'اسم الشركة',
                 'col_phone': 'رقم التواصل',
@@ -80,7 +97,9 @@ class ScraperApp:
                 'validation_error': 'يرجى إكمال جميع الحقول المطلوبة',
                 'clear_data': 'مسح البيانات',
                 'version': 'الإصدار 3.0 Enterprise',
-                'search_query': 'البحث عن:'
+                'search_query': 'البحث عن:',
+                'list_only': 'قائمة سريعة (بدون تفاصيل)',
+                'enrich': 'استكمال بيانات المحدد',
             },
             'en': {
                 'app_title': 'Data Extraction Platform',
@@ -100,11 +119,17 @@ class ScraperApp:
                 'status_ready': 'System Ready - Awaiting Campaign',
                 'status_running': 'Data Extraction in Progress...',
                 'status_stopped': 'Process Stopped',
+                'status_stopping': 'Stopping...',
                 'results_title': 'Live Extraction Results',
                 'stats_total': 'Total Companies',
                 'stats_phones': 'Phone Numbers',
                 'stats_emails': 'Email Addresses',
                 'stats_websites': 'Websites Found',
+                'tp_rate': 'Places / min',
+                'tp_progress': 'Done / Queued',
+                'tp_eta': 'ETA',
+                'tp_place': 'Avg Place Time',
+                'tp_website': 'Avg Website Visit',
                 'col_num': '#',
                 'col_name': 'Company Name',
                 'col_phone': 'Phone Number',
@@ -120,7 +145,9 @@ class ScraperApp:
                 'validation_error': 'Please complete all required fields',
                 'clear_data': 'Clear Data',
                 'version': 'Version 3.0 Enterprise',
-                'search_query': 'Searching:'
+                'search_query': 'Searching:',
+                'list_only': 'Fast list only (no details)',
+                'enrich': 'Enrich Selected',
             }
         }
         
@@ -144,6 +171,8 @@ class ScraperApp:
         self.btn_start = None
         self.btn_stop = None
         self.btn_export = None
+        self.btn_enrich = None
+        self.sw_list_only = None
         self.btn_lang = None
         self.btn_about = None
         self.btn_clear = None
@@ -156,6 +185,7 @@ class ScraperApp:
         self.stat_phone_val = None
         self.stat_email_val = None
         self.stat_website_val = None
+        self.tp_labels = {}  # Throughput panel: key -> (label Text, value Text)
         self.sidebar_title = None
         self.sidebar_subtitle = None
         self.results_title_text = None
@@ -187,10 +217,15 @@ class ScraperApp:
         self.btn_start.content.controls[1].value = self.get_text('start_search')
         self.btn_stop.content.controls[1].value = self.get_text('stop')
         self.btn_export.content.controls[1].value = self.get_text('export')
+        self.btn_enrich.content.controls[1].value = self.get_text('enrich')
+        self.sw_list_only.label = self.get_text('list_only')
         self.btn_lang.content.controls[1].value = self.get_text('language')
         self.lbl_status.value = self.get_text('status_ready')
         self.results_title_text.value = self.get_text('results_title')
         
+        for key, (label, _) in self.tp_labels.items():
+            label.value = self.get_text(key)
+        
         cols = self.data_table.columns
         cols[0].label.value = self.get_text('col_num')
         cols[1].label.value = self.get_text('col_name')
@@ -252,6 +287,8 @@ class ScraperApp:
         self.btn_start = self._create_button(self.get_text('start_search'), Icons.ROCKET_LAUNCH_ROUNDED, AppTheme.PRIMARY, self.start_search)
         self.btn_stop = self._create_button(self.get_text('stop'), Icons.STOP_CIRCLE_ROUNDED, AppTheme.ERROR, self.stop_search, disabled=True)
         self.btn_export = self._create_button(self.get_text('export'), Icons.DOWNLOAD_ROUNDED, AppTheme.SUCCESS, self.export_data, disabled=True)
+        self.btn_enrich = self._create_button(self.get_text('enrich'), Icons.MANAGE_SEARCH_ROUNDED, AppTheme.ACCENT, self.enrich_selected, disabled=True)
+        self.sw_list_only = ft.Switch(label=self.get_text('list_only'), value=False, active_color=AppTheme.PRIMARY_LIGHT, label_style=ft.TextStyle(color=AppTheme.TEXT_SECONDARY, size=13))
         
         # Status
         self.status_indicator = ft.Container(width=10, height=10, border_radius=5, bgcolor=AppTheme.SUCCESS)
@@ -272,11 +309,13 @@ class ScraperApp:
                 self.txt_region,
                 self.txt_city,
                 self.txt_district,
+                self.sw_list_only,
                 ft.Container(height=15),
                 self.btn_start,
                 ft.Container(height=8),
                 self.btn_stop,
                 self.btn_export,
+                self.btn_enrich,
                 ft.Container(height=15),
                 ft.Container(height=1, bgcolor=AppTheme.BORDER, margin=ft.Margin(0, 5, 0, 5)),
                 status_row,
@@ -307,6 +346,41 @@ class ScraperApp:
             expand=True,
         )
 
+    def build_throughput_panel(self):
+        """Live places/min, progress, ETA and stage latencies - refreshed at a fixed rate"""
+        items = []
+        for key in ('tp_rate', 'tp_progress', 'tp_eta', 'tp_place', 'tp_website'):
+            label = ft.Text(self.get_text(key), size=11, color=AppTheme.TEXT_MUTED, weight=ft.FontWeight.W_500)
+            value = ft.Text("-", size=15, weight=ft.FontWeight.W_600, color=AppTheme.TEXT_PRIMARY)
+            self.tp_labels[key] = (label, value)
+            items.append(ft.Column([label, value], spacing=2, expand=True))
+        return ft.Container(
+            content=ft.Row(items, spacing=16),
+            bgcolor=AppTheme.CARD,
+            padding=ft.Padding(16, 10, 16, 10),
+            border_radius=14,
+            border=ft.border.all(1, AppTheme.BORDER),
+        )
+
+    def update_throughput(self, snapshot, refresh=True):
+        values = {
+            'tp_rate': f"{snapshot['places_per_min']:.1f}",
+            'tp_progress': f"{snapshot['done']} / {snapshot['queued']}",
+            'tp_eta': format_duration(snapshot['eta_seconds']),
+            'tp_place': f"{snapshot['place_seconds']:.1f}s" if snapshot['place_seconds'] is not None else "-",
+            'tp_website': f"{snapshot['website_seconds']:.1f}s" if snapshot['website_seconds'] is not None else "-",
+        }
+        for key, text in values.items():
+            self.tp_labels[key][1].value = text
+        if refresh:
+            self.page.update()
+
+    async def _refresh_throughput(self):
+        """In-process mode: poll the engine's meter at a fixed rate until cancelled"""
+        while True:
+            await asyncio.sleep(THROUGHPUT_REFRESH_INTERVAL)
+            self.update_throughput(self.scraper.session.meter.snapshot())
+
     def build_main_content(self):
         self.stat_total_val = ft.Text("0", size=24, weight=ft.FontWeight.BOLD, color=AppTheme.TEXT_PRIMARY)
         self.stat_phone_val = ft.Text("0", size=24, weight=ft.FontWeight.BOLD, color=AppTheme.TEXT_PRIMARY)
@@ -332,6 +406,7 @@ class ScraperApp:
                 ft.DataColumn(ft.Text(self.get_text('col_location'), style=col_style)),
             ],
             rows=[],
+            show_checkbox_column=True,
             border=ft.border.all(1, AppTheme.BORDER),
             vertical_lines=ft.BorderSide(1, AppTheme.BACKGROUND),
             horizontal_lines=ft.BorderSide(1, AppTheme.BORDER),
@@ -374,7 +449,8 @@ class ScraperApp:
         )
 
         return ft.Container(
-            content=ft.Column([top_bar, stats_row, ft.Container(height=16), table_container], spacing=0, expand=True),
+            content=ft.Column([top_bar, stats_row, ft.Container(height=12), self.build_throughput_panel(),
+                               ft.Container(height=16), table_container], spacing=0, expand=True),
             padding=24, expand=True, bgcolor=AppTheme.BACKGROUND
         )
 
@@ -404,7 +480,7 @@ class ScraperApp:
         )
         self.page.open(dlg)
 
-    def add_log(self, message: str, is_error=False, is_success=False):
+    def add_log(self, message: str, is_error=False, is_success=False, refresh=True):
         timestamp = datetime.now().strftime("%H:%M:%S")
         color = AppTheme.ERROR_LIGHT if is_error else (AppTheme.SUCCESS_LIGHT if is_success else AppTheme.TEXT_MUTED)
         icon = Icons.ERROR_OUTLINE_ROUNDED if is_error else (Icons.CHECK_CIRCLE_OUTLINE_ROUNDED if is_success else Icons.CHEVRON_RIGHT_ROUNDED)
@@ -413,9 +489,10 @@ class ScraperApp:
         self.log_view.controls.append(log_entry)
         if len(self.log_view.controls) > 50:
             self.log_view.controls.pop(0)
-        self.page.update()
+        if refresh:
+            self.page.update()
 
-    def update_status(self, message: str, is_running=False):
+    def update_status(self, message: str, is_running=False, refresh=True):
         self.lbl_status.value = message
         if is_running:
             self.status_indicator.bgcolor = AppTheme.WARNING
@@ -425,82 +502,152 @@ class ScraperApp:
             self.status_indicator.bgcolor = AppTheme.SUCCESS
             self.progress_ring.visible = False
             self.status_indicator.visible = True
-        self.add_log(message)
-        self.page.update()
+        self.add_log(message, refresh=False)
+        if refresh:
+            self.page.update()
 
-    def update_stats(self):
+    def update_stats(self, refresh=True):
         self.stat_total_val.value = str(self.stats['total'])
         self.stat_phone_val.value = str(self.stats['phones'])
         self.stat_email_val.value = str(self.stats['emails'])
         self.stat_website_val.value = str(self.stats['websites'])
         self.empty_state.visible = self.stats['total'] == 0
-        self.page.update()
+        if refresh:
+            self.page.update()
 
-    def add_data_row(self, data: dict):
-        row_num = len(self.data_rows) + 1
-        self.data_rows.append(data)
-        
-        self.stats['total'] += 1
-        if data.get('phone') and len(str(data.get('phone', ''))) > 3 and data.get('phone') != 'N/A':
-            self.stats['phones'] += 1
-        if data.get('emails') and len(str(data.get('emails', ''))) > 3 and data.get('emails') != 'N/A':
-            self.stats['emails'] += 1
-        if data.get('website') and data.get('website') != 'N/A':
-            self.stats['websites'] += 1
-        self.update_stats()
-        
-        name_cell = ft.Container(content=ft.Text(data.get('name', ''), weight=ft.FontWeight.W_600, size=13, color=AppTheme.TEXT_PRIMARY, max_lines=2, overflow=ft.TextOverflow.ELLIPSIS), width=160)
-        phone_text = data.get('phone', 'N/A')
-        phone_cell = ft.Text(phone_text, size=12, color=AppTheme.ACCENT if phone_text != 'N/A' else AppTheme.TEXT_MUTED, selectable=True)
-        address_cell = ft.Container(content=ft.Text(data.get('address', ''), size=12, max_lines=2, overflow=ft.TextOverflow.ELLIPSIS, color=AppTheme.TEXT_SECONDARY), width=180)
+    def _count_stats(self, record: BusinessRecord, sign=1):
+        self.stats['total'] += sign
+        if record.has_phone:
+            self.stats['phones'] += sign
+        if record.has_email:
+            self.stats['emails'] += sign
+        if record.has_website:
+            self.stats['websites'] += sign
+
+    def _build_row_cells(self, row_num: int, record: BusinessRecord):
+        name_cell = ft.Container(content=ft.Text(record.name or '', weight=ft.FontWeight.W_600, size=13, color=AppTheme.TEXT_PRIMARY, max_lines=2, overflow=ft.TextOverflow.ELLIPSIS), width=160)
+        phone_cell = ft.Text(record.phone or 'N/A', size=12, color=AppTheme.ACCENT if record.phone else AppTheme.TEXT_MUTED, selectable=True)
+        address_cell = ft.Container(content=ft.Text(record.address or '', size=12, max_lines=2, overflow=ft.TextOverflow.ELLIPSIS, color=AppTheme.TEXT_SECONDARY), width=180)
         
-        website_url = data.get('website')
-        website_cell = ft.IconButton(icon=Icons.OPEN_IN_NEW_ROUNDED, icon_color=AppTheme.PRIMARY_LIGHT, icon_size=18, tooltip=website_url, url=website_url) if website_url and website_url != 'N/A' else ft.Icon(Icons.LINK_OFF_ROUNDED, color=AppTheme.TEXT_MUTED, size=18)
+        website_url = record.website
+        website_cell = ft.IconButton(icon=Icons.OPEN_IN_NEW_ROUNDED, icon_color=AppTheme.PRIMARY_LIGHT, icon_size=18, tooltip=website_url, url=website_url) if website_url else ft.Icon(Icons.LINK_OFF_ROUNDED, color=AppTheme.TEXT_MUTED, size=18)
         
-        email_text = data.get('emails', 'N/A')
-        email_cell = ft.Container(content=ft.Text(email_text or 'N/A', size=12, color=AppTheme.WARNING_LIGHT if email_text and email_text != 'N/A' else AppTheme.TEXT_MUTED, selectable=True, max_lines=1, overflow=ft.TextOverflow.ELLIPSIS), width=150)
+        email_text = ", ".join(record.emails)
+        email_cell = ft.Container(content=ft.Text(email_text or 'N/A', size=12, color=AppTheme.WARNING_LIGHT if email_text else AppTheme.TEXT_MUTED, selectable=True, max_lines=1, overflow=ft.TextOverflow.ELLIPSIS), width=150)
         
-        map_url = data.get('url')
+        map_url = record.url
         map_cell = ft.IconButton(icon=Icons.MAP_ROUNDED, icon_color=AppTheme.SUCCESS_LIGHT, icon_size=18, tooltip=self.get_text('view_map'), on_click=lambda e, url=map_url: self.page.launch_url(url)) if map_url else ft.Container()
         
+        return [
+            ft.DataCell(ft.Text(str(row_num), size=12, weight=ft.FontWeight.W_600, color=AppTheme.TEXT_MUTED)),
+            ft.DataCell(name_cell), ft.DataCell(phone_cell), ft.DataCell(address_cell),
+            ft.DataCell(website_cell), ft.DataCell(email_cell), ft.DataCell(map_cell),
+        ]
+
+    def add_data_row(self, record: BusinessRecord, refresh=True):
+        if self.worker:
+            # Records arrive from the engine process - the UI list is the only copy
+            self.data_rows.append(record)
+        # In-process the engine already appended the record to the shared list
+        row_num = len(self.data_rows)
+        
+        self._count_stats(record)
+        self.update_stats(refresh=False)
+        
         row_color = AppTheme.SURFACE if row_num % 2 == 0 else AppTheme.CARD
         
         self.data_table.rows.append(ft.DataRow(
-            cells=[
-                ft.DataCell(ft.Text(str(row_num), size=12, weight=ft.FontWeight.W_600, color=AppTheme.TEXT_MUTED)),
-                ft.DataCell(name_cell), ft.DataCell(phone_cell), ft.DataCell(address_cell),
-                ft.DataCell(website_cell), ft.DataCell(email_cell), ft.DataCell(map_cell),
-            ],
+            cells=self._build_row_cells(row_num, record),
+            data=record.url,
+            on_select_change=self.toggle_row_selection,
             color={ft.ControlState.DEFAULT: row_color, ft.ControlState.HOVERED: AppTheme.SURFACE_LIGHT}
         ))
+        if refresh:
+            self.page.update()
+
+    def replace_data_row(self, url: str, record: BusinessRecord, refresh=True):
+        """Swap a list-only row for its enriched record"""
+        for index, row in enumerate(self.data_table.rows):
+            if row.data == url:
+                break
+        else:
+            return
+        if self.worker:
+            self._count_stats(self.data_rows[index], sign=-1)
+            self.data_rows[index] = record
+            self._count_stats(record)
+        else:
+            # The engine already replaced the record in the shared list
+            self.stats = {'total': 0, 'phones': 0, 'emails': 0, 'websites': 0}
+            for existing in self.data_rows:
+                self._count_stats(existing)
+        self.update_stats(refresh=False)
+        
+        row.cells = self._build_row_cells(index + 1, record)
+        row.data = record.url
+        row.selected = False
+        self.selected_urls.discard(url)
+        self._update_enrich_button()
+        if refresh:
+            self.page.update()
+
+    def toggle_row_selection(self, e):
+        row = e.control
+        row.selected = not row.selected
+        if row.selected:
+            self.selected_urls.add(row.data)
+        else:
+            self.selected_urls.discard(row.data)
+        self._update_enrich_button()
         self.page.update()
 
+    def _update_enrich_button(self):
+        enabled = bool(self.selected_urls) and not self.btn_start.disabled
+        self.btn_enrich.disabled = not enabled
+        self.btn_enrich.on_click = self.enrich_selected if enabled else None
+        self.btn_enrich.bgcolor = AppTheme.ACCENT if enabled else Colors.with_opacity(0.3, AppTheme.ACCENT)
+
     def on_search_complete(self):
+        if self.stopping:
+            # The engine has now actually finished the stopped run
+            self.stopping = False
+            self.add_log(self.get_text('status_stopped'), is_error=True, refresh=False)
         self.btn_start.disabled = False
         self.btn_start.bgcolor = AppTheme.PRIMARY
         self.btn_stop.disabled = True
         self.btn_stop.bgcolor = Colors.with_opacity(0.3, AppTheme.ERROR)
         self.btn_export.disabled = len(self.data_rows) == 0
         self.btn_export.bgcolor = AppTheme.SUCCESS if len(self.data_rows) > 0 else Colors.with_opacity(0.3, AppTheme.SUCCESS)
+        self._update_enrich_button()
         
         self.update_status(self.get_text('status_ready'))
         self.add_log(f"تم استخراج {len(self.data_rows)} شركة" if self.is_arabic else f"Extracted {len(self.data_rows)}", is_success=True)
         self.page.update()
 
     async def run_search(self):
+        if self.worker:
+            await self.run_search_in_worker()
+            return
         try:
             self.add_log("Initializing scraper...")
-            self.scraper.on_status_update = lambda msg: self.update_status(msg, is_running=True)
-            self.scraper.on_data_found = self.add_data_row
-            self.scraper.on_complete = self.on_search_complete
+            session = self.scraper.session
+            session.on_status_update = lambda msg: self.update_status(msg, is_running=True)
+            session.on_data_found = self.add_data_row
+            session.on_complete = self.on_search_complete
             
             self.add_log("Starting search...")
-            await self.scraper.search(
-                self.txt_business.value, 
-                self.txt_region.value, 
-                self.txt_city.value, 
-                self.txt_district.value or ""
-            )
+            refresher = asyncio.create_task(self._refresh_throughput())
+            try:
+                await self.scraper.search(
+                    self.txt_business.value, 
+                    self.txt_region.value, 
+                    self.txt_city.value, 
+                    self.txt_district.value or "",
+                    list_only=self.sw_list_only.value,
+                )
+            finally:
+                refresher.cancel()
+                self.update_throughput(session.meter.snapshot(), refresh=False)
         except Exception as e:
             import traceback
             error_msg = f"Error: {str(e)}"
@@ -509,6 +656,91 @@ class ScraperApp:
             print(f"SEARCH ERROR: {traceback.format_exc()}")  # Print to console
             self.on_search_complete()
 
+    async def run_search_in_worker(self):
+        """Drive a search in the engine process, applying its events in batches"""
+        self.add_log("Starting search in engine process...")
+        self.worker.search(
+            self.txt_business.value,
+            self.txt_region.value,
+            self.txt_city.value,
+            self.txt_district.value or "",
+            list_only=self.sw_list_only.value,
+        )
+        await self._pump_worker_events()
+
+    async def _pump_worker_events(self):
+        """Apply engine events in batches until the current command completes"""
+        finished = False
+        while not finished:
+            await asyncio.sleep(UI_REFRESH_INTERVAL)
+            events = self.worker.drain()
+            if not events:
+                if not self.worker.is_alive():
+                    self.add_log("Engine process exited unexpectedly", is_error=True)
+                    self.on_search_complete()
+                    return
+                continue
+            
+            # One page.update() per batch instead of one per event
+            last_status = None
+            last_metrics = None
+            for kind, payload in events:
+                if kind == EVENT_STATUS:
+                    self.add_log(payload, refresh=False)
+                    last_status = payload
+                elif kind == EVENT_DATA:
+                    self.add_data_row(payload, refresh=False)
+                elif kind == EVENT_ENRICHED:
+                    self.replace_data_row(*payload, refresh=False)
+                elif kind == EVENT_METRICS:
+                    last_metrics = payload
+                elif kind == EVENT_ERROR:
+                    self.add_log(payload, is_error=True, refresh=False)
+                elif kind == EVENT_COMPLETE:
+                    finished = True
+            if last_status is not None:
+                self.lbl_status.value = last_status
+            if last_metrics is not None:
+                self.update_throughput(last_metrics, refresh=False)
+            
+            if finished:
+                self.on_search_complete()
+            else:
+                self.page.update()
+
+    async def run_enrich(self, urls):
+        if self.worker:
+            self.worker.enrich(urls)
+            await self._pump_worker_events()
+            return
+        try:
+            session = self.scraper.session
+            session.on_status_update = lambda msg: self.update_status(msg, is_running=True)
+            session.on_record_enriched = self.replace_data_row
+            session.on_complete = self.on_search_complete
+            refresher = asyncio.create_task(self._refresh_throughput())
+            try:
+                await self.scraper.enrich(urls)
+            finally:
+                refresher.cancel()
+                self.update_throughput(session.meter.snapshot(), refresh=False)
+        except Exception as e:
+            self.add_log(f"Error: {str(e)}", is_error=True)
+            self.on_search_complete()
+
+    def enrich_selected(self, e):
+        if not self.selected_urls:
+            return
+        urls = list(self.selected_urls)
+        self.update_status(self.get_text('status_running'), is_running=True)
+        self.btn_start.disabled = True
+        self.btn_start.bgcolor = Colors.with_opacity(0.3, AppTheme.PRIMARY)
+        self.btn_stop.disabled = False
+        self.btn_stop.bgcolor = AppTheme.ERROR
+        self._update_enrich_button()
+        self.page.update()
+        self.page.run_task(self.run_enrich, urls)
+
     def start_search(self, e):
         if not self.txt_business.value or not self.txt_region.value or not self.txt_city.value:
             self.add_log(self.get_text('validation_error'), is_error=True)
@@ -530,6 +762,7 @@ class ScraperApp:
         
         self.data_rows.clear()
         self.data_table.rows.clear()
+        self.selected_urls.clear()
         self.log_view.controls.clear()
         self.stats = {'total': 0, 'phones': 0, 'emails': 0, 'websites': 0}
         self.update_stats()
@@ -541,20 +774,28 @@ class ScraperApp:
         self.btn_stop.bgcolor = AppTheme.ERROR
         self.btn_export.disabled = True
         self.btn_export.bgcolor = Colors.with_opacity(0.3, AppTheme.SUCCESS)
+        self._update_enrich_button()
         self.page.update()
         
         # Use page.run_task for proper Flet async execution
         self.page.run_task(self.run_search)
 
     def stop_search(self, e):
-        self.scraper.stop()
-        self.add_log(self.get_text('status_stopped'), is_error=True)
-        self.update_status(self.get_text('status_stopped'))
-        self.on_search_complete()
+        # Start stays disabled until the engine reports completion (on_search_complete)
+        if self.worker:
+            self.worker.cancel()
+        else:
+            self.scraper.stop()
+        self.stopping = True
+        self.btn_stop.disabled = True
+        self.btn_stop.bgcolor = Colors.with_opacity(0.3, AppTheme.ERROR)
+        self.update_status(self.get_text('status_stopping'), is_running=True)
 
     def clear_data(self, e):
         self.data_rows.clear()
         self.data_table.rows.clear()
+        self.selected_urls.clear()
+        self._update_enrich_button()
         self.stats = {'total': 0, 'phones': 0, 'emails': 0, 'websites': 0}
         self.update_stats()
         self.btn_export.disabled = True
@@ -567,18 +808,8 @@ class ScraperApp:
             self.add_log("لا توجد بيانات" if self.is_arabic else "No data", is_error=True)
             return
         try:
-            output_dir = Path(OUTPUT_DIR)
-            output_dir.mkdir(exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"business_leads_{timestamp}.xlsx"
-            filepath = output_dir / filename
-            
-            df = pd.DataFrame(self.data_rows)
-            columns_map = {'name': 'Business Name', 'phone': 'Phone', 'address': 'Address', 'website': 'Website', 'emails': 'Email', 'socials': 'Social Media', 'latitude': 'Lat', 'longitude': 'Lng', 'url': 'Maps URL'}
-            existing_cols = [c for c in columns_map.keys() if c in df.columns]
-            df = df[existing_cols]
-            df.rename(columns=columns_map, inplace=True)
-            df.to_excel(filepath, index=False, engine='openpyxl')
+            filepath = export_to_excel(self.data_rows)
+            filename = filepath.name
             
             self.add_log(f"تم التصدير: {filename}" if self.is_arabic else f"Exported: {filename}", is_success=True)
             import subprocess
@@ -587,7 +818,10 @@ class ScraperApp:
             self.add_log(f"Export Error: {str(ex)}", is_error=True)
 
 def main(page: ft.Page):
+    startup_profile.mark("Flet session started")
     app = ScraperApp(page)
+    startup_profile.mark("first frame (ScraperApp built)")
+    startup_profile.report()
 
 if __name__ == "__main__":
     ft.app(target=main)
@@ -0,0 +1,137 @@
+"""Decoder for the structured payloads the Maps web app fetches for itself
+
+Search results (``/search?tbm=map``) and place previews (``/maps/preview/place``)
+arrive as ``)]}'``-prefixed JSON arrays. Each place is one long positional array;
+the indexes below are the ones the web client itself reads.
+"""
+
+import json
+import re
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+from models import BusinessRecord
+
+XSSI_PREFIX = ")]}'"
+
+# "0x3e2f03...:0x8b1f..." - the feature id Maps puts in both payloads and place URLs
+CID_REGEX = re.compile(r'0x[0-9a-f]+:0x[0-9a-f]+')
+
+# Positions inside a place array
+IDX_ADDRESS_LINES = 2
+IDX_RATING_BLOCK = 4      # [4][7] rating, [4][8] review count
+IDX_WEBSITE = 7           # [7][0] url (sometimes a /url?q= redirect)
+IDX_COORDS = 9            # [9][2] latitude, [9][3] longitude
+IDX_CID = 10
+IDX_NAME = 11
+IDX_CATEGORIES = 13
+IDX_FULL_ADDRESS = 39
+IDX_PHONE = 178           # [178][0][0] display phone
+
+MIN_PLACE_LENGTH = IDX_NAME + 1
+MAX_SEARCH_DEPTH = 6
+
+
+def is_maps_payload_url(url: str) -> bool:
+    """True for the search / place-preview requests worth decoding"""
+    return ('/search?' in url and 'tbm=map' in url) or '/maps/preview/place' in url
+
+
+def place_cid(url: str) -> Optional[str]:
+    """Feature id of a place URL or payload value"""
+    match = CID_REGEX.search(url or '')
+    return match.group(0) if match else None
+
+
+def _get(node, *path):
+    """Positional lookup that returns None instead of raising"""
+    for index in path:
+        if not isinstance(node, list) or index >= len(node):
+            return None
+        node = node[index]
+    return node
+
+
+def _load(text: str):
+    """Parse a payload body - bare XSSI-prefixed JSON or the {"d": "..."} wrapper"""
+    text = text.lstrip()
+    if text.startswith('{'):
+        try:
+            text = json.loads(text).get('d') or ''
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(text, str):
+            return None
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _is_place(node) -> bool:
+    return (isinstance(node, list) and len(node) >= MIN_PLACE_LENGTH
+            and isinstance(node[IDX_NAME], str)
+            and isinstance(node[IDX_CID], str) and CID_REGEX.fullmatch(node[IDX_CID]) is not None)
+
+
+def _find_places(node, depth: int = 0) -> Iterator[list]:
+    """Walk the payload for place arrays - tolerant of the wrapper layout changing"""
+    if depth > MAX_SEARCH_DEPTH or not isinstance(node, list):
+        return
+    if _is_place(node):
+        yield node
+        return
+    for child in node:
+        if isinstance(child, list):
+            yield from _find_places(child, depth + 1)
+
+
+def _website(value) -> Optional[str]:
+    if not isinstance(value, str) or not value:
+        return None
+    if value.startswith('/url?'):
+        value = parse_qs(urlparse(value).query).get('q', [None])[0]
+    return value
+
+
+def place_url(place: list) -> str:
+    """Openable place URL built from the feature id"""
+    return f"https://www.google.com/maps/place/data=!4m2!3m1!1s{place[IDX_CID]}"
+
+
+def decode_place(place: list) -> BusinessRecord:
+    """Build a record from one place array"""
+    address = _get(place, IDX_FULL_ADDRESS)
+    if not isinstance(address, str):
+        lines = _get(place, IDX_ADDRESS_LINES)
+        address = ", ".join(line for line in lines if isinstance(line, str)) if isinstance(lines, list) else None
+    categories = _get(place, IDX_CATEGORIES)
+    phone = _get(place, IDX_PHONE, 0, 0)
+
+    return BusinessRecord(
+        name=place[IDX_NAME],
+        phone=phone if isinstance(phone, str) else None,
+        address=address,
+        category=categories[0] if isinstance(categories, list) and categories else None,
+        website=_website(_get(place, IDX_WEBSITE, 0)),
+        latitude=_get(place, IDX_COORDS, 2),
+        longitude=_get(place, IDX_COORDS, 3),
+        rating=_get(place, IDX_RATING_BLOCK, 7),
+        review_count=_get(place, IDX_RATING_BLOCK, 8),
+        url=place_url(place),
+    )
+
+
+def decode_payload(text: str) -> Dict[str, BusinessRecord]:
+    """All places in a search or place-preview response, keyed by feature id"""
+    data = _load(text)
+    records = {}
+    if data is None:
+        return records
+    for place in _find_places(data):
+        try:
+            records[place[IDX_CID]] = decode_place(place)
+        except Exception:
+            continue
+    return records
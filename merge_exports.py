@@ -0,0 +1,231 @@
+"""Consolidate historical exports into one deduplicated master dataset
+
+Streams every export in chunks (.xlsx read-only, .csv and .jsonl chunked), so
+memory stays bounded by MERGE_CHUNK_SIZE plus three sorted arrays of 64-bit
+key hashes - about 24 bytes per kept row.
+
+A row is a duplicate when any of its keys was already kept:
+    place ID from the Maps URL, phone (normalized as in models.phone_key),
+    simplified name + rounded coordinates.
+Newest files are read first, so the most recent copy of a business wins.
+
+Examples:
+    python merge_exports.py                              # everything in OUTPUT_DIR
+    python merge_exports.py exports old_exports/a.csv --output master.jsonl
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+from config import *
+from exporter import COLUMNS_MAP
+
+INPUT_SUFFIXES = ('.xlsx', '.csv', '.jsonl')
+
+# Export header (any generation) or store column -> record field
+HEADER_ALIASES = {header.lower(): field for field, header in COLUMNS_MAP.items()}
+HEADER_ALIASES.update({field: field for field in COLUMNS_MAP})
+
+KEY_COLUMNS = ('place_key', 'phone_key', 'name_geo_key')
+
+
+def find_inputs(paths: List[str], output: Path) -> List[Path]:
+    """Export files under the given files/directories, newest first"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(p for p in path.iterdir() if p.suffix.lower() in INPUT_SUFFIXES)
+        elif path.suffix.lower() in INPUT_SUFFIXES:
+            files.append(path)
+    output = output.resolve()
+    files = [f for f in files if f.resolve() != output and not f.name.startswith('~$')]
+    return sorted(set(files), key=lambda f: f.stat().st_mtime, reverse=True)
+
+
+def _read_xlsx(path: Path, chunk_size: int):
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell) if cell is not None else '' for cell in next(rows, ())]
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame.from_records(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame.from_records(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator:
+    """DataFrames of at most chunk_size rows, columns renamed to record fields"""
+    import pandas as pd
+
+    suffix = path.suffix.lower()
+    if suffix == '.xlsx':
+        chunks = _read_xlsx(path, chunk_size)
+    elif suffix == '.csv':
+        chunks = pd.read_csv(path, chunksize=chunk_size, dtype=str, encoding='utf-8-sig')
+    else:
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+
+    for df in chunks:
+        df.columns = [HEADER_ALIASES.get(str(c).strip().lower()) for c in df.columns]
+        df = df.loc[:, df.columns.notna() & ~df.columns.duplicated()]
+        yield df.reindex(columns=list(COLUMNS_MAP))
+
+
+def add_keys(df):
+    """Vectorized duplicate keys - same rules as extract_place_id / normalize_phone / _is_duplicate"""
+    import pandas as pd
+
+    text = df.astype('object').where(df.notna(), None)
+    url = text['url'].fillna('').astype(str)
+    place = url.str.extract(r'(0x[0-9a-f]+:0x[0-9a-f]+)', expand=False)
+    place = place.fillna(url.str.extract(r'place_id:([A-Za-z0-9_-]+)', expand=False))
+    place = place.fillna(url.str.extract(r'/data=!3m1!4b1!4m[^/]+!3m[^/]+!1s([^!]+)', expand=False))
+    place = place.fillna(url.where(url != ''))
+    df['place_key'] = place
+
+    phone = text['phone'].fillna('').astype(str).str.replace(r'[^\d+]', '', regex=True)
+    phone = phone.str.replace(r'^(\+?966)0+', r'\1', regex=True).str.replace(r'^0+', '', regex=True)
+    phone = phone.str.replace(r'^(\+966|966|\+)', '', regex=True)
+    df['phone_key'] = phone.where(phone.str.len() >= 8)
+
+    name = text['name'].fillna('').astype(str).str.lower().str.replace(r'[^\w\s]', '', regex=True).str.strip()
+    lat = pd.to_numeric(text['latitude'], errors='coerce').astype(float)
+    lng = pd.to_numeric(text['longitude'], errors='coerce').astype(float)
+    # Fixed-precision text, so integer (xlsx) and float (csv/jsonl) columns give the same key
+    geo_format = f'{{:.{MERGE_GEO_DECIMALS}f}}'.format
+    geo = lat.map(geo_format) + ',' + lng.map(geo_format)
+    df['name_geo_key'] = (name + '@' + geo.where(lat.notna() & lng.notna(), '')).where(name.str.len() > 3)
+    return df
+
+
+class KeyIndex:
+    """Sorted 64-bit hashes of kept keys, one array per key column"""
+
+    def __init__(self):
+        import numpy as np
+
+        self._np = np
+        self.seen = {column: np.empty(0, dtype=np.uint64) for column in KEY_COLUMNS}
+
+    def _hashes(self, series):
+        import pandas as pd
+
+        return pd.util.hash_pandas_object(series.fillna(''), index=False).to_numpy()
+
+    def filter(self, df):
+        """Rows of df whose keys are new - against earlier chunks and earlier rows of df"""
+        np = self._np
+        keep = np.ones(len(df), dtype=bool)
+        hashes = {}
+        for column in KEY_COLUMNS:
+            present = df[column].notna().to_numpy()
+            values = self._hashes(df[column])
+            seen = self.seen[column]
+            if len(seen):
+                positions = np.searchsorted(seen, values).clip(max=len(seen) - 1)
+                keep &= ~(present & (seen[positions] == values))
+            keep &= ~(present & df[column].duplicated().to_numpy())
+            hashes[column] = (values, present)
+
+        # Only keys of kept rows count as seen - they are already unique, so a
+        # stable sort of two sorted runs is a linear merge
+        for column, (values, present) in hashes.items():
+            merged = np.concatenate([self.seen[column], values[keep & present]])
+            merged.sort(kind='stable')
+            self.seen[column] = merged
+        return df[keep]
+
+
+class MasterWriter:
+    """Appends chunks to the master .csv / .jsonl / .xlsx"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.suffix = path.suffix.lower()
+        self.rows = 0
+        self._workbook = None
+        self._sheet = None
+        if self.suffix == '.xlsx':
+            from openpyxl import Workbook
+
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet('Leads')
+            self._sheet.append(list(COLUMNS_MAP.values()))
+        elif self.suffix == '.jsonl':
+            self.path.write_text('', encoding='utf-8')
+
+    def write(self, df):
+        df = df[list(COLUMNS_MAP)]
+        if self.suffix == '.xlsx':
+            for row in df.astype('object').where(df.notna(), None).itertuples(index=False):
+                self._sheet.append(list(row))
+        elif self.suffix == '.jsonl':
+            if len(df):
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(df.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n')
+        else:
+            df.rename(columns=COLUMNS_MAP).to_csv(
+                self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0,
+                index=False, encoding='utf-8-sig' if self.rows == 0 else 'utf-8',
+            )
+        self.rows += len(df)
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.save(self.path)
+        elif self.rows == 0 and self.suffix == '.csv':
+            self.path.write_text(','.join(COLUMNS_MAP.values()) + '\n', encoding='utf-8-sig')
+
+
+def merge(inputs: List[Path], output: Path, chunk_size: int = MERGE_CHUNK_SIZE) -> Dict[str, int]:
+    """Stream all inputs into one deduplicated dataset and return row counts"""
+    index = KeyIndex()
+    writer = MasterWriter(output)
+    read = 0
+    try:
+        for path in inputs:
+            try:
+                for chunk in read_chunks(path, chunk_size):
+                    read += len(chunk)
+                    kept = index.filter(add_keys(chunk))
+                    writer.write(kept)
+            except Exception as e:
+                print(f"  skipped {path.name}: {e}")
+    finally:
+        writer.close()
+    return {'files': len(inputs), 'read': read, 'written': writer.rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge and deduplicate historical exports")
+    parser.add_argument('paths', nargs='*', default=[OUTPUT_DIR], help="Export files or directories (default: OUTPUT_DIR)")
+    parser.add_argument('--output', default=MERGE_OUTPUT_PATH, help="Master file (.csv, .jsonl or .xlsx - Excel stops at 1,048,576 rows)")
+    parser.add_argument('--chunk-size', type=int, default=MERGE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    inputs = find_inputs(args.paths, output)
+    if not inputs:
+        parser.error("no .xlsx/.csv/.jsonl exports found")
+
+    started = time.perf_counter()
+    counts = merge(inputs, output, args.chunk_size)
+    elapsed = time.perf_counter() - started
+    print(f"Merged {counts['read']} rows from {counts['files']} files -> "
+          f"{counts['written']} unique ({counts['read'] - counts['written']} duplicates) "
+          f"in {elapsed:.1f}s -> {output}")
+
+
+if __name__ == "__main__":
+    main()
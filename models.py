@@ -0,0 +1,183 @@
+"""Compact business record shared by the engine, UI, exports and API"""
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+# Placeholder used by older exports / dict results for "no value"
+MISSING = 'N/A'
+
+
+def extract_place_id(url: str) -> Optional[str]:
+    """Extract unique place ID from Google Maps URL"""
+    # Try CID format
+    cid_match = re.search(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)', url)
+    if cid_match:
+        return cid_match.group(1)
+    
+    # Try place_id format
+    place_match = re.search(r'place_id:([A-Za-z0-9_-]+)', url)
+    if place_match:
+        return place_match.group(1)
+    
+    # Try data format
+    data_match = re.search(r'/data=!3m1!4b1!4m[^/]+!3m[^/]+!1s([^!]+)', url)
+    if data_match:
+        return data_match.group(1)
+        
+    return url
+
+
+def normalize_phone(phone: str) -> str:
+    """Normalize phone number for comparison"""
+    if not phone:
+        return ""
+    # Remove all non-digit characters except +
+    normalized = re.sub(r'[^\d+]', '', phone)
+    # Remove leading zeros after country code
+    if normalized.startswith('+966'):
+        normalized = '+966' + normalized[4:].lstrip('0')
+    elif normalized.startswith('966'):
+        normalized = '966' + normalized[3:].lstrip('0')
+    elif normalized.startswith('0'):
+        normalized = normalized.lstrip('0')
+    return normalized
+
+
+def phone_key(phone: str) -> str:
+    """Country-code-free form of a normalized phone, for indexing and matching"""
+    normalized = normalize_phone(phone)
+    for prefix in ('+966', '966', '+'):
+        if normalized.startswith(prefix):
+            return normalized[len(prefix):]
+    return normalized
+
+
+def _text(value) -> Optional[str]:
+    """Clean a text field - empty strings and 'N/A' become None"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value if value and value != MISSING else None
+
+
+def _number(value) -> Optional[float]:
+    """Parse an optional float (coordinates, rating)"""
+    if value is None or value == MISSING or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _count(value) -> Optional[int]:
+    """Parse an optional count such as '1,234'"""
+    if value is None or value == MISSING:
+        return None
+    digits = ''.join(ch for ch in str(value) if ch.isdigit())
+    return int(digits) if digits else None
+
+
+def _items(value) -> Tuple[str, ...]:
+    """Normalize a list or comma-separated string into a tuple of values"""
+    if not value or value == MISSING:
+        return ()
+    if isinstance(value, str):
+        value = value.split(',')
+    return tuple(item.strip() for item in value if item and item.strip())
+
+
+class BusinessRecord:
+    """One extracted business - missing values are None (or an empty tuple), never 'N/A'"""
+
+    __slots__ = (
+        'name', 'phone', 'address', 'category', 'website', 'emails', 'socials',
+        'latitude', 'longitude', 'rating', 'review_count', 'url',
+    )
+
+    def __init__(self, name: Optional[str] = None, phone: Optional[str] = None,
+                 address: Optional[str] = None, category: Optional[str] = None,
+                 website: Optional[str] = None,
+                 emails: Iterable[str] = (), socials: Iterable[str] = (),
+                 latitude: Optional[float] = None, longitude: Optional[float] = None,
+                 rating: Optional[float] = None, review_count: Optional[int] = None,
+                 url: Optional[str] = None):
+        self.name = _text(name)
+        self.phone = _text(phone)
+        self.address = _text(address)
+        self.category = _text(category)
+        self.website = _text(website)
+        self.emails = _items(emails)
+        self.socials = _items(socials)
+        self.latitude = _number(latitude)
+        self.longitude = _number(longitude)
+        self.rating = _number(rating)
+        self.review_count = _count(review_count)
+        self.url = _text(url)
+
+    @property
+    def place_id(self) -> Optional[str]:
+        return extract_place_id(self.url) if self.url else None
+
+    @property
+    def has_phone(self) -> bool:
+        return self.phone is not None and len(self.phone) > 3
+
+    @property
+    def has_email(self) -> bool:
+        return bool(self.emails)
+
+    @property
+    def has_website(self) -> bool:
+        return self.website is not None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BusinessRecord':
+        """Build a record from a legacy result dict (string fields, 'N/A' sentinels)"""
+        return cls(
+            name=data.get('name'),
+            phone=data.get('phone'),
+            address=data.get('address'),
+            category=data.get('category'),
+            website=data.get('website'),
+            emails=data.get('emails'),
+            socials=data.get('socials'),
+            latitude=data.get('latitude'),
+            longitude=data.get('longitude'),
+            rating=data.get('rating'),
+            review_count=data.get('review_count'),
+            url=data.get('url'),
+        )
+
+    def replace(self, **changes) -> 'BusinessRecord':
+        """Copy of this record with some fields changed"""
+        fields = {field: getattr(self, field) for field in self.__slots__}
+        fields.update(changes)
+        return BusinessRecord(**fields)
+
+    def to_dict(self) -> Dict:
+        """Flat dict for export / JSON - list fields joined with ', ', missing values as None"""
+        return {
+            'name': self.name,
+            'phone': self.phone,
+            'address': self.address,
+            'category': self.category,
+            'website': self.website,
+            'emails': ", ".join(self.emails) or None,
+            'socials': ", ".join(self.socials) or None,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'rating': self.rating,
+            'review_count': self.review_count,
+            'url': self.url,
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BusinessRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"BusinessRecord(name={self.name!r}, phone={self.phone!r}, url={self.url!r})"
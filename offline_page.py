@@ -0,0 +1,260 @@
+"""Saved HTML with the slice of Playwright's page/locator API the place extraction uses
+
+scraper.read_place_details() only calls locator(...).first/.last, count(),
+inner_text() and get_attribute(), so an OfflinePage lets archived place panels
+be re-read with the engine's current selectors and parsing - no browser needed.
+
+Selectors: tag, .class, #id, [attr], [attr=v], [attr*=v], [attr^=v], [attr$=v],
+[attr~=v], descendant and child combinators, and comma groups.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr',
+}
+HIDDEN_TAGS = {'script', 'style', 'template', 'noscript'}
+
+_ATTR = re.compile(r'\[\s*([\w:-]+)\s*(?:([*^$~|]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]\s]+)))?\s*\]')
+_SIMPLE = re.compile(r'([.#])([\w-]+)')
+_TAG = re.compile(r'^(\*|[a-zA-Z][\w-]*)')
+
+
+class Element:
+    __slots__ = ('tag', 'attrs', 'children', 'parent', 'classes')
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional['Element']):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List = []  # Elements and text strings
+        self.parent = parent
+        self.classes = set(attrs.get('class', '').split())
+
+    def iter(self) -> Iterator['Element']:
+        """Descendants in document order"""
+        for child in self.children:
+            if isinstance(child, Element):
+                yield child
+                yield from child.iter()
+
+    def text(self) -> str:
+        parts = []
+        for child in self.children:
+            if isinstance(child, Element):
+                if child.tag not in HIDDEN_TAGS:
+                    parts.append(child.text())
+                    if child.tag in ('br', 'p', 'div', 'li', 'tr'):
+                        parts.append('\n')
+            else:
+                parts.append(child)
+        return ''.join(parts)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document', {}, None)
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, {name: value or '' for name, value in attrs}, self.current)
+        self.current.children.append(element)
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(Element(tag, {name: value or '' for name, value in attrs}, self.current))
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open tag - stray end tags are ignored
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(html: str) -> Element:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _parse_compound(text: str) -> Dict:
+    compound = {'tag': None, 'classes': [], 'id': None, 'attrs': []}
+    rest = text
+    tag = _TAG.match(rest)
+    if tag:
+        compound['tag'] = None if tag.group(1) == '*' else tag.group(1).lower()
+        rest = rest[tag.end():]
+    while rest:
+        attr = _ATTR.match(rest)
+        if attr:
+            value = next((v for v in attr.group(3, 4, 5) if v is not None), None)
+            compound['attrs'].append((attr.group(1), attr.group(2), value))
+            rest = rest[attr.end():]
+            continue
+        simple = _SIMPLE.match(rest)
+        if simple:
+            if simple.group(1) == '.':
+                compound['classes'].append(simple.group(2))
+            else:
+                compound['id'] = simple.group(2)
+            rest = rest[simple.end():]
+            continue
+        raise ValueError(f"Unsupported selector: {text}")
+    return compound
+
+
+def _split(selector: str, separators: str) -> List[str]:
+    """Split on separator characters outside [...] and quotes"""
+    parts, current, depth, quote = [], '', 0, None
+    for char in selector:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif depth == 0 and char in separators:
+            parts.append(current)
+            current = ''
+            continue
+        current += char
+    parts.append(current)
+    return parts
+
+
+def parse_selector(selector: str) -> List[List]:
+    """'a b > c, d' -> [[(None, a), (' ', b), ('>', c)], [(None, d)]]"""
+    groups = []
+    for group in _split(selector, ','):
+        steps, combinator = [], None
+        for token in _split(group.replace('>', ' > '), ' \t\n'):
+            if not token:
+                continue
+            if token == '>':
+                combinator = '>'
+                continue
+            steps.append((combinator if steps else None, _parse_compound(token)))
+            combinator = ' '
+        if not steps:
+            raise ValueError(f"Empty selector: {selector}")
+        groups.append(steps)
+    return groups
+
+
+def _matches_compound(element: Element, compound: Dict) -> bool:
+    if compound['tag'] and element.tag != compound['tag']:
+        return False
+    if compound['id'] and element.attrs.get('id') != compound['id']:
+        return False
+    if any(name not in element.classes for name in compound['classes']):
+        return False
+    for name, operator, value in compound['attrs']:
+        actual = element.attrs.get(name)
+        if actual is None:
+            return False
+        if operator == '=' and actual != value:
+            return False
+        if operator == '*=' and value not in actual:
+            return False
+        if operator == '^=' and not actual.startswith(value):
+            return False
+        if operator == '$=' and not actual.endswith(value):
+            return False
+        if operator == '~=' and value not in actual.split():
+            return False
+        if operator == '|=' and actual != value and not actual.startswith(f"{value}-"):
+            return False
+    return True
+
+
+def _matches(element: Element, steps: List, index: int) -> bool:
+    """Right-to-left match of steps[:index + 1] (ancestors may lie outside the queried root, as in the DOM)"""
+    combinator, compound = steps[index]
+    if not _matches_compound(element, compound):
+        return False
+    if index == 0:
+        return True
+    parent = element.parent
+    if combinator == '>':
+        return parent is not None and _matches(parent, steps, index - 1)
+    while parent is not None:
+        if _matches(parent, steps, index - 1):
+            return True
+        parent = parent.parent
+    return False
+
+
+def select(root: Element, selector: str) -> List[Element]:
+    """Elements under root matching the selector, in document order"""
+    groups = parse_selector(selector)
+    return [element for element in root.iter()
+            if any(_matches(element, steps, len(steps) - 1) for steps in groups)]
+
+
+class OfflineLocator:
+    """Lazy query like a Playwright Locator (async methods, first/last narrowing)"""
+
+    def __init__(self, root: Element, selector: str, pick: Optional[int] = None):
+        self._root = root
+        self._selector = selector
+        self._pick = pick
+
+    def _elements(self) -> List[Element]:
+        try:
+            found = select(self._root, self._selector)
+        except ValueError:
+            return []
+        if self._pick is None:
+            return found
+        return found[self._pick:][:1] if self._pick >= 0 else found[self._pick:][-1:]
+
+    def _element(self) -> Element:
+        found = self._elements()
+        if not found:
+            raise LookupError(f"No element matches {self._selector}")
+        return found[0]
+
+    @property
+    def first(self) -> 'OfflineLocator':
+        return OfflineLocator(self._root, self._selector, 0)
+
+    @property
+    def last(self) -> 'OfflineLocator':
+        return OfflineLocator(self._root, self._selector, -1)
+
+    def locator(self, selector: str) -> 'OfflineLocator':
+        found = self._elements()
+        return OfflineLocator(found[0] if found else Element('#empty', {}, None), selector)
+
+    async def count(self) -> int:
+        return len(self._elements())
+
+    async def inner_text(self, timeout: Optional[float] = None) -> str:
+        text = self._element().text()
+        return re.sub(r'[ \t\r\f\v]+', ' ', text).strip()
+
+    async def get_attribute(self, name: str, timeout: Optional[float] = None) -> Optional[str]:
+        return self._element().attrs.get(name)
+
+
+class OfflinePage:
+    """A saved page (HTML and the URL it was at)"""
+
+    def __init__(self, html: str, url: str = ''):
+        self.url = url
+        self.document = parse_html(html)
+
+    def locator(self, selector: str) -> OfflineLocator:
+        return OfflineLocator(self.document, selector)
@@ -0,0 +1,249 @@
+"""Proxy pool - place pages spread over egress IPs by health score
+
+Each proxy in PROXIES gets its own browser context (created by the engine on
+first use, recycled on the same page / memory thresholds as the main context)
+and at most PROXY_PAGES_PER_PROXY pages at once. A proxy that hits a
+captcha, fails PROXY_MAX_FAILURES times in a row or averages slower than
+PROXY_SLOW_SECONDS per place is benched; when the bench expires a single probe
+page decides whether it comes back (otherwise the bench doubles).
+
+Per-proxy statistics are kept across runs:   python proxy_pool.py
+Local forward-proxy stand-ins for testing:   python proxy_pool.py --stand-in 8901 --count 3
+    (then PROXIES = ["http://127.0.0.1:8901", "http://127.0.0.1:8902", "http://127.0.0.1:8903"])
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import unquote, urlparse
+from config import *
+
+STATS_FILE = "proxy_stats.json"
+
+STATE_HEALTHY = 'healthy'
+STATE_BENCHED = 'benched'
+STATE_PROBING = 'probing'
+
+MIN_SCORE = 0.05  # Weight floor so a recovering proxy still gets picked
+
+# Failure kinds (scraper.FAILURE_*) that bench a proxy at once
+BENCH_NOW_FAILURES = ('blocked',)
+
+
+class ProxyState:
+    """One egress proxy: its context, health score and counters"""
+
+    def __init__(self, url: str):
+        parsed = urlparse(url if '://' in url else f"http://{url}")
+        self.url = url
+        # host[:port] without credentials - Playwright applies the scheme's default port
+        self.label = parsed.netloc.rpartition('@')[2]
+        self.option = {'server': f"{parsed.scheme}://{self.label}"}
+        if parsed.username:
+            self.option['username'] = unquote(parsed.username)
+            self.option['password'] = unquote(parsed.password or '')
+
+        self.context = None  # Browser context, owned by the engine
+        self.context_pages_opened = 0  # Pages of the current context (recycled like the main one)
+        self.state = STATE_HEALTHY
+        self.score = 1.0
+        self.avg_seconds: Optional[float] = None
+        self.in_flight = 0
+        self.failures_in_row = 0
+        self.bench_seconds = PROXY_BENCH_SECONDS
+        self.benched_until = 0.0
+        self.stats = {'pages': 0, 'ok': 0, 'failed': 0, 'captchas': 0, 'benched': 0, 'seconds': 0.0}
+
+    def available(self, now: float) -> bool:
+        if self.state == STATE_BENCHED:
+            if now < self.benched_until:
+                return False
+            self.state = STATE_PROBING
+        if self.state == STATE_PROBING:
+            return self.in_flight == 0
+        return self.in_flight < PROXY_PAGES_PER_PROXY
+
+
+class ProxyPool:
+    """Picks a proxy per place page and scores it by the outcome"""
+
+    def __init__(self, urls: List[str] = PROXIES, cache_dir: str = CACHE_DIR):
+        self.proxies = [ProxyState(url) for url in urls]
+        self.path = Path(cache_dir) / STATS_FILE
+        self._changed = asyncio.Condition()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for proxy in self.proxies:
+            if proxy.label in saved:
+                proxy.stats.update(saved[proxy.label])
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({proxy.label: proxy.stats for proxy in self.proxies}, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    async def acquire(self) -> ProxyState:
+        """Wait for a proxy with a free slot - healthier proxies are picked more often"""
+        async with self._changed:
+            while True:
+                now = time.monotonic()
+                ready = [proxy for proxy in self.proxies if proxy.available(now)]
+                if ready:
+                    proxy = random.choices(ready, weights=[max(p.score, MIN_SCORE) for p in ready])[0]
+                    proxy.in_flight += 1
+                    return proxy
+                # All busy or benched - wake up on a release or the next bench expiry
+                benched = [p.benched_until for p in self.proxies if p.state == STATE_BENCHED]
+                timeout = max(0.1, min(benched) - now) if benched else None
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, proxy: ProxyState, failure: Optional[str] = None, seconds: Optional[float] = None):
+        """Score one finished place page (failure is a FAILURE_* kind or None) - no seconds = not scored"""
+        proxy.in_flight -= 1
+        if seconds is not None:
+            self._score(proxy, failure, seconds)
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _score(self, proxy: ProxyState, failure: Optional[str], seconds: float):
+        proxy.stats['pages'] += 1
+        proxy.stats['seconds'] += seconds
+        proxy.avg_seconds = seconds if proxy.avg_seconds is None else (
+            proxy.avg_seconds + PROXY_SCORE_ALPHA * (seconds - proxy.avg_seconds))
+        proxy.score += PROXY_SCORE_ALPHA * ((0.0 if failure else 1.0) - proxy.score)
+
+        if failure:
+            proxy.stats['failed'] += 1
+            proxy.failures_in_row += 1
+            if failure in BENCH_NOW_FAILURES:
+                proxy.stats['captchas'] += 1
+            if (failure in BENCH_NOW_FAILURES or proxy.state == STATE_PROBING
+                    or proxy.failures_in_row >= PROXY_MAX_FAILURES):
+                self._bench(proxy)
+        else:
+            proxy.stats['ok'] += 1
+            proxy.failures_in_row = 0
+            if proxy.state == STATE_PROBING:
+                proxy.state = STATE_HEALTHY
+                proxy.bench_seconds = PROXY_BENCH_SECONDS
+            elif proxy.avg_seconds > PROXY_SLOW_SECONDS:
+                self._bench(proxy)
+
+    def _bench(self, proxy: ProxyState):
+        if proxy.state == STATE_BENCHED:
+            return  # A page that was in flight when it was benched
+        if proxy.state == STATE_PROBING:
+            proxy.bench_seconds = min(proxy.bench_seconds * 2, PROXY_BENCH_MAX_SECONDS)
+        proxy.state = STATE_BENCHED
+        proxy.benched_until = time.monotonic() + proxy.bench_seconds
+        proxy.avg_seconds = None
+        proxy.failures_in_row = 0
+        proxy.stats['benched'] += 1
+
+    def healthy_count(self) -> int:
+        return sum(1 for proxy in self.proxies if proxy.state != STATE_BENCHED)
+
+    def summary(self) -> List[str]:
+        """One line per proxy for the end-of-run report"""
+        lines = []
+        for proxy in self.proxies:
+            stats = proxy.stats
+            average = stats['seconds'] / stats['pages'] if stats['pages'] else 0
+            lines.append(f"{proxy.label} [{proxy.state}] score {proxy.score:.2f} - "
+                         f"{stats['ok']}/{stats['pages']} ok, {stats['captchas']} captchas, "
+                         f"benched {stats['benched']}x, {average:.1f}s/place")
+        return lines
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, delay: float):
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            if delay:
+                await asyncio.sleep(delay)
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve_stand_in(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, delay: float):
+    """Minimal forward proxy: CONNECT tunnels and absolute-URI HTTP requests"""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+        method, target, version = head.split(b'\r\n', 1)[0].decode('latin-1').split(' ', 2)
+        if method == 'CONNECT':
+            host, port = target.rsplit(':', 1)
+            upstream_reader, upstream_writer = await asyncio.open_connection(host, int(port))
+            writer.write(b'HTTP/1.1 200 Connection established\r\n\r\n')
+        else:
+            url = urlparse(target)
+            upstream_reader, upstream_writer = await asyncio.open_connection(url.hostname, url.port or 80)
+            path = (url.path or '/') + (f"?{url.query}" if url.query else '')
+            upstream_writer.write(head.replace(target.encode('latin-1'), path.encode('latin-1'), 1))
+        await writer.drain()
+    except Exception:
+        writer.close()
+        return
+    await asyncio.gather(_pipe(reader, upstream_writer, delay), _pipe(upstream_reader, writer, delay))
+
+
+async def run_stand_ins(first_port: int, count: int, delay: float = 0.0):
+    """Serve `count` local forward proxies on consecutive ports until interrupted"""
+    servers = []
+    for port in range(first_port, first_port + count):
+        servers.append(await asyncio.start_server(
+            lambda r, w: _serve_stand_in(r, w, delay), '127.0.0.1', port))
+        print(f"Forward proxy stand-in on http://127.0.0.1:{port}")
+    await asyncio.gather(*(server.serve_forever() for server in servers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proxy statistics / local forward-proxy stand-ins")
+    parser.add_argument('--stand-in', type=int, metavar='PORT', help="Serve stand-in proxies from this port")
+    parser.add_argument('--count', type=int, default=1, help="Number of stand-in proxies")
+    parser.add_argument('--delay', type=float, default=0.0, help="Added latency per forwarded chunk (simulate a slow IP)")
+    args = parser.parse_args()
+
+    if args.stand_in:
+        try:
+            asyncio.run(run_stand_ins(args.stand_in, args.count, args.delay))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    pool = ProxyPool()
+    if not pool.proxies:
+        print("No PROXIES configured")
+    for line in pool.summary():
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
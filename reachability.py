@@ -0,0 +1,175 @@
+"""Fast-fail reachability probe with a persistent negative cache for business websites"""
+
+import asyncio
+import json
+import os
+import socket
+import ssl
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from config import *
+
+CACHE_FILE = "reachability.json"
+
+
+# Failures worth remembering for REACHABILITY_DEAD_TTL_HOURS - the rest may clear up on the next run
+DEFINITIVE_FAILURES = {'dns', 'refused', 'tls'}
+
+# Delay before trying the next resolved address (RFC 8305 "connection attempt delay")
+PROBE_STAGGER = 0.25
+
+
+async def _connect(address: str, host: str, port: int, use_tls: bool, timeout: float) -> str:
+    """Connect to one resolved address - returns 'ok' or the failure reason"""
+    ssl_context = ssl.create_default_context() if use_tls else None
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(address, port, ssl=ssl_context,
+                                    server_hostname=host if use_tls else None),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        return 'connect_timeout'
+    except ssl.SSLError:
+        # Chromium refuses these pages too (expired / mismatched certificates)
+        return 'tls'
+    except ConnectionRefusedError:
+        return 'refused'
+    except OSError:
+        # e.g. an IPv6 address on an IPv4-only network
+        return 'connect'
+
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+    return 'ok'
+
+
+async def probe_host(host: str, port: int, use_tls: bool,
+                     timeout: float = REACHABILITY_TIMEOUT) -> Tuple[bool, str]:
+    """Resolve and connect (with TLS handshake for https) within timeout overall - returns (reachable, reason)"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        infos = await asyncio.wait_for(loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout)
+    except asyncio.TimeoutError:
+        return False, 'dns_timeout'
+    except socket.gaierror as e:
+        # Only "no such host" is definitive - other resolver errors are usually temporary
+        return False, 'dns' if e.errno in (socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', None)) else 'dns_error'
+    except OSError:
+        return False, 'dns_error'
+
+    # Try every address in resolver order (the first may be IPv6 on an IPv4-only network),
+    # staggered like Happy Eyeballs so a hanging address does not use up the budget
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    if not addresses:
+        return False, 'dns'
+
+    async def attempt(position: int, address: str) -> str:
+        await asyncio.sleep(position * PROBE_STAGGER)
+        return await _connect(address, host, port, use_tls, max(0.0, deadline - loop.time()))
+
+    attempts = [asyncio.ensure_future(attempt(position, address)) for position, address in enumerate(addresses)]
+    reasons = []
+    try:
+        # One deadline for the whole probe, not one per address
+        for finished in asyncio.as_completed(attempts, timeout=max(0.0, deadline - loop.time())):
+            reason = await finished
+            if reason == 'ok':
+                return True, 'ok'
+            reasons.append(reason)
+    except asyncio.TimeoutError:
+        reasons.append('connect_timeout')
+    finally:
+        for task in attempts:
+            task.cancel()
+    # Dead for sure only if every address failed definitively
+    for reason in reasons:
+        if reason not in DEFINITIVE_FAILURES:
+            return False, reason
+    return False, reasons[0]
+
+
+class ReachabilityChecker:
+    """Probe website hosts before a tab is opened, remembering results across runs"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_path = Path(cache_dir) / CACHE_FILE
+        self.entries: Dict[str, Dict] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        # Older caches kept timeouts for the full dead TTL
+        transient_expiry = time.time() + REACHABILITY_TRANSIENT_TTL_HOURS * 3600
+        for entry in self.entries.values():
+            if not entry.get('ok') and entry.get('reason') not in DEFINITIVE_FAILURES:
+                entry['expires'] = min(entry.get('expires', 0), transient_expiry)
+
+    def save(self):
+        """Persist non-expired entries (atomic replace)"""
+        now = time.time()
+        live = {key: entry for key, entry in self.entries.items() if entry['expires'] > now}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(live, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def _cached(self, key: str) -> Optional[Dict]:
+        entry = self.entries.get(key)
+        if entry and entry['expires'] > time.time():
+            return entry
+        return None
+
+    async def _probe(self, key: str, host: str, port: int, use_tls: bool) -> Dict:
+        ok, reason = await probe_host(host, port, use_tls)
+        if ok:
+            ttl_hours = REACHABILITY_ALIVE_TTL_HOURS
+        elif reason in DEFINITIVE_FAILURES:
+            ttl_hours = REACHABILITY_DEAD_TTL_HOURS
+        else:
+            ttl_hours = REACHABILITY_TRANSIENT_TTL_HOURS
+        entry = {'ok': ok, 'reason': reason, 'expires': time.time() + ttl_hours * 3600}
+        if ttl_hours > 0:
+            self.entries[key] = entry
+        return entry
+
+    async def is_reachable(self, url: str) -> bool:
+        """Return False (instantly when cached) if the website cannot be opened"""
+        try:
+            parsed = urlparse(url)
+            host = parsed.hostname
+            port = parsed.port
+        except ValueError:
+            return False
+        if not host:
+            return False
+        use_tls = parsed.scheme == 'https'
+        port = port or (443 if use_tls else 80)
+        key = f"{host.lower()}:{port}"
+
+        entry = self._cached(key)
+        if entry is None:
+            # Several businesses often share a host - probe it once
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = asyncio.ensure_future(self._probe(key, host, port, use_tls))
+                self._inflight[key] = pending
+                pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+            entry = await asyncio.shield(pending)
+
+        return entry['ok']
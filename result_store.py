@@ -0,0 +1,255 @@
+"""Indexed local SQLite store of every extracted business, with a query API
+
+Query from the command line:
+    python result_store.py --city Jeddah --tag "dental clinic" --has-email
+    python result_store.py --city Jeddah --has-phone --export jeddah_leads.csv
+"""
+
+import argparse
+import csv
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import *
+from models import BusinessRecord, phone_key
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 7  # ~150 m cells
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id           INTEGER PRIMARY KEY,
+    place_id     TEXT NOT NULL,
+    name         TEXT,
+    phone        TEXT,
+    phone_norm   TEXT,
+    address      TEXT,
+    category     TEXT,
+    website      TEXT,
+    emails       TEXT,
+    socials      TEXT,
+    latitude     REAL,
+    longitude    REAL,
+    geohash      TEXT,
+    rating       REAL,
+    review_count INTEGER,
+    url          TEXT,
+    business_tag TEXT COLLATE NOCASE,
+    region       TEXT COLLATE NOCASE,
+    city         TEXT COLLATE NOCASE,
+    district     TEXT COLLATE NOCASE,
+    run_id       TEXT,
+    scraped_at   REAL,
+    UNIQUE (place_id, business_tag, city)
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_results_place_id ON results (place_id);
+CREATE INDEX IF NOT EXISTS idx_results_phone_norm ON results (phone_norm);
+CREATE INDEX IF NOT EXISTS idx_results_city ON results (city);
+CREATE INDEX IF NOT EXISTS idx_results_business_tag ON results (business_tag);
+CREATE INDEX IF NOT EXISTS idx_results_geohash ON results (geohash);
+"""
+
+COLUMNS = (
+    'place_id', 'name', 'phone', 'phone_norm', 'address', 'category', 'website', 'emails', 'socials',
+    'latitude', 'longitude', 'geohash', 'rating', 'review_count', 'url',
+    'business_tag', 'region', 'city', 'district', 'run_id', 'scraped_at',
+)
+
+INSERT_SQL = (
+    f"INSERT OR REPLACE INTO results ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+)
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base32 geohash of a coordinate"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+class ResultStore:
+    """SQLite (WAL) store with batched inserts and indexed filters"""
+
+    def __init__(self, path: str = RESULT_STORE_PATH, batch_size: int = RESULT_STORE_BATCH_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.executescript(INDEXES)
+        self._pending: List[Tuple] = []
+
+    def _migrate(self):
+        """Add columns introduced after a database was created"""
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        for column in COLUMNS:
+            if column not in existing:
+                column_type = SCHEMA.split(f"\n    {column} ", 1)[1].split(',', 1)[0].strip()
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {column} {column_type}")
+
+    def add(self, record: BusinessRecord, campaign: Dict):
+        """Buffer a record - written with the next batch"""
+        geohash = None
+        if record.latitude is not None and record.longitude is not None:
+            geohash = geohash_encode(record.latitude, record.longitude)
+        row = record.to_dict()
+        self._pending.append((
+            record.place_id or record.name or '',
+            row['name'], row['phone'], phone_key(record.phone or '') or None,
+            row['address'], row['category'], row['website'], row['emails'], row['socials'],
+            row['latitude'], row['longitude'], geohash, row['rating'], row['review_count'], row['url'],
+            campaign.get('business_tag'), campaign.get('region'), campaign.get('city'),
+            campaign.get('district') or None, campaign.get('run_id'), time.time(),
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records in one transaction"""
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(INSERT_SQL, self._pending)
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    @staticmethod
+    def _where(city: Optional[str] = None, business_tag: Optional[str] = None,
+               region: Optional[str] = None, place_id: Optional[str] = None,
+               phone: Optional[str] = None, geohash_prefix: Optional[str] = None,
+               name_contains: Optional[str] = None, run_id: Optional[str] = None,
+               has_email: Optional[bool] = None, has_phone: Optional[bool] = None,
+               has_website: Optional[bool] = None) -> Tuple[str, List]:
+        clauses = []
+        params: List = []
+        for column, value in (('city', city), ('business_tag', business_tag), ('region', region),
+                              ('place_id', place_id), ('run_id', run_id)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value.strip())
+        if phone:
+            clauses.append("phone_norm = ?")
+            params.append(phone_key(phone))
+        if geohash_prefix:
+            # Range scan keeps the geohash index usable
+            clauses.append("geohash >= ? AND geohash < ?")
+            params.extend([geohash_prefix, geohash_prefix + '~'])
+        if name_contains:
+            clauses.append("name LIKE ?")
+            params.append(f"%{name_contains}%")
+        for column, flag in (('emails', has_email), ('phone_norm', has_phone), ('website', has_website)):
+            if flag is not None:
+                clauses.append(f"{column} IS {'NOT ' if flag else ''}NULL")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, **filters) -> int:
+        """Number of stored records matching the filters"""
+        self.flush()
+        where, params = self._where(**filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def iter_rows(self, limit: Optional[int] = None, offset: int = 0, **filters) -> Iterator[Dict]:
+        """Stream matching rows (record fields plus campaign columns) as dicts"""
+        self.flush()
+        where, params = self._where(**filters)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM results{where} ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        for row in self.conn.execute(sql, params):
+            yield dict(zip(COLUMNS, row))
+
+    def query(self, page: int = 1, page_size: int = 100, **filters) -> List[BusinessRecord]:
+        """One page of matching records, oldest first"""
+        offset = (max(1, page) - 1) * page_size
+        return [BusinessRecord.from_dict(row) for row in self.iter_rows(limit=page_size, offset=offset, **filters)]
+
+    def export(self, filepath: str, **filters) -> int:
+        """Write matching rows to .csv (streamed) or .xlsx and return the row count"""
+        filepath = Path(filepath)
+        if filepath.suffix.lower() == '.xlsx':
+            import pandas as pd
+
+            df = pd.DataFrame.from_records(list(self.iter_rows(**filters)), columns=COLUMNS)
+            df.to_excel(filepath, index=False, engine='openpyxl')
+            return len(df)
+
+        written = 0
+        with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            for row in self.iter_rows(**filters):
+                writer.writerow(row)
+                written += 1
+        return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local result store")
+    parser.add_argument('--db', default=RESULT_STORE_PATH)
+    parser.add_argument('--city')
+    parser.add_argument('--tag', dest='business_tag')
+    parser.add_argument('--region')
+    parser.add_argument('--phone')
+    parser.add_argument('--geohash', dest='geohash_prefix')
+    parser.add_argument('--name', dest='name_contains')
+    parser.add_argument('--has-email', action='store_const', const=True, dest='has_email')
+    parser.add_argument('--has-phone', action='store_const', const=True, dest='has_phone')
+    parser.add_argument('--has-website', action='store_const', const=True, dest='has_website')
+    parser.add_argument('--page', type=int, default=1)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--export', help="Write all matches to this .csv/.xlsx file")
+    args = parser.parse_args()
+
+    filters = {key: value for key, value in vars(args).items()
+               if key not in ('db', 'page', 'page_size', 'export') and value is not None}
+    store = ResultStore(args.db)
+    started = time.perf_counter()
+    try:
+        if args.export:
+            written = store.export(args.export, **filters)
+            print(f"Exported {written} rows -> {args.export}")
+            return
+        total = store.count(**filters)
+        records = store.query(page=args.page, page_size=args.page_size, **filters)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"{total} matches ({elapsed_ms:.1f} ms) - page {args.page}")
+        for record in records:
+            print(f"  {record.name or '-'} | {record.phone or '-'} | {', '.join(record.emails) or '-'} | {record.website or '-'}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
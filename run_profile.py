@@ -0,0 +1,196 @@
+"""Opt-in run profiler - where a slow campaign spends its time
+
+Enable with PROFILE_RUNS = True in config.py, ``python batch.py --profile`` or
+``scraper.profile = True``. Each run writes PROFILE_DIR/<run_id>/ with:
+    summary.txt          top hot spots, slow callbacks, recorded traces
+    stacks.folded        sampled event-loop stacks (flamegraph.pl / speedscope)
+    slow_callbacks.log   asyncio debug warnings for callbacks over PROFILE_SLOW_CALLBACK
+    traces/*.zip         Playwright traces of sampled places, each on its own context (playwright show-trace)
+When disabled nothing is started - the engine only checks `scraper.profiler is None`.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional, Tuple
+from config import *
+
+# Frames of the event loop waiting for I/O - counted as idle, not as hot spots
+IDLE_FUNCTIONS = {'select', 'poll', 'epoll', '_poll', 'wait', 'control'}
+
+SLOW_CALLBACK_REGEX = re.compile(r'took (\d+\.\d+) seconds')
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Collects asyncio's 'Executing ... took N seconds' warnings"""
+
+    def __init__(self, path: Path):
+        super().__init__(logging.WARNING)
+        self.file = open(path, 'w', encoding='utf-8')
+        self.records: List[Tuple[float, str]] = []
+
+    def emit(self, record: logging.LogRecord):
+        message = record.getMessage()
+        self.file.write(message + "\n")
+        match = SLOW_CALLBACK_REGEX.search(message)
+        if match:
+            self.records.append((float(match.group(1)), message))
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+class RunProfiler:
+    """Samples the event-loop thread, records asyncio slow callbacks and a few page traces"""
+
+    def __init__(self, run_id: str, directory: str = PROFILE_DIR,
+                 interval: float = PROFILE_SAMPLE_INTERVAL, trace_sample: float = PROFILE_TRACE_SAMPLE):
+        self.run_id = run_id
+        self.directory = Path(directory) / run_id
+        self.interval = interval
+        self.trace_sample = trace_sample
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.traces: List[Path] = []
+        self._tracing = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_debug = False
+        self._slow_callback_duration = 0.1
+        self._handler: Optional[_SlowCallbackHandler] = None
+        self._started_at = 0.0
+
+    def start(self):
+        """Begin sampling the running loop's thread - call from inside the loop"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._started_at = time.perf_counter()
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_debug = self._loop.get_debug()
+        self._slow_callback_duration = self._loop.slow_callback_duration
+        self._loop.set_debug(True)
+        self._loop.slow_callback_duration = PROFILE_SLOW_CALLBACK
+        self._handler = _SlowCallbackHandler(self.directory / "slow_callbacks.log")
+        logging.getLogger('asyncio').addHandler(self._handler)
+
+        target = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, args=(target,), name='run-profiler', daemon=True)
+        self._thread.start()
+
+    def _sample(self, target: int):
+        """Sampler thread: one stack of the loop thread every `interval` seconds"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            self.samples += 1
+            if frame.f_code.co_name in IDLE_FUNCTIONS:
+                self.idle_samples += 1
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def sample_trace(self) -> bool:
+        """Decide whether to trace this place - one trace at a time; start_trace or cancel_trace must follow"""
+        if self._tracing or random.random() >= self.trace_sample:
+            return False
+        self._tracing = True
+        return True
+
+    def cancel_trace(self):
+        self._tracing = False
+
+    async def start_trace(self, context) -> bool:
+        """Start tracing a sampled place's context - it must hold only that place's page,
+        since a Playwright trace records every page of its context"""
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True)
+            return True
+        except Exception:
+            self._tracing = False
+            return False
+
+    async def stop_trace(self, context, label: str):
+        """Save the running trace as traces/<n>_<label>.zip"""
+        name = re.sub(r'[^\w-]+', '_', label)[-60:].strip('_') or 'page'
+        path = self.directory / "traces" / f"{len(self.traces) + 1:03d}_{name}.zip"
+        try:
+            path.parent.mkdir(exist_ok=True)
+            await context.tracing.stop(path=str(path))
+            self.traces.append(path)
+        except Exception:
+            pass
+        finally:
+            self._tracing = False
+
+    def hot_spots(self, top: int = PROFILE_TOP_N) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+        """(self, inclusive) sample counts of the busiest functions"""
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+        return own.most_common(top), inclusive.most_common(top)
+
+    def stop(self) -> Path:
+        """Stop sampling, restore the loop and write the artifact directory"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self._handler:
+            logging.getLogger('asyncio').removeHandler(self._handler)
+            self._handler.close()
+        if self._loop:
+            self._loop.set_debug(self._loop_debug)
+            self._loop.slow_callback_duration = self._slow_callback_duration
+
+        with open(self.directory / "stacks.folded", 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+        (self.directory / "summary.txt").write_text(self.summary(), encoding='utf-8')
+        return self.directory
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self._started_at
+        busy = self.samples - self.idle_samples
+        own, inclusive = self.hot_spots()
+        slow = sorted(self._handler.records, reverse=True) if self._handler else []
+
+        lines = ["=" * 60, f"RUN PROFILE {self.run_id}", "=" * 60,
+                 f"Duration: {elapsed:.1f}s | samples: {self.samples} | "
+                 f"loop busy: {busy / self.samples * 100 if self.samples else 0:.1f}%"]
+
+        def share(count: int) -> str:
+            return f"{count / busy * 100:6.1f}%" if busy else "     -"
+
+        lines.append(f"\nHot spots - self time (top {len(own)}, % of busy samples):")
+        lines.extend(f"  {share(count)}  {label}" for label, count in own)
+        lines.append(f"\nHot spots - inclusive time (top {len(inclusive)}):")
+        lines.extend(f"  {share(count)}  {label}" for label, count in inclusive)
+
+        lines.append(f"\nSlow callbacks (> {PROFILE_SLOW_CALLBACK * 1000:.0f} ms): {len(slow)}")
+        lines.extend(f"  {seconds * 1000:8.0f} ms  {message[:160]}" for seconds, message in slow[:10])
+
+        lines.append(f"\nPlaywright traces ({len(self.traces)}) - open with: playwright show-trace <file>")
+        lines.extend(f"  {path.name}" for path in self.traces)
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
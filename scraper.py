@@ -1,167 +1,645 @@
 """Google Maps Scraper Engine - Enterprise Enhanced Version"""
 
+from __future__ import annotations
+
 import asyncio
+import functools
+import json
 import random
 import re
+import time
+import uuid
+from pathlib import Path
 from urllib.parse import quote, urlparse
-from typing import Callable, Optional, Dict, List, Set
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from typing import TYPE_CHECKING, Callable, Optional, Dict, List, Set
 from config import *
+from host_limiter import HostLimiter, THROTTLE_STATUSES, host_of, is_aggregator_host
+from reachability import ReachabilityChecker
+from browser_server import endpoint_url, launch_server, server_version, wait_until_ready
+from selector_stats import SelectorStats
+from models import BusinessRecord, extract_place_id, normalize_phone
+from maps_payload import decode_payload, is_maps_payload_url, place_cid
+from result_store import ResultStore
+from run_profile import RunProfiler
+from proxy_pool import ProxyPool, ProxyState
+from throughput import ThroughputMeter
+from event_log import event_log
+from snapshot_archive import KIND_PAYLOAD, KIND_PLACE, KIND_WEBSITE, SnapshotArchive
+
+# Playwright is imported on first search (see initialize) to keep app startup fast
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Browser, BrowserContext
 
 # Enhanced Regex patterns
 EMAIL_REGEX = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
 PHONE_REGEX = r'(\+?[\d\s\-()]{8,})'
 SA_PHONE_REGEX = r'(?:\+?966|0)?[\s-]?(?:5\d{8}|1[1-9]\d{7})'  # Saudi phone format
 
-class GoogleMapsScraper:
-    def __init__(self):
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self.playwright = None
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+]
+
+# The shared server's default context cannot take context options - pass them as flags
+SERVER_BROWSER_ARGS = BROWSER_ARGS + [
+    f'--user-agent={USER_AGENT}',
+    f'--window-size={VIEWPORT_WIDTH},{VIEWPORT_HEIGHT}',
+    '--lang=en-US',
+]
+
+CONTEXT_OPTIONS = dict(
+    viewport={'width': VIEWPORT_WIDTH, 'height': VIEWPORT_HEIGHT},
+    user_agent=USER_AGENT,
+    locale='en-US',
+    timezone_id='Asia/Riyadh',
+    geolocation={'latitude': 24.7136, 'longitude': 46.6753},  # Riyadh default
+    permissions=['geolocation'],
+)
+
+STEALTH_SCRIPT = """
+    // Hide webdriver
+    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+    
+    // Override plugins
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+    
+    // Override languages
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en', 'ar']
+    });
+    
+    // Override platform
+    Object.defineProperty(navigator, 'platform', {
+        get: () => 'Win32'
+    });
+    
+    // Mock chrome object
+    window.chrome = { runtime: {} };
+    
+    // Override permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+"""
+
+
+# Fallback selector lists - tried in learned order, best first (see selector_stats.py)
+CONTAINER_SELECTORS = [
+    'div[role="feed"]',
+    'div[role="main"] div.m6QErb',
+    'div.m6QErb.DxyBCb',
+    'div.m6QErb',
+    'div[aria-label*="Results"]',
+    'div.Nv2PK',
+]
+
+LINK_SELECTORS = [
+    'a[href*="/maps/place/"]',
+    'a.hfpxzc',
+    'div.Nv2PK a',
+    'a[data-value]',
+]
+
+NAME_SELECTORS = ['h1', 'h1.DUwDvf', '[data-attrid="title"]']
+
+PHONE_SELECTORS = [
+    'button[data-item-id*="phone"]',
+    'a[href^="tel:"]',
+    '[data-tooltip*="phone"]',
+]
+
+ADDRESS_SELECTORS = [
+    'button[data-item-id*="address"]',
+    '[data-item-id*="address"]',
+    '.Io6YTe',
+]
+
+CATEGORY_SELECTOR = 'button.DkEaL'
+WEBSITE_SELECTOR = 'a[data-item-id="authority"]'
+
+# Panel mode (PLACE_NAVIGATION = "panel") - result card links, the list and the details panel
+CARD_LINK_SELECTOR = 'a.hfpxzc'
+FEED_SELECTOR = 'div[role="feed"]'
+PANEL_SELECTOR = 'div[role="main"]:has(h1.DUwDvf)'
+
+# Details panel markup kept in the snapshot archive (the whole body if the panel is not found)
+PANEL_HTML_JS = """
+    () => {
+        const heading = document.querySelector('div[role="main"] h1.DUwDvf');
+        return ((heading && heading.closest('div[role="main"]')) || document.body).outerHTML;
+    }
+"""
+
+# The details panel shows the clicked place: the URL carries its feature id and a heading is visible
+PANEL_READY_JS = """
+    cid => decodeURIComponent(location.href).includes(cid)
+        && [...document.querySelectorAll('h1.DUwDvf')].some(h => h.offsetParent && h.textContent.trim())
+"""
+
+# Result-card fields read in one round trip for list-only mode
+CARD_EXTRACT_JS = """
+    cards => cards.map(card => {
+        const text = sel => (card.querySelector(sel) || {}).textContent || null;
+        const link = card.querySelector('a.hfpxzc');
+        const lines = [...card.querySelectorAll('div.W4Efsd')]
+            .filter(div => !div.querySelector('div.W4Efsd'))
+            .map(div => div.textContent.trim())
+            .filter(Boolean);
+        return {
+            url: link ? link.href : null,
+            name: link ? link.getAttribute('aria-label') : text('div.qBF1Pd'),
+            rating: text('span.MW4etd'),
+            reviews: text('span.UY7F9'),
+            phone: text('span.UsdlK'),
+            lines: lines,
+        };
+    })
+"""
+
+# Card lines that are not category/address ("4.5(120)", "Open ⋅ Closes 10 PM", ...)
+CARD_SKIP_LINE = re.compile(r'^[\d.,]+\s*\(|^(Open|Closed|Closes|Opens|Temporarily|Permanently|مفتوح|مغلق)', re.IGNORECASE)
+
+
+def _parse_card_lines(lines: List[str]) -> tuple:
+    """Category and address snippet from a result card's info lines"""
+    for line in lines:
+        # Drop the private-use icon glyphs Maps puts in front of some values
+        line = re.sub(r'[\ue000-\uf8ff]', '', line).strip()
+        if not line or CARD_SKIP_LINE.match(line):
+            continue
+        parts = [part.strip() for part in re.split(r'[·⋅]', line) if part.strip()]
+        if parts and not CARD_SKIP_LINE.match(parts[0]):
+            category = parts[0]
+            address = parts[-1] if len(parts) > 1 else None
+            return category, address
+    return None, None
+
+
+# Contact-relevant content of a website page, read in one call instead of page.content():
+# mailto:/tel:/social hrefs plus visible text (footer and contact sections first), capped
+WEBSITE_CONTENT_JS = """
+    ([maxChars, maxLinks]) => {
+        // Anchored to a host boundary - a bare "x.com/" would also match dropbox.com/, inbox.com/...
+        const social = /(?:^|[\\/.])(facebook|instagram|twitter|x|linkedin|tiktok|youtube|snapchat)\\.com\\//i;
+        const hrefs = [];
+        for (const a of document.querySelectorAll('a[href]')) {
+            const href = a.getAttribute('href') || '';
+            if (/^(mailto|tel):/i.test(href) || social.test(href)) {
+                hrefs.push(href);
+                if (hrefs.length >= maxLinks) break;
+            }
+        }
+        const parts = [];
+        let length = 0;
+        const sections = document.querySelectorAll('footer, address, [id*="contact" i], [class*="contact" i]');
+        for (const el of [...sections, document.body]) {
+            if (!el || length >= maxChars) break;
+            const text = (el.innerText || '').slice(0, maxChars - length);
+            parts.push(text);
+            length += text.length;
+        }
+        return hrefs.join('\\n') + '\\n' + parts.join('\\n');
+    }
+"""
+
+
+# Place extraction failure kinds
+FAILURE_TIMEOUT = 'timeout'
+FAILURE_BLOCKED = 'blocked'
+FAILURE_SELECTOR = 'selector_missing'
+FAILURE_CRASH = 'crash'
+FAILURE_ERROR = 'error'
+
+# Failures worth retrying later in the run
+TRANSIENT_FAILURES = (FAILURE_TIMEOUT, FAILURE_BLOCKED, FAILURE_CRASH)
+
+
+class PlaceExtractionError(Exception):
+    """A place page failed in a known way (kind is one of the FAILURE_* values)"""
+
+    def __init__(self, kind: str, message: str = ''):
+        super().__init__(message or kind)
+        self.kind = kind
+
+
+def classify_failure(error: Exception) -> str:
+    """Map an exception from a place page to a FAILURE_* kind"""
+    if isinstance(error, PlaceExtractionError):
+        return error.kind
+    text = str(error)
+    if type(error).__name__ == 'TimeoutError' or isinstance(error, asyncio.TimeoutError):
+        return FAILURE_TIMEOUT
+    if 'crash' in text.lower() or 'Target closed' in text or 'has been closed' in text:
+        return FAILURE_CRASH
+    return FAILURE_ERROR
+
+
+async def read_place_details(page: Page, selector_stats: SelectorStats, scope=None) -> BusinessRecord:
+    """Read an open place's details - scope narrows the lookups to one panel (default: the page)
+    
+    Only locator(), count(), inner_text() and get_attribute() are used, so an
+    offline_page.OfflinePage over archived HTML can stand in for the live page.
+    """
+    scope = scope or page
+    
+    # Extract Data with multiple fallback selectors
+    
+    # Name - Multiple selectors
+    name = None
+    for selector in selector_stats.ordered('name', NAME_SELECTORS):
+        try:
+            elem = scope.locator(selector).first
+            if await elem.count() > 0:
+                name = await elem.inner_text(timeout=2000)
+                name = name.strip()
+        except:
+            name = None
+        selector_stats.record('name', selector, bool(name))
+        if name:
+            break
+    
+    # Phone - Multiple methods (optional - many places have none)
+    phone = None
+    attempts = []
+    for selector in selector_stats.ordered('phone', PHONE_SELECTORS):
+        found = False
+        try:
+            elem = scope.locator(selector).first
+            if await elem.count() > 0:
+                if selector.startswith('a[href'):
+                    phone = await elem.get_attribute('href', timeout=2000)
+                    phone = phone.replace('tel:', '').strip()
+                else:
+                    phone = await elem.inner_text(timeout=2000)
+                phone = re.sub(r'[^\d+\s()-]', '', phone).strip()
+                found = bool(phone) and len(phone) >= 8
+        except:
+            pass
+        attempts.append((selector, found))
+        if found:
+            break
+    selector_stats.record_field('phone', attempts, optional=True)
+    
+    # Address - Multiple selectors (optional)
+    address = None
+    attempts = []
+    for selector in selector_stats.ordered('address', ADDRESS_SELECTORS):
+        try:
+            elem = scope.locator(selector).first
+            if await elem.count() > 0:
+                address = await elem.inner_text(timeout=2000)
+                address = address.strip()
+        except:
+            address = None
+        attempts.append((selector, bool(address)))
+        if address:
+            break
+    selector_stats.record_field('address', attempts, optional=True)
+    
+    if not name:
+        # The place panel did not render - nothing else will match either
+        raise PlaceExtractionError(FAILURE_SELECTOR, "Place name not found")
+    
+    # Category
+    category = None
+    try:
+        category_elem = scope.locator(CATEGORY_SELECTOR).first
+        if await category_elem.count() > 0:
+            category = await category_elem.inner_text(timeout=1000)
+    except:
+        pass
+    
+    # Website
+    website = None
+    try:
+        website_elem = scope.locator(WEBSITE_SELECTOR).first
+        if await website_elem.count() > 0:
+            website = await website_elem.get_attribute('href', timeout=2000)
+    except:
+        pass
+    
+    # Coordinates from URL
+    coords_match = re.search(r'@(-?\d+\.?\d*),(-?\d+\.?\d*)', page.url)
+    latitude = float(coords_match.group(1)) if coords_match else None
+    longitude = float(coords_match.group(2)) if coords_match else None
+    
+    # Rating and reviews (bonus data)
+    rating = None
+    review_count = None
+    try:
+        rating_elem = scope.locator('span.ceNzKf, div.F7nice span').first
+        if await rating_elem.count() > 0:
+            rating_text = await rating_elem.get_attribute('aria-label', timeout=1000)
+            if rating_text:
+                rating_match = re.search(r'(\d+\.?\d*)', rating_text)
+                if rating_match:
+                    rating = float(rating_match.group(1))
+        reviews_elem = scope.locator('div.F7nice span[aria-label*="review"]').first
+        if await reviews_elem.count() > 0:
+            reviews_text = await reviews_elem.get_attribute('aria-label', timeout=1000)
+            reviews_match = re.search(r'([\d,]+)', reviews_text or '')
+            if reviews_match:
+                review_count = int(reviews_match.group(1).replace(',', ''))
+    except:
+        pass
+    
+    return BusinessRecord(
+        name=name,
+        phone=phone,
+        address=address,
+        category=category,
+        website=website,
+        latitude=latitude,
+        longitude=longitude,
+        rating=rating,
+        review_count=review_count,
+        url=page.url,
+    )
+
+
+def extract_emails(text: str) -> Set[str]:
+    """Extract unique valid emails from text"""
+    emails = set()
+    found = re.findall(EMAIL_REGEX, text.lower())
+    
+    # Filter out common false positives
+    excluded_domains = ['example.com', 'test.com', 'domain.com', 'email.com', 
+                      'yoursite.com', 'website.com', 'sample.com', 'placeholder.com']
+    excluded_patterns = ['noreply@', 'no-reply@', 'donotreply@', 'mailer-daemon@']
+    
+    for email in found:
+        # Skip excluded domains
+        domain = email.split('@')[1] if '@' in email else ''
+        if domain in excluded_domains:
+            continue
+        # Skip common system emails
+        if any(pattern in email for pattern in excluded_patterns):
+            continue
+        # Skip very short local parts
+        local_part = email.split('@')[0] if '@' in email else ''
+        if len(local_part) < 2:
+            continue
+        emails.add(email)
+        
+    return emails
+
+
+def extract_phones(text: str) -> Set[str]:
+    """Extract phone numbers from text with Saudi format preference"""
+    phones = set()
+    
+    # Try Saudi phone format first
+    sa_phones = re.findall(SA_PHONE_REGEX, text)
+    for phone in sa_phones:
+        cleaned = normalize_phone(phone)
+        if len(cleaned) >= 9:
+            phones.add(cleaned)
+    
+    return phones
+
+
+# Social media detection - Enhanced
+# Each domain must start at a host boundary (x.com, not dropbox.com)
+SOCIAL_PATTERNS = {
+    'facebook': r'(?<![\w-])facebook\.com/[^"\s<>]+',
+    'instagram': r'(?<![\w-])instagram\.com/[^"\s<>]+',
+    'twitter': r'(?<![\w-])(?:twitter\.com|x\.com)/[^"\s<>]+',
+    'linkedin': r'(?<![\w-])linkedin\.com/[^"\s<>]+',
+    'tiktok': r'(?<![\w-])tiktok\.com/@[^"\s<>]+',
+    'youtube': r'(?<![\w-])youtube\.com/[^"\s<>]+',
+    'snapchat': r'(?<![\w-])snapchat\.com/add/[^"\s<>]+',
+}
+
+
+def extract_socials(website_url: str, content: str) -> List[str]:
+    """First profile link per platform in a page's content"""
+    socials = []
+    for platform, pattern in SOCIAL_PATTERNS.items():
+        # A social profile used as the website is itself the best social link
+        own_match = re.search(pattern, website_url, re.IGNORECASE)
+        matches = [own_match.group(0)] if own_match else re.findall(pattern, content, re.IGNORECASE)
+        for match in matches[:1]:  # Take first match per platform
+            clean_url = f"https://{match}"
+            if clean_url not in socials:
+                socials.append(clean_url)
+    return socials
+
+
+def contacts_from_pages(website_url: str, contents: List[str]) -> Dict[str, List[str]]:
+    """Contacts from a website's pages in the order they were read (what the live visit extracts)"""
+    emails = set()
+    phones = set()
+    for content in contents:
+        emails.update(extract_emails(content))
+        phones.update(extract_phones(content))
+    return {
+        'emails': list(emails),
+        'socials': extract_socials(website_url, contents[-1]) if contents else [],
+        'phones': list(phones),
+    }
+
+
+class _HostThrottled(Exception):
+    """Raised internally when a website host answers 429/503 or is backing off"""
+
+
+async def _close_quietly(page: Page):
+    try:
+        await page.close()
+    except Exception:
+        pass
+
+
+class PanelTabs:
+    """Long-lived tabs showing one search's results list (PLACE_NAVIGATION = "panel")
+    
+    Maps loads once per tab; places are opened by clicking their result card and
+    the tab goes back to the list afterwards. The search's own results tab is the
+    first one, more are opened on demand up to `size`.
+    """
+
+    def __init__(self, search_url: str, size: int = PANEL_TABS):
+        self.search_url = search_url
+        self.size = max(1, size)
+        self.opened = 0
+        self.pages: Set[Page] = set()
+        self.idle: asyncio.Queue = asyncio.Queue()  # Tabs on the list, None = a tab was dropped
+        self.places = 0
+        self.fallbacks = 0
+
+    def add(self, page: Page):
+        self.opened += 1
+        self.pages.add(page)
+        self.idle.put_nowait(page)
+
+
+class SearchSession:
+    """Per-search state - dedup sets, results, cancellation flag and callbacks
+    
+    Several sessions can run on one GoogleMapsScraper at the same time; they
+    share its browser, the MAX_CONCURRENT_PAGES budget and the host limiter.
+    """
+
+    def __init__(self, keep_results: bool = True,
+                 on_status_update: Optional[Callable] = None,
+                 on_data_found: Optional[Callable] = None,
+                 on_complete: Optional[Callable] = None,
+                 on_record_enriched: Optional[Callable] = None):
         self.is_running = False
         self.seen_ids: Set[str] = set()
         self.seen_phones: Set[str] = set()  # Track seen phone numbers for deduplication
         self.seen_names: Set[str] = set()   # Track seen business names
-        self.results: List[Dict] = []
+        self.results: List[BusinessRecord] = []
+        self.keep_results = keep_results  # False when someone else keeps the results (worker mode, API jobs)
+        self.request_count = 0
         
-        # Concurrency control
-        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+        # Current campaign (tagged onto every stored record)
+        self.run_id: Optional[str] = None
+        self.campaign: Dict[str, str] = {}
+        self.dead_letters: List[Dict] = []
         
-        # Rate limiting
-        self.request_count = 0
-        self.last_request_time = None
+        # Shared profile pages fetched once per run
+        self.aggregator_cache: Dict[str, asyncio.Future] = {}
         
-        # Callbacks for UI updates
-        self.on_status_update: Optional[Callable] = None
-        self.on_data_found: Optional[Callable] = None
-        self.on_complete: Optional[Callable] = None
+        # Places decoded from intercepted Maps payloads, by feature id
+        self.intercepted: Dict[str, BusinessRecord] = {}
+        self.payload_digests: Dict[str, str] = {}  # feature id -> archived payload
+        self.intercept_hits = 0
+        self._intercept_tasks: Set[asyncio.Task] = set()
         
-    async def initialize(self):
-        """Initialize the browser with enhanced stealth settings"""
-        self.playwright = await async_playwright().start()
+        # Places/min, progress and stage latencies for the live panel
+        self.meter = ThroughputMeter()
         
-        # Enhanced browser launch options
-        self.browser = await self.playwright.chromium.launch(
-            headless=HEADLESS,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=IsolateOrigins,site-per-process',
-            ]
-        )
-        
-        # Enhanced context with better anti-detection
-        self.context = await self.browser.new_context(
-            viewport={'width': VIEWPORT_WIDTH, 'height': VIEWPORT_HEIGHT},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            locale='en-US',
-            timezone_id='Asia/Riyadh',
-            geolocation={'latitude': 24.7136, 'longitude': 46.6753},  # Riyadh default
-            permissions=['geolocation'],
-        )
+        # Results tabs for in-app place navigation (searches in panel mode only)
+        self.panel: Optional[PanelTabs] = None
         
-        # Enhanced stealth scripts
-        await self.context.add_init_script("""
-            // Hide webdriver
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-            
-            // Override plugins
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            
-            // Override languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en', 'ar']
-            });
-            
-            // Override platform
-            Object.defineProperty(navigator, 'platform', {
-                get: () => 'Win32'
-            });
-            
-            // Mock chrome object
-            window.chrome = { runtime: {} };
-            
-            // Override permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-        """)
+        # Archived snapshots per place id, indexed once the record is stored
+        self.snapshots: Dict[str, List[tuple]] = {}
         
-    async def close(self):
-        """Close the browser gracefully"""
+        # Website visits skipped this run
+        self.skipped_throttled = 0
+        self.skipped_unreachable = 0
+        self.unreachable_saved_seconds = 0.0
+        
+        # Cooperative cancellation - stop() cancels the tasks and closes the pages
+        self.tasks: Set[asyncio.Task] = set()
+        self.open_pages: Set[Page] = set()
+        self.closing: List[asyncio.Future] = []
+        self.stop_requested_at: Optional[float] = None
+        self.stop_latency: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        
+        # Callbacks for UI updates
+        self.on_status_update = on_status_update
+        self.on_data_found = on_data_found
+        self.on_complete = on_complete
+        self.on_record_enriched = on_record_enriched  # (card url, full record)
+
+    def reset(self, campaign: Dict[str, str], clear_results: bool = True):
+        """Start a new run with fresh dedup state (called on the event loop)"""
+        self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self.stop_requested_at = None
+        self.stop_latency = None
+        self.closing = []
+        if clear_results:
+            self.results.clear()
+            self.intercepted.clear()  # Kept for enrich() after a list-only search
+            self.payload_digests.clear()
+        self.intercept_hits = 0
+        self.seen_ids.clear()
+        self.seen_phones.clear()
+        self.seen_names.clear()
+        self.aggregator_cache.clear()
+        self.snapshots.clear()
+        self.meter.reset()
+        self.skipped_throttled = 0
+        self.skipped_unreachable = 0
+        self.unreachable_saved_seconds = 0.0
+        self.request_count = 0
+        self.dead_letters = []
+        
+        self.run_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        self.campaign = {
+            'business_tag': campaign.get('business_tag', '').strip(),
+            'region': campaign.get('region', '').strip(),
+            'city': campaign.get('city', '').strip(),
+            'district': campaign.get('district', '').strip(),
+            'run_id': self.run_id,
+        }
+
+    def stop(self):
+        """Stop this session's search now - safe to call from any thread"""
+        self.is_running = False
+        if self.stop_requested_at is None:
+            self.stop_requested_at = time.monotonic()
+        self.emit_status("Stopping extraction...")
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._cancel_outstanding)
+
+    def _cancel_outstanding(self):
+        self._stopped.set()
+        for task in list(self.tasks):
+            task.cancel()
+        # Closing a page aborts its in-flight navigation
+        self.closing.extend(asyncio.ensure_future(_close_quietly(page)) for page in list(self.open_pages))
+        self.open_pages.clear()
+
+    def track(self, task: asyncio.Future) -> asyncio.Future:
+        """Register a task to be cancelled by stop()"""
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def sleep(self, seconds: float):
+        """asyncio.sleep that returns as soon as the session is stopped"""
+        if self._stopped is None:
+            await asyncio.sleep(seconds)
+            return
         try:
-            if self.context:
-                await self.context.close()
-            if self.browser:
-                await self.browser.close()
-            if self.playwright:
-                await self.playwright.stop()
-        except Exception:
+            await asyncio.wait_for(self._stopped.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
             pass
-            
-    def _emit_status(self, message: str):
+
+    def log_event(self, stage: str, **fields):
+        """Structured event for the JSONL log (see event_log.py), tagged with this run"""
+        event_log.emit(stage, run_id=self.run_id, **fields)
+
+    def emit_status(self, message: str):
         """Emit status update to UI"""
+        self.log_event('status', message=message)
         if self.on_status_update:
             self.on_status_update(message)
             
-    def _emit_data(self, data: Dict):
+    def emit_data(self, record: BusinessRecord):
         """Emit new data to UI"""
         if self.on_data_found:
-            self.on_data_found(data)
-            
-    def _extract_place_id(self, url: str) -> Optional[str]:
-        """Extract unique place ID from Google Maps URL"""
-        # Try CID format
-        cid_match = re.search(r'!1s(0x[a-f0-9:]+)', url)
-        if cid_match:
-            return cid_match.group(1)
-        
-        # Try place_id format
-        place_match = re.search(r'place_id:([A-Za-z0-9_-]+)', url)
-        if place_match:
-            return place_match.group(1)
-        
-        # Try data format
-        data_match = re.search(r'/data=!3m1!4b1!4m[^/]+!3m[^/]+!1s([^!]+)', url)
-        if data_match:
-            return data_match.group(1)
-            
-        return url
-    
-    def _normalize_phone(self, phone: str) -> str:
-        """Normalize phone number for comparison"""
-        if not phone:
-            return ""
-        # Remove all non-digit characters except +
-        normalized = re.sub(r'[^\d+]', '', phone)
-        # Remove leading zeros after country code
-        if normalized.startswith('+966'):
-            normalized = '+966' + normalized[4:].lstrip('0')
-        elif normalized.startswith('966'):
-            normalized = '966' + normalized[3:].lstrip('0')
-        elif normalized.startswith('0'):
-            normalized = normalized.lstrip('0')
-        return normalized
-    
-    def _is_duplicate(self, data: Dict) -> bool:
+            self.on_data_found(record)
+
+    def is_duplicate(self, record: BusinessRecord) -> bool:
         """Check if this business is a duplicate"""
         # Check by phone
-        phone = self._normalize_phone(data.get('phone', ''))
+        phone = normalize_phone(record.phone or '')
         if phone and len(phone) >= 8:
             if phone in self.seen_phones:
                 return True
             self.seen_phones.add(phone)
         
         # Check by name (normalized)
-        name = data.get('name', '').strip().lower()
+        name = (record.name or '').lower()
         if name and len(name) > 3:
             # Create a simplified version for comparison
             simplified_name = re.sub(r'[^\w\s]', '', name)
@@ -170,7 +648,373 @@ class GoogleMapsScraper:
             self.seen_names.add(simplified_name)
         
         return False
+
+
+class GoogleMapsScraper:
+    def __init__(self):
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.playwright = None
+        self.browser_alive = False
+        self._owns_context = True
+        self._browser_lock = asyncio.Lock()
+        
+        # Context recycling: pages opened on the current context, pages still
+        # open per context, and old contexts waiting for their last page
+        self.context_pages_opened = 0
+        self.contexts_recycled = 0
+        self._live_pages: Dict[BrowserContext, int] = {}
+        self._retiring: Set[BrowserContext] = set()
+        self._watchdog: Optional[asyncio.Task] = None
+        
+        # Default session used when search() is called without one
+        self.session = SearchSession()
+        self.sessions: Set[SearchSession] = set()  # Currently running
+        self.store: Optional[ResultStore] = None
+        self.archive: Optional[SnapshotArchive] = None
+        
+        # Place pages spread over egress proxies (a persistent profile has no
+        # browser to open per-proxy contexts on)
+        self.proxies = ProxyPool() if PROXIES and BROWSER_MODE != 'persistent' else None
+        
+        # Concurrency control - one page budget shared by all sessions,
+        # PROXY_PAGES_PER_PROXY for each proxy when a pool is configured
+        pages = PROXY_PAGES_PER_PROXY * len(self.proxies) if self.proxies else MAX_CONCURRENT_PAGES
+        self.semaphore = asyncio.Semaphore(pages)
+        
+        # Rate limiting
+        self.last_request_time = None
+        
+        # Per-host politeness for external websites (kept across runs)
+        self.host_limiter = HostLimiter()
+        
+        # DNS/TCP pre-check with a negative cache shared across runs
+        self.reachability = ReachabilityChecker()
+        
+        # Learned selector hit rates - working selectors are tried first
+        self.selector_stats = SelectorStats()
+        
+        # Opt-in profiling - one profiler spans runs that overlap
+        self.profile = PROFILE_RUNS
+        self.profiler: Optional[RunProfiler] = None
         
+    async def initialize(self):
+        """Initialize the browser with enhanced stealth settings"""
+        from playwright.async_api import async_playwright
+
+        self.playwright = await async_playwright().start()
+        self._owns_context = True
+        
+        if BROWSER_MODE == 'server':
+            await self._connect_browser_server()
+        elif BROWSER_MODE == 'persistent':
+            # Warm profile: HTTP cache and consent cookies survive app restarts
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                BROWSER_PROFILE_DIR,
+                headless=HEADLESS,
+                args=BROWSER_ARGS,
+                **CONTEXT_OPTIONS,
+            )
+            self.browser = self.context.browser
+        else:
+            # Enhanced browser launch options
+            self.browser = await self.playwright.chromium.launch(
+                headless=HEADLESS,
+                args=BROWSER_ARGS,
+            )
+            
+            # Enhanced context with better anti-detection
+            self.context = await self.browser.new_context(**CONTEXT_OPTIONS)
+        
+        # Watch for the browser going away so the next search relaunches it
+        self.browser_alive = True
+        self.context_pages_opened = 0
+        self._watch_context(self.context)
+        if self.browser:
+            self.browser.on('disconnected', self._on_browser_lost)
+        
+        # Enhanced stealth scripts
+        await self.context.add_init_script(STEALTH_SCRIPT)
+
+    async def _connect_browser_server(self):
+        """Attach to the shared browser server, launching it if it is not answering"""
+        if not await asyncio.to_thread(server_version):
+            self._emit_status("Starting shared browser...")
+            launch_server(self.playwright.chromium.executable_path, SERVER_BROWSER_ARGS)
+            if not await wait_until_ready():
+                raise RuntimeError("Shared browser server did not start")
+        
+        self.browser = await self.playwright.chromium.connect_over_cdp(endpoint_url())
+        if self.browser.contexts:
+            # The default context holds the warm profile - share it, never close it
+            self.context = self.browser.contexts[0]
+            self._owns_context = False
+            await self.context.grant_permissions(['geolocation'])
+            await self.context.set_geolocation(CONTEXT_OPTIONS['geolocation'])
+        else:
+            self.context = await self.browser.new_context(**CONTEXT_OPTIONS)
+
+    def _on_browser_lost(self, *_):
+        self.browser_alive = False
+
+    def _watch_context(self, context: BrowserContext):
+        context.on('close', lambda *_: self._on_context_closed(context))
+
+    def _on_context_closed(self, context: BrowserContext):
+        self._live_pages.pop(context, None)
+        self._retiring.discard(context)
+        if context is self.context:
+            self.browser_alive = False
+
+    def _on_page_closed(self, context: BrowserContext):
+        remaining = self._live_pages.get(context, 1) - 1
+        self._live_pages[context] = remaining
+        if remaining <= 0 and context in self._retiring:
+            self._retiring.discard(context)
+            asyncio.ensure_future(self._close_context(context))
+
+    @staticmethod
+    async def _close_context(context: BrowserContext):
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def _recycle_due(self, opened: int) -> bool:
+        """A context that opened this many pages is due - CONTEXT_RECYCLE_PAGES or above the memory limit"""
+        if CONTEXT_RECYCLE_PAGES and opened >= CONTEXT_RECYCLE_PAGES:
+            return True
+        if CONTEXT_RECYCLE_MEMORY_MB and opened and opened % CONTEXT_MEMORY_CHECK_EVERY == 0:
+            memory = await self._browser_memory_mb()
+            return memory is not None and memory > CONTEXT_RECYCLE_MEMORY_MB
+        return False
+
+    async def _maybe_recycle_context(self):
+        """Swap in a fresh context after CONTEXT_RECYCLE_PAGES pages or above the memory limit"""
+        if BROWSER_MODE == 'persistent' or not self.browser:
+            return  # The profile context is the browser - only a relaunch would renew it
+        if await self._recycle_due(self.context_pages_opened):
+            await self._recycle_context()
+
+    def _retire_context(self, context: BrowserContext):
+        """Close a replaced context now, or with its last page"""
+        if self._live_pages.get(context, 0) > 0:
+            self._retiring.add(context)
+        else:
+            asyncio.ensure_future(self._close_context(context))
+
+    async def _recycle_context(self):
+        """New context with the old one's cookies/storage; the old one closes with its last page"""
+        async with self._browser_lock:
+            old = self.context
+            if old is None or self.context_pages_opened == 0 or not self.is_healthy():
+                return  # Already recycled (or relaunching) by another task
+            state = await old.storage_state()
+            context = await self.browser.new_context(**CONTEXT_OPTIONS, storage_state=state)
+            await context.add_init_script(STEALTH_SCRIPT)
+            self._watch_context(context)
+            
+            owned = self._owns_context
+            served = self.context_pages_opened
+            self.context = context
+            self._owns_context = True
+            self.context_pages_opened = 0
+            self.contexts_recycled += 1
+            # A shared server's default context is never closed by us
+            if owned:
+                self._retire_context(old)
+        event_log.emit('browser', outcome='recycled', pages=served, count=self.contexts_recycled)
+        self._emit_status(f"Recycled browser context (#{self.contexts_recycled}) - cookies kept")
+
+    async def _browser_memory_mb(self) -> Optional[float]:
+        """Resident memory of all browser processes - None without psutil"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            cdp = await self.browser.new_browser_cdp_session()
+            info = await cdp.send('SystemInfo.getProcessInfo')
+            await cdp.detach()
+        except Exception:
+            return None
+        total = 0
+        for process in info.get('processInfo', []):
+            try:
+                total += psutil.Process(process['id']).memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    async def _proxy_context(self, proxy: ProxyState) -> BrowserContext:
+        """The proxy's own context - created on first use with the main context's cookies,
+        recycled on the same page / memory thresholds as the main context"""
+        due = proxy.context is not None and await self._recycle_due(proxy.context_pages_opened)
+        async with self._browser_lock:
+            old = proxy.context
+            if old is not None and not (due and proxy.context_pages_opened):
+                return old  # Fresh enough (or already recycled by another task)
+            # Cookies come from the context being replaced, or the main one on first use
+            state = await (old or self.context).storage_state()
+            context = await self.browser.new_context(**CONTEXT_OPTIONS, proxy=proxy.option, storage_state=state)
+            await context.add_init_script(STEALTH_SCRIPT)
+            context.on('close', lambda *_: self._on_proxy_context_closed(proxy, context))
+            proxy.context = context
+            served = proxy.context_pages_opened
+            proxy.context_pages_opened = 0
+            if old is None:
+                return context
+            self._retire_context(old)
+            self.contexts_recycled += 1
+        event_log.emit('browser', outcome='recycled', pages=served, count=self.contexts_recycled, proxy=proxy.label)
+        return context
+
+    def _on_proxy_context_closed(self, proxy: ProxyState, context: BrowserContext):
+        self._live_pages.pop(context, None)
+        self._retiring.discard(context)
+        if proxy.context is context:
+            proxy.context = None
+            proxy.context_pages_opened = 0
+
+    def _start_watchdog(self):
+        if self._watchdog is None or self._watchdog.done():
+            self._watchdog = asyncio.ensure_future(self._watch_browser())
+
+    async def _watch_browser(self):
+        """Relaunch a dead browser or context while any session is running"""
+        while self.sessions:
+            await asyncio.sleep(WATCHDOG_INTERVAL)
+            if self.sessions and self.playwright and not self.is_healthy():
+                try:
+                    await self.ensure_browser()
+                except Exception as e:
+                    self._emit_status(f"Browser relaunch failed: {str(e)[:50]}")
+
+    def is_healthy(self) -> bool:
+        """Cheap health check of the current browser and context"""
+        if not self.context or not self.browser_alive:
+            return False
+        if self.browser and not self.browser.is_connected():
+            return False
+        return True
+
+    async def ensure_browser(self):
+        """Start the browser, or relaunch/reconnect it if it died since the last search"""
+        # Sessions starting together must not launch two browsers
+        async with self._browser_lock:
+            if self.is_healthy():
+                return
+            if self.playwright:
+                event_log.emit('browser', outcome='relaunched')
+                self._emit_status("Browser connection lost - relaunching...")
+                await self._close_browser()
+            await self.initialize()
+        
+    async def _close_browser(self):
+        for proxy in (self.proxies.proxies if self.proxies else ()):
+            if proxy.context:
+                await self._close_context(proxy.context)
+                proxy.context = None
+            proxy.context_pages_opened = 0
+        self._live_pages.clear()
+        self._retiring.clear()
+        self.context_pages_opened = 0
+        try:
+            if self.context and self._owns_context:
+                await self.context.close()
+            if self.browser:
+                # For a server connection this only disconnects
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception:
+            pass
+        self.context = None
+        self.browser = None
+        self.playwright = None
+        self.browser_alive = False
+
+    async def close(self):
+        """Close the browser gracefully (a shared browser server is left running)"""
+        if self._watchdog:
+            self._watchdog.cancel()
+            self._watchdog = None
+        await self._close_browser()
+        event_log.close()
+        if self.store:
+            self.store.close()
+            self.store = None
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+            
+    def _emit_status(self, message: str):
+        """Emit a browser-level status update to every running session"""
+        for session in list(self.sessions):
+            session.emit_status(message)
+            
+    def _extract_place_id(self, url: str) -> Optional[str]:
+        """Extract unique place ID from Google Maps URL"""
+        return extract_place_id(url)
+    
+    def _normalize_phone(self, phone: str) -> str:
+        """Normalize phone number for comparison"""
+        return normalize_phone(phone)
+    
+    async def _open_page(self, session: SearchSession, proxy: Optional[ProxyState] = None) -> Page:
+        """New tab owned by the session (on the proxy's context if given) - stop() closes it"""
+        if proxy:
+            context = await self._proxy_context(proxy)
+        else:
+            await self._maybe_recycle_context()
+            context = self.context
+        page = await context.new_page()
+        if proxy:
+            proxy.context_pages_opened += 1
+        else:
+            self.context_pages_opened += 1
+        self._live_pages[context] = self._live_pages.get(context, 0) + 1
+        page.on('close', lambda *_: self._on_page_closed(context))
+        session.open_pages.add(page)
+        return page
+
+    async def _close_page(self, session: SearchSession, page: Optional[Page]):
+        if page and page in session.open_pages:
+            session.open_pages.discard(page)
+            await _close_quietly(page)
+
+    async def _open_traced_page(self, session: SearchSession, proxy: Optional[ProxyState] = None) -> Optional[Page]:
+        """A page on a context of its own with a Playwright trace running, when the profiler
+        samples this place - a trace records its whole context, so concurrent places stay out of it"""
+        if not self.profiler or not self.browser or BROWSER_MODE == 'persistent':
+            return None  # A persistent profile cannot open another context
+        if not self.profiler.sample_trace():
+            return None
+        context = None
+        try:
+            options = dict(CONTEXT_OPTIONS, storage_state=await self.context.storage_state())
+            if proxy:
+                options['proxy'] = proxy.option
+            context = await self.browser.new_context(**options)
+            await context.add_init_script(STEALTH_SCRIPT)
+        except Exception:
+            self.profiler.cancel_trace()
+            if context:
+                await self._close_context(context)
+            return None
+        if not await self.profiler.start_trace(context):
+            await self._close_context(context)
+            return None
+        page = await context.new_page()
+        session.open_pages.add(page)
+        return page
+
+    async def _close_traced_page(self, session: SearchSession, page: Page, url: str):
+        """Save the place's trace and close its context"""
+        await self.profiler.stop_trace(page.context, extract_place_id(url) or url)
+        await self._close_page(session, page)
+        await self._close_context(page.context)
+
     async def _handle_cookie_consent(self, page: Page):
         """Handle the cookie consent popup"""
         try:
@@ -181,75 +1025,142 @@ class GoogleMapsScraper:
         except Exception:
             pass
 
-    async def _extract_emails_from_text(self, text: str) -> Set[str]:
-        """Extract unique valid emails from text"""
-        emails = set()
-        found = re.findall(EMAIL_REGEX, text.lower())
-        
-        # Filter out common false positives
-        excluded_domains = ['example.com', 'test.com', 'domain.com', 'email.com', 
-                          'yoursite.com', 'website.com', 'sample.com', 'placeholder.com']
-        excluded_patterns = ['noreply@', 'no-reply@', 'donotreply@', 'mailer-daemon@']
-        
-        for email in found:
-            # Skip excluded domains
-            domain = email.split('@')[1] if '@' in email else ''
-            if domain in excluded_domains:
-                continue
-            # Skip common system emails
-            if any(pattern in email for pattern in excluded_patterns):
-                continue
-            # Skip very short local parts
-            local_part = email.split('@')[0] if '@' in email else ''
-            if len(local_part) < 2:
-                continue
-            emails.add(email)
-            
-        return emails
+    def _on_response(self, session: SearchSession, response):
+        """Page 'response' handler - decode Maps search payloads in the background"""
+        if not is_maps_payload_url(response.url):
+            return
+        task = asyncio.ensure_future(self._read_maps_response(session, response))
+        session._intercept_tasks.add(task)
+        task.add_done_callback(session._intercept_tasks.discard)
 
-    async def _extract_phones_from_text(self, text: str) -> Set[str]:
-        """Extract phone numbers from text with Saudi format preference"""
-        phones = set()
-        
-        # Try Saudi phone format first
-        sa_phones = re.findall(SA_PHONE_REGEX, text)
-        for phone in sa_phones:
-            cleaned = self._normalize_phone(phone)
-            if len(cleaned) >= 9:
-                phones.add(cleaned)
+    async def _read_maps_response(self, session: SearchSession, response):
+        try:
+            text = await response.text()
+            places = decode_payload(text)
+            session.intercepted.update(places)
+            if self.archive and places:
+                digest = await asyncio.to_thread(self.archive.put, text)
+                session.payload_digests.update(dict.fromkeys(places, digest))
+        except Exception:
+            pass
+
+    @staticmethod
+    async def _panel_html(page: Page) -> Optional[str]:
+        try:
+            return await page.evaluate(PANEL_HTML_JS)
+        except Exception:
+            return None
+
+    async def _snapshot(self, session: SearchSession, record: BusinessRecord, kind: str, content: str, url: str):
+        """Archive one raw input of a record (compressed off the event loop)"""
+        try:
+            digest = await asyncio.to_thread(self.archive.put, content)
+        except OSError:
+            return
+        session.snapshots.setdefault(record.place_id, []).append((kind, digest, url))
+
+    async def _drain_intercepts(self, session: SearchSession):
+        """Wait for payloads still being read (they are gone once the page closes)"""
+        if session._intercept_tasks:
+            await asyncio.gather(*list(session._intercept_tasks), return_exceptions=True)
+
+    async def _with_website_contacts(self, session: SearchSession, record: BusinessRecord) -> BusinessRecord:
+        """Add emails and social links from the business website"""
+        if not record.website:
+            return record
+        started = time.monotonic()
+        web_data = await self._visit_website_for_contacts(session, record.website)
+        elapsed = time.monotonic() - started
+        if self.archive:
+            for content in web_data.get('pages', []):
+                await self._snapshot(session, record, KIND_WEBSITE, content, record.website)
+        session.meter.record_website(elapsed)
+        # The one event for this visit (skips and failures included)
+        session.log_event('website', place_id=record.place_id, host=host_of(record.website),
+                          duration=round(elapsed, 3), outcome=web_data['outcome'], emails=len(web_data['emails']))
+        return record.replace(emails=web_data['emails'], socials=web_data['socials'][:3])
+
+    async def _goto_website(self, session: SearchSession, page: Page, url: str, timeout: int) -> bool:
+        """Open an external page under the host limiter - False if the host is throttling us"""
+        host = host_of(url)
+        if self.host_limiter.blocked_for(host) > 0:
+            session.skipped_throttled += 1
+            return False
+
+        async with self.host_limiter.slot(host):
+            # Another worker may have been throttled while we waited for the slot
+            if self.host_limiter.blocked_for(host) > 0:
+                session.skipped_throttled += 1
+                return False
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+
+        status = response.status if response else None
+        retry_after = response.headers.get('retry-after') if response else None
+        self.host_limiter.report(host, status, retry_after)
+        return status not in THROTTLE_STATUSES
+
+    async def _read_website_content(self, page: Page) -> str:
+        """Links and visible text of a website page, bounded by WEBSITE_TEXT_MAX_CHARS"""
+        return await page.evaluate(WEBSITE_CONTENT_JS, [WEBSITE_TEXT_MAX_CHARS, WEBSITE_MAX_LINKS])
+
+    async def _visit_website_for_contacts(self, session: SearchSession, website_url: str) -> Dict[str, any]:
+        """Visit the business website to find emails and social links - Enhanced version
         
-        return phones
+        'outcome' in the result says how the visit went: ok, unreachable, throttled or a FAILURE_* kind.
+        """
+        if not website_url or website_url == 'N/A':
+            return {'emails': [], 'socials': [], 'phones': [], 'outcome': 'skipped'}
 
-    async def _visit_website_for_contacts(self, website_url: str) -> Dict[str, any]:
-        """Visit the business website to find emails and social links - Enhanced version"""
+        host = host_of(website_url)
+        if not is_aggregator_host(host):
+            # Expired domains would otherwise cost a tab and the full WEBSITE_TIMEOUT
+            started = time.monotonic()
+            if not await self.reachability.is_reachable(website_url):
+                session.skipped_unreachable += 1
+                session.unreachable_saved_seconds += max(0.0, WEBSITE_TIMEOUT / 1000 - (time.monotonic() - started))
+                return {'emails': [], 'socials': [], 'phones': [], 'outcome': 'unreachable'}
+            return await self._fetch_website_contacts(session, website_url, crawl_contacts=True)
+
+        # Shared profile pages (Linktree, Instagram, Salla...) - parse each one only once per run
+        pending = session.aggregator_cache.get(website_url)
+        if pending is None:
+            pending = session.track(asyncio.ensure_future(self._fetch_website_contacts(session, website_url, crawl_contacts=False)))
+            session.aggregator_cache[website_url] = pending
+        result = await asyncio.shield(pending)
+        return {key: list(value) if isinstance(value, list) else value for key, value in result.items()}
+
+    async def _fetch_website_contacts(self, session: SearchSession, website_url: str, crawl_contacts: bool) -> Dict[str, any]:
+        """Load a website (and optionally its contact page) and extract contacts"""
         emails = set()
         socials = []
         extra_phones = set()
-        
-        if not website_url or website_url == 'N/A':
-            return {'emails': [], 'socials': [], 'phones': []}
+        pages = []  # Content read, for the snapshot archive
+        outcome = 'ok'
 
         page = None
         try:
-            page = await self.context.new_page()
+            page = await self._open_page(session)
             
             # Set shorter timeout for external websites
             page.set_default_timeout(8000)
             
             # Navigate with domcontentloaded for speed
-            await page.goto(website_url, wait_until='domcontentloaded', timeout=10000)
+            if not await self._goto_website(session, page, website_url, WEBSITE_TIMEOUT):
+                raise _HostThrottled()
             
-            # Get page content
-            content = await page.content()
+            # Get contact-relevant content (links + capped visible text)
+            content = await self._read_website_content(page)
+            if self.archive:
+                pages.append(content)
             
             # Extract emails
-            emails.update(await self._extract_emails_from_text(content))
+            emails.update(extract_emails(content))
             
             # Extract additional phones from website
-            extra_phones.update(await self._extract_phones_from_text(content))
+            extra_phones.update(extract_phones(content))
             
             # If no email found on homepage, check contact/about pages
-            if not emails:
+            if not emails and crawl_contacts:
                 contact_selectors = [
                     'a[href*="contact"]',
                     'a[href*="about"]',
@@ -266,230 +1177,371 @@ class GoogleMapsScraper:
                             href = await link.get_attribute('href')
                             if href:
                                 full_url = href if href.startswith('http') else website_url.rstrip('/') + '/' + href.lstrip('/')
-                                await page.goto(full_url, wait_until='domcontentloaded', timeout=6000)
-                                content = await page.content()
-                                emails.update(await self._extract_emails_from_text(content))
-                                extra_phones.update(await self._extract_phones_from_text(content))
+                                if not await self._goto_website(session, page, full_url, CONTACT_PAGE_TIMEOUT):
+                                    raise _HostThrottled()
+                                content = await self._read_website_content(page)
+                                if self.archive:
+                                    pages.append(content)
+                                emails.update(extract_emails(content))
+                                extra_phones.update(extract_phones(content))
                                 if emails:
                                     break
+                    except _HostThrottled:
+                        outcome = 'throttled'
+                        break
                     except Exception:
                         continue
                     if emails:
                         break
 
-            # Social media detection - Enhanced
-            social_patterns = {
-                'facebook': r'facebook\.com/[^"\s<>]+',
-                'instagram': r'instagram\.com/[^"\s<>]+',
-                'twitter': r'(?:twitter\.com|x\.com)/[^"\s<>]+',
-                'linkedin': r'linkedin\.com/[^"\s<>]+',
-                'tiktok': r'tiktok\.com/@[^"\s<>]+',
-                'youtube': r'youtube\.com/[^"\s<>]+',
-                'snapchat': r'snapchat\.com/add/[^"\s<>]+',
-            }
-            
-            for platform, pattern in social_patterns.items():
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                for match in matches[:1]:  # Take first match per platform
-                    clean_url = f"https://{match}"
-                    if clean_url not in socials:
-                        socials.append(clean_url)
+            socials = extract_socials(website_url, content)
 
+        except _HostThrottled:
+            outcome = 'throttled'
         except Exception as e:
-            # Website might be down, blocking, or timing out - this is expected
-            pass
+            # Website might be down, blocking or timing out - this is expected
+            outcome = classify_failure(e)
         finally:
-            if page:
-                try:
-                    await page.close()
-                except:
-                    pass
+            await self._close_page(session, page)
                 
         return {
             'emails': list(emails),
             'socials': socials,
-            'phones': list(extra_phones)
+            'phones': list(extra_phones),
+            'pages': pages,
+            'outcome': outcome,
         }
 
-    async def _process_place(self, url: str) -> Optional[Dict]:
-        """Process a single place URL - Enhanced with better extraction"""
-        if not self.is_running:
+    async def _acquire_panel_tab(self, session: SearchSession, panel: PanelTabs) -> Optional[Page]:
+        """An idle results tab - opens another one while under panel.size (None if that fails)"""
+        while True:
+            if panel.idle.empty() and panel.opened < panel.size:
+                panel.opened += 1
+                page = None
+                try:
+                    page = await self._open_page(session)
+                    await self._load_results_list(page, panel)
+                    panel.pages.add(page)
+                    return page
+                except Exception:
+                    # Stay with the tabs that work (the caller falls back to a page)
+                    panel.opened -= 1
+                    panel.size = max(panel.opened, 1)
+                    await self._close_page(session, page)
+                    return None
+            page = await panel.idle.get()
+            if page is not None:
+                return page
+
+    async def _load_results_list(self, page: Page, panel: PanelTabs):
+        await page.goto(panel.search_url, wait_until='domcontentloaded', timeout=30000)
+        await self._handle_cookie_consent(page)
+        await page.wait_for_selector(FEED_SELECTOR, timeout=15000)
+
+    async def _release_panel_tab(self, session: SearchSession, panel: PanelTabs, page: Page, healthy: bool):
+        """Back to the idle tabs - or closed when it is not on the list any more"""
+        if healthy and not page.is_closed():
+            panel.idle.put_nowait(page)
+            return
+        panel.pages.discard(page)
+        panel.opened -= 1
+        await self._close_page(session, page)
+        panel.idle.put_nowait(None)  # Lets a waiting place open a replacement
+
+    async def _find_card(self, session: SearchSession, page: Page, url: str):
+        """The place's result card in this tab, scrolling the list for it - None if it is not there"""
+        cid = place_cid(url)
+        if not cid:
             return None
+        high, low = cid.split(':')
+        card = page.locator(f'{CARD_LINK_SELECTOR}[href*="{high}"][href*="{low}"]').first
+        scrolls = 0
+        while await card.count() == 0:
+            if scrolls >= PANEL_CARD_SCROLLS or not session.is_running:
+                return None
+            # A tab opened after the scan only has the first cards - load more of the list
+            await page.locator(FEED_SELECTOR).first.evaluate('el => el.scrollBy(0, el.scrollHeight)')
+            await session.sleep(SCROLL_PAUSE_MIN)
+            scrolls += 1
+        return card
+
+    async def _open_in_panel(self, page: Page, card, url: str):
+        """Click a result card found by _find_card and wait for the place's details panel"""
+        await card.click(timeout=PANEL_TIMEOUT)
+        await page.wait_for_function(PANEL_READY_JS, arg=place_cid(url), timeout=PANEL_TIMEOUT)
+
+    async def _back_to_list(self, page: Page) -> bool:
+        """History back to the results list (no reload) - False when the list did not come back"""
+        try:
+            await page.go_back(wait_until='commit', timeout=PANEL_TIMEOUT)
+            await page.locator(FEED_SELECTOR).first.wait_for(state='visible', timeout=PANEL_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def _release_panel_page(self, session: SearchSession, panel: PanelTabs, page: Page,
+                                  healthy: bool, traced: bool, url: str):
+        if traced:
+            await self._close_traced_page(session, page, url)
+        else:
+            await self._release_panel_tab(session, panel, page, healthy)
+
+    async def _process_in_panel(self, session: SearchSession, panel: PanelTabs, url: str) -> tuple:
+        """Panel mode: open the place inside a results tab - (handled, record); not handled = use a page"""
+        # A place the profiler traces gets a one-off results tab on its own context
+        page = await self._open_traced_page(session)
+        traced = page is not None
+        if traced:
+            try:
+                await self._load_results_list(page, panel)
+            except Exception:
+                await self._close_traced_page(session, page, url)
+                page = None
+        else:
+            page = await self._acquire_panel_tab(session, panel)
+        if page is None:
+            panel.fallbacks += 1
+            return False, None
+        
+        started = time.monotonic()
+        healthy = True
+        outcome = 'ok'
+        try:
+            # Scrolling this tab's list for the card does not load a place - keep it outside the semaphore
+            try:
+                card = await self._find_card(session, page, url)
+            except Exception:
+                card = None
+                healthy = False
+            if card is None:
+                panel.fallbacks += 1
+                outcome = 'fallback'
+                return False, None
+            
+            async with self.semaphore:
+                delay = random.uniform(CLICK_DELAY_MIN, CLICK_DELAY_MAX)
+                if session.request_count > 50:
+                    delay *= 1.3
+                await asyncio.sleep(delay)
+                try:
+                    await self._open_in_panel(page, card, url)
+                except Exception:
+                    # Clicked but the panel never showed the place - the tab is in an unknown state
+                    healthy = False
+                    panel.fallbacks += 1
+                    outcome = 'fallback'
+                    return False, None
+                session.request_count += 1
+                
+                details = page.locator(PANEL_SELECTOR).last
+                try:
+                    record = await read_place_details(page, self.selector_stats, details if await details.count() > 0 else None)
+                    html = await self._panel_html(page) if self.archive else None
+                finally:
+                    healthy = traced or await self._back_to_list(page)
+                await self._release_panel_page(session, panel, page, healthy, traced, url)
+                page = None
+                panel.places += 1
+                if html:
+                    await self._snapshot(session, record, KIND_PLACE, html, record.url)
+                
+                # The tab is free again while the website is visited
+                record = await self._with_website_contacts(session, record)
+                if session.is_duplicate(record):
+                    outcome = 'duplicate'
+                    return True, None
+                return True, record
+
+        except asyncio.CancelledError:
+            outcome = 'cancelled'
+            raise
+        except Exception as e:
+            outcome = classify_failure(e)
+            raise
+        finally:
+            if page is not None:
+                await self._release_panel_page(session, panel, page, healthy, traced, url)
+            elapsed = time.monotonic() - started
+            if outcome not in ('cancelled', 'fallback'):
+                session.meter.record_place(elapsed)
+            session.log_event('place', place_id=extract_place_id(url), duration=round(elapsed, 3),
+                              outcome=outcome, navigation='panel')
+
+    async def _process_place(self, session: SearchSession, url: str, delay: float = 0.0) -> Optional[BusinessRecord]:
+        """Process a single place URL - raises PlaceExtractionError (or the page error) on failure"""
+        if delay:
+            # Retry backoff - waited before queueing for a tab
+            await asyncio.sleep(delay)
+        if not session.is_running:
+            return None
+
+        intercepted = session.intercepted.get(place_cid(url))
+        if intercepted and intercepted.name:
+            # The search payload already had the details - only the website is left
+            session.intercept_hits += 1
+            started = time.monotonic()
+            async with self.semaphore:
+                full_url = f"https://www.google.com{url}" if url.startswith('/') else url
+                record = intercepted.replace(url=full_url)
+                digest = session.payload_digests.get(place_cid(url))
+                if digest:
+                    session.snapshots.setdefault(record.place_id, []).append((KIND_PAYLOAD, digest, full_url))
+                record = await self._with_website_contacts(session, record)
+            elapsed = time.monotonic() - started
+            session.meter.record_place(elapsed)
+            session.log_event('place', place_id=place_cid(url), duration=round(elapsed, 3),
+                              outcome='intercepted')
+            return None if session.is_duplicate(record) else record
+
+        if session.panel:
+            handled, record = await self._process_in_panel(session, session.panel, url)
+            if handled:
+                return record
 
         async with self.semaphore:
             page = None
+            proxy = await self.proxies.acquire() if self.proxies else None
+            started = time.monotonic()
+            maps_seconds = None
+            failure = None
+            cancelled = False
+            outcome = 'ok'
             try:
-                page = await self.context.new_page()
+                page = await self._open_traced_page(session, proxy)
+                traced = page is not None
+                if not traced:
+                    page = await self._open_page(session, proxy)
                 
                 # Navigate to the place
                 full_url = f"https://www.google.com{url}" if url.startswith('/') else url
                 await page.goto(full_url, wait_until='domcontentloaded', timeout=25000)
+                if '/sorry/' in page.url or await page.locator('#captcha-form, iframe[src*="recaptcha"]').count() > 0:
+                    raise PlaceExtractionError(FAILURE_BLOCKED, "Captcha / unusual traffic page")
                 
                 # Smart delay based on request count
                 delay = random.uniform(CLICK_DELAY_MIN, CLICK_DELAY_MAX)
-                if self.request_count > 50:
+                if session.request_count > 50:
                     delay *= 1.3  # Slow down after many requests
                 await asyncio.sleep(delay)
-                self.request_count += 1
+                session.request_count += 1
                 
-                # Extract Data with multiple fallback selectors
-                
-                # Name - Multiple selectors
-                name = "N/A"
-                name_selectors = ['h1', 'h1.DUwDvf', '[data-attrid="title"]']
-                for selector in name_selectors:
-                    try:
-                        elem = page.locator(selector).first
-                        if await elem.count() > 0:
-                            name = await elem.inner_text(timeout=2000)
-                            name = name.strip()
-                            if name:
-                                break
-                    except:
-                        continue
+                record = await read_place_details(page, self.selector_stats)
+                html = await self._panel_html(page) if self.archive else None
+                if html:
+                    await self._snapshot(session, record, KIND_PLACE, html, record.url)
                 
-                # Phone - Multiple methods
-                phone = "N/A"
-                phone_selectors = [
-                    'button[data-item-id*="phone"]',
-                    'a[href^="tel:"]',
-                    '[data-tooltip*="phone"]',
-                ]
-                for selector in phone_selectors:
-                    try:
-                        elem = page.locator(selector).first
-                        if await elem.count() > 0:
-                            if selector.startswith('a[href'):
-                                phone = await elem.get_attribute('href', timeout=2000)
-                                phone = phone.replace('tel:', '').strip()
-                            else:
-                                phone = await elem.inner_text(timeout=2000)
-                            phone = re.sub(r'[^\d+\s()-]', '', phone).strip()
-                            if phone and len(phone) >= 8:
-                                break
-                    except:
-                        continue
-                
-                # Address - Multiple selectors
-                address = "N/A"
-                address_selectors = [
-                    'button[data-item-id*="address"]',
-                    '[data-item-id*="address"]',
-                    '.Io6YTe',
-                ]
-                for selector in address_selectors:
-                    try:
-                        elem = page.locator(selector).first
-                        if await elem.count() > 0:
-                            address = await elem.inner_text(timeout=2000)
-                            address = address.strip()
-                            if address:
-                                break
-                    except:
-                        continue
-                
-                # Website
-                website = None
-                try:
-                    website_elem = page.locator('a[data-item-id="authority"]').first
-                    if await website_elem.count() > 0:
-                        website = await website_elem.get_attribute('href', timeout=2000)
-                except:
-                    pass
-                
-                # Coordinates from URL
-                coords_match = re.search(r'@(-?\d+\.?\d*),(-?\d+\.?\d*)', page.url)
-                latitude = coords_match.group(1) if coords_match else None
-                longitude = coords_match.group(2) if coords_match else None
-                
-                # Rating and reviews (bonus data)
-                rating = None
-                review_count = None
-                try:
-                    rating_elem = page.locator('span.ceNzKf, div.F7nice span').first
-                    if await rating_elem.count() > 0:
-                        rating_text = await rating_elem.get_attribute('aria-label', timeout=1000)
-                        if rating_text:
-                            rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                            if rating_match:
-                                rating = rating_match.group(1)
-                except:
-                    pass
-                
-                # Enhanced Data: Visit website for emails
-                emails = []
-                socials = []
-                website_phones = []
-                
-                if website:
-                    web_data = await self._visit_website_for_contacts(website)
-                    emails = web_data['emails']
-                    socials = web_data['socials']
-                    website_phones = web_data['phones']
-
-                details = {
-                    'name': name,
-                    'phone': phone,
-                    'address': address,
-                    'website': website or 'N/A',
-                    'emails': ", ".join(emails) if emails else 'N/A',
-                    'socials': ", ".join(socials[:3]) if socials else 'N/A',  # Limit to 3 socials
-                    'latitude': latitude,
-                    'longitude': longitude,
-                    'rating': rating,
-                    'url': page.url
-                }
+                # Enhanced Data: Visit website for emails (the proxy is scored on the Maps part only)
+                maps_seconds = time.monotonic() - started
+                record = await self._with_website_contacts(session, record)
                 
                 # Check for duplicates before returning
-                if self._is_duplicate(details):
+                if session.is_duplicate(record):
+                    outcome = 'duplicate'
                     return None
                 
-                return details
+                return record
 
+            except asyncio.CancelledError:
+                cancelled = True
+                outcome = 'cancelled'
+                raise
             except Exception as e:
-                # Don't spam the log with every error
-                pass
+                failure = outcome = classify_failure(e)
+                raise
             finally:
-                if page:
-                    try:
-                        await page.close()
-                    except:
-                        pass
-        
-        return None
-
-    async def _scroll_results(self, page: Page) -> List[str]:
-        """Scroll through results and collect all place URLs - Enhanced with debugging"""
-        self._emit_status("Scanning results list...")
-        
-        # Try multiple selectors for results container
-        container_selectors = [
-            'div[role="feed"]',
-            'div[role="main"] div.m6QErb',
-            'div.m6QErb.DxyBCb',
-            'div.m6QErb',
-            'div[aria-label*="Results"]',
-            'div.Nv2PK',
-        ]
+                if traced:
+                    await self._close_traced_page(session, page, url)
+                else:
+                    await self._close_page(session, page)
+                elapsed = time.monotonic() - started
+                if not cancelled:
+                    session.meter.record_place(elapsed)
+                session.log_event('place', place_id=extract_place_id(url), duration=round(elapsed, 3),
+                                  outcome=outcome, proxy=proxy.label if proxy else None)
+                if proxy:
+                    if cancelled:
+                        await self.proxies.release(proxy)
+                    else:
+                        await self.proxies.release(proxy, failure, maps_seconds or time.monotonic() - started)
+
+    async def _collect_cards(self, session: SearchSession, page: Page) -> int:
+        """List-only mode: turn the result cards loaded so far into records - returns new records"""
+        await self._drain_intercepts(session)
+        try:
+            cards = await page.locator('div.Nv2PK').evaluate_all(CARD_EXTRACT_JS)
+        except Exception:
+            return 0
+        
+        added = 0
+        for card in cards:
+            url = card.get('url')
+            if not url or '/maps/place/' not in url or not card.get('name'):
+                continue
+            place_id = self._extract_place_id(url)
+            if place_id in session.seen_ids:
+                continue
+            session.seen_ids.add(place_id)
+            
+            intercepted = session.intercepted.get(place_cid(url))
+            if intercepted and intercepted.name:
+                # Payload record also has phone and website
+                session.intercept_hits += 1
+                record = intercepted.replace(url=url)
+                if not session.is_duplicate(record):
+                    self._accept_result(session, record)
+                    added += 1
+                continue
+            
+            category, address = _parse_card_lines(card.get('lines') or [])
+            coords_match = re.search(r'!3d(-?\d+\.?\d*)!4d(-?\d+\.?\d*)', url)
+            record = BusinessRecord(
+                name=card['name'],
+                phone=card.get('phone'),
+                address=address,
+                category=category,
+                latitude=coords_match.group(1) if coords_match else None,
+                longitude=coords_match.group(2) if coords_match else None,
+                rating=(card.get('rating') or '').replace(',', '.') or None,
+                review_count=card.get('reviews'),
+                url=url,
+            )
+            if session.is_duplicate(record):
+                continue
+            self._accept_result(session, record)
+            added += 1
+        return added
+
+    async def _scroll_results(self, session: SearchSession, page: Page, list_only: bool = False) -> List[str]:
+        """Scroll through results and collect all place URLs - Enhanced with debugging
+        
+        In list-only mode each newly loaded result card is also emitted as a record.
+        """
+        session.emit_status("Scanning results list...")
         
+        # Try multiple selectors for results container (learned order - dead ones last)
         scrollable_div = None
         used_selector = None
         
-        for selector in container_selectors:
+        for selector in self.selector_stats.ordered('container', CONTAINER_SELECTORS):
+            started = time.monotonic()
             try:
-                self._emit_status(f"Trying selector: {selector[:30]}...")
                 await page.wait_for_selector(selector, timeout=5000)
                 elem = page.locator(selector).first
                 if await elem.count() > 0:
                     scrollable_div = elem
                     used_selector = selector
-                    self._emit_status(f"Found container with: {selector[:30]}")
-                    break
             except Exception:
-                continue
+                pass
+            self.selector_stats.record('container', selector, scrollable_div is not None)
+            session.log_event('selector', field='container', selector=selector,
+                              outcome='hit' if scrollable_div else 'miss',
+                              duration=round(time.monotonic() - started, 3))
+            if scrollable_div:
+                session.emit_status(f"Found container with: {selector[:30]}")
+                break
         
         if not scrollable_div:
-            self._emit_status("Could not find results container - trying page scroll")
+            session.emit_status("Could not find results container - trying page scroll")
             # Try scrolling the whole page as fallback
             scrollable_div = page.locator('body').first
             used_selector = "body"
@@ -499,15 +1551,7 @@ class GoogleMapsScraper:
         no_change_count = 0
         scroll_count = 0
         
-        # Link selectors to try
-        link_selectors = [
-            'a[href*="/maps/place/"]',
-            'a.hfpxzc',
-            'div.Nv2PK a',
-            'a[data-value]',
-        ]
-        
-        while self.is_running:
+        while session.is_running:
             scroll_count += 1
             
             # Smooth scroll with random variation
@@ -519,7 +1563,7 @@ class GoogleMapsScraper:
                 await page.evaluate(f'window.scrollBy(0, {scroll_amount})')
             
             # Variable delay
-            await asyncio.sleep(random.uniform(SCROLL_PAUSE_MIN, SCROLL_PAUSE_MAX))
+            await session.sleep(random.uniform(SCROLL_PAUSE_MIN, SCROLL_PAUSE_MAX))
             
             # Check scroll height
             try:
@@ -530,14 +1574,15 @@ class GoogleMapsScraper:
             if current_height == last_height:
                 no_change_count += 1
                 if no_change_count >= MAX_SCROLL_ATTEMPTS:
-                    self._emit_status("Reached end of results")
+                    session.emit_status("Reached end of results")
                     break
             else:
                 no_change_count = 0
             last_height = current_height
             
             # Try multiple link selectors
-            for link_selector in link_selectors:
+            for link_selector in self.selector_stats.ordered('link', LINK_SELECTORS):
+                found = False
                 try:
                     links = await page.locator(link_selector).all()
                     for link in links:
@@ -545,20 +1590,25 @@ class GoogleMapsScraper:
                             href = await link.get_attribute('href')
                             if href and '/maps/place/' in href:
                                 place_urls.add(href)
+                                found = True
                         except:
                             continue
-                    if place_urls:
-                        break  # Found links with this selector
                 except:
-                    continue
+                    pass
+                self.selector_stats.record('link', link_selector, found)
+                if place_urls:
+                    break  # Found links with this selector
+            
+            if list_only:
+                await self._collect_cards(session, page)
 
             # Status update every few scrolls
             if scroll_count % 3 == 0:
-                self._emit_status(f"Found {len(place_urls)} locations (scroll #{scroll_count})...")
+                session.emit_status(f"Found {len(place_urls)} locations (scroll #{scroll_count})...")
             
             # Debug: Log if no results found after several scrolls
             if scroll_count == 5 and len(place_urls) == 0:
-                self._emit_status("Warning: No results detected yet...")
+                session.emit_status("Warning: No results detected yet...")
             
             # Check for end markers
             end_markers = [
@@ -570,135 +1620,374 @@ class GoogleMapsScraper:
             for marker in end_markers:
                 try:
                     if await page.locator(marker).count() > 0:
-                        self._emit_status("Completed scanning all results")
+                        session.emit_status("Completed scanning all results")
                         return list(place_urls)
                 except:
                     continue
                     
             # Safety limit
             if len(place_urls) >= MAX_RESULTS:
-                self._emit_status(f"Reached maximum limit: {MAX_RESULTS}")
+                session.emit_status(f"Reached maximum limit: {MAX_RESULTS}")
                 break
                     
         return list(place_urls)
 
-    async def search(self, business_tag: str, region: str, city: str, district: str = ""):
-        """Main search function - Enhanced with better query building"""
-        if not self.browser:
-            await self.initialize()
-            
-        self.is_running = True
-        self.results.clear()
-        self.seen_ids.clear()
-        self.seen_phones.clear()
-        self.seen_names.clear()
-        self.request_count = 0
+    async def search(self, business_tag: str, region: str, city: str, district: str = "",
+                     list_only: bool = False, session: Optional[SearchSession] = None):
+        """Main search function - Enhanced with better query building
+        
+        list_only=True takes records straight from the result cards (name, rating,
+        category, address snippet, URL) without opening any place page; use
+        enrich() afterwards for the places that need phones, website and emails.
         
-        page = await self.context.new_page()
+        Searches on different sessions (see new_session) can run concurrently on
+        this scraper's browser; without one the default session is used.
+        """
+        session = session or self.session
+        self._begin_run(session, {'business_tag': business_tag, 'region': region, 'city': city, 'district': district})
         
+        page = None
         try:
+            await self.ensure_browser()
+            page = await self._open_page(session)
+            if INTERCEPT_MAPS_RESPONSES:
+                page.on('response', functools.partial(self._on_response, session))
+            
             # Build optimized search query
             if district and district.strip():
                 # More specific search when district is provided
                 query = f"{business_tag} {district} {city}"
-                self._emit_status(f"Targeting: {district}, {city}")
+                session.emit_status(f"Targeting: {district}, {city}")
             else:
                 query = f"{business_tag} in {city}, {region}"
-                self._emit_status(f"Searching: {city}, {region}")
+                session.emit_status(f"Searching: {city}, {region}")
             
             # Navigate to Maps with English locale for consistent parsing
             maps_url = f"https://www.google.com/maps/search/{quote(query)}?hl=en"
-            self._emit_status(f"Opening Google Maps...")
-            self._emit_status(f"Query: {query}")
+            session.emit_status(f"Opening Google Maps...")
+            session.emit_status(f"Query: {query}")
             
             # IMPORTANT: Use 'domcontentloaded' instead of 'networkidle' because 
             # Google Maps continuously sends network requests and will never reach 'networkidle'
             await page.goto(maps_url, wait_until='domcontentloaded', timeout=30000)
-            self._emit_status(f"Page loaded successfully")
+            session.emit_status(f"Page loaded successfully")
             
             await self._handle_cookie_consent(page)
             
             # Wait for results panel to appear
-            self._emit_status(f"Waiting for results to load...")
+            session.emit_status(f"Waiting for results to load...")
             try:
                 # Wait for results container to be visible
                 await page.wait_for_selector('div.m6QErb, div[role="feed"], div.Nv2PK', timeout=15000)
-                self._emit_status(f"Results panel detected")
+                session.emit_status(f"Results panel detected")
             except Exception as e:
-                self._emit_status(f"Warning: Results panel not found, continuing anyway...")
+                session.emit_status(f"Warning: Results panel not found, continuing anyway...")
             
             # Additional wait for dynamic content
-            await asyncio.sleep(3)
+            await session.sleep(3)
             
             # Debug: Show current URL
             try:
                 current_url = page.url
-                self._emit_status(f"Current URL: {current_url[:50]}...")
+                session.emit_status(f"Current URL: {current_url[:50]}...")
             except:
                 pass
             
             # Collect all URLs first
-            place_urls = await self._scroll_results(page)
+            started = time.monotonic()
+            place_urls = await self._scroll_results(session, page, list_only=list_only)
+            session.log_event('scroll', duration=round(time.monotonic() - started, 3), urls=len(place_urls),
+                              outcome='ok' if place_urls else 'empty')
             
             if not place_urls:
-                self._emit_status("No results found for this search")
-                if self.on_complete: 
-                    self.on_complete()
+                session.emit_status("No results found for this search")
                 return
             
-            self._emit_status(f"Processing {len(place_urls)} locations...")
-            await page.close()
-            
-            # Process in parallel with progress tracking
-            tasks = []
-            for url in place_urls:
-                if not self.is_running:
-                    break
-                
-                # Deduplicate by place ID
-                place_id = self._extract_place_id(url)
-                if place_id in self.seen_ids:
-                    continue
-                self.seen_ids.add(place_id)
-                
-                task = asyncio.create_task(self._process_place(url))
-                tasks.append(task)
-            
-            # Process with progress updates
-            completed = 0
-            total = len(tasks)
-            successful = 0
+            if list_only:
+                # Cards not yet collected when the scan stopped early
+                await self._collect_cards(session, page)
+                session.emit_status(f"Complete! Listed {len(session.seen_ids)} businesses from the results list")
+                self._emit_run_summary(session)
+                return
             
-            for task in asyncio.as_completed(tasks):
-                if not self.is_running:
-                    break
-                
-                try:
-                    result = await task
-                    completed += 1
-                    
-                    # Progress update every 5 items
-                    if completed % 5 == 0 or completed == total:
-                        self._emit_status(f"Progress: {completed}/{total} ({successful} extracted)")
-                    
-                    if result:
-                        successful += 1
-                        self.results.append(result)
-                        self._emit_data(result)
-                        
-                except Exception:
-                    completed += 1
-                    continue
+            session.emit_status(f"Processing {len(place_urls)} locations...")
+            await self._drain_intercepts(session)
+            if PLACE_NAVIGATION == 'panel':
+                # The scanned results tab becomes the first long-lived panel tab
+                session.panel = PanelTabs(maps_url)
+                session.panel.add(page)
+            else:
+                await self._close_page(session, page)
             
-            self._emit_status(f"Complete! Extracted {len(self.results)} unique businesses")
+            successful = await self._process_urls(session, place_urls)
+            session.emit_status(f"Complete! Extracted {successful} unique businesses")
+            self._emit_run_summary(session)
+
+        except Exception as e:
+            if session.is_running:  # Errors from pages closed by stop() are expected
+                session.emit_status(f"Search error: {str(e)[:50]}")
+        finally:
+            await self._close_page(session, page)
+            if session.panel:
+                for panel_page in list(session.panel.pages):
+                    await self._close_page(session, panel_page)
+                session.panel = None
+            await self._finish_run(session)
+            if session.on_complete:
+                session.on_complete()
 
+    async def rerun_dead_letters(self, path: str, session: Optional[SearchSession] = None) -> int:
+        """Re-run only the places that permanently failed in an earlier run"""
+        with open(path, encoding='utf-8') as f:
+            saved = json.load(f)
+        urls = [item['url'] for item in saved.get('items', [])]
+        
+        session = session or self.session
+        self._begin_run(session, saved.get('campaign', {}))
+        successful = 0
+        try:
+            await self.ensure_browser()
+            session.emit_status(f"Retrying {len(urls)} failed places from {Path(path).name}...")
+            successful = await self._process_urls(session, urls)
+            session.emit_status(f"Recovered {successful} of {len(urls)} places")
+            self._emit_run_summary(session)
         except Exception as e:
-            self._emit_status(f"Search error: {str(e)[:50]}")
+            session.emit_status(f"Re-run error: {str(e)[:50]}")
         finally:
-            if self.on_complete:
-                self.on_complete()
+            await self._finish_run(session)
+            if session.on_complete:
+                session.on_complete()
+        return successful
+
+    async def enrich(self, urls: List[str], session: Optional[SearchSession] = None) -> int:
+        """Full detail + website extraction for places picked from a list-only run
+        
+        Results keep the campaign of the last search. Each enriched record replaces
+        the list-only one with the same URL and is reported via on_record_enriched.
+        """
+        session = session or self.session
+        self._begin_run(session, session.campaign, clear_results=False)
+        
+        def on_result(url: str, record: BusinessRecord):
+            if session.keep_results:
+                for index, existing in enumerate(session.results):
+                    if existing.url == url:
+                        session.results[index] = record
+                        break
+                else:
+                    session.results.append(record)
+            if self.store:
+                self.store.add(record, session.campaign)
+            self._archive_record(session, record)
+            if session.on_record_enriched:
+                session.on_record_enriched(url, record)
+        
+        successful = 0
+        try:
+            await self.ensure_browser()
+            session.emit_status(f"Enriching {len(urls)} selected places...")
+            successful = await self._process_urls(session, urls, on_result=on_result)
+            session.emit_status(f"Enriched {successful} of {len(urls)} places")
+            self._emit_run_summary(session)
+        except Exception as e:
+            session.emit_status(f"Enrich error: {str(e)[:50]}")
+        finally:
+            await self._finish_run(session)
+            if session.on_complete:
+                session.on_complete()
+        return successful
+
+    def _emit_run_summary(self, session: SearchSession):
+        """Report skipped websites and dead letters at the end of a run"""
+        if session.intercept_hits:
+            session.emit_status(f"{session.intercept_hits} places taken from intercepted Maps data (no place page opened)")
+        if session.skipped_throttled:
+            session.emit_status(f"Skipped {session.skipped_throttled} website visits to throttled hosts")
+        if session.skipped_unreachable:
+            session.emit_status(f"Skipped {session.skipped_unreachable} unreachable websites "
+                                f"(~{session.unreachable_saved_seconds:.0f}s saved)")
+        if session.dead_letters:
+            kinds = {}
+            for item in session.dead_letters:
+                kinds[item['kind']] = kinds.get(item['kind'], 0) + 1
+            breakdown = ", ".join(f"{kind}: {count}" for kind, count in sorted(kinds.items()))
+            session.emit_status(f"{len(session.dead_letters)} places failed ({breakdown}) - saved for re-run")
+        if session.panel and (session.panel.places or session.panel.fallbacks):
+            session.emit_status(f"{session.panel.places} places opened in-panel, "
+                                f"{session.panel.fallbacks} needed a page of their own")
+        if self.archive and (self.archive.stored or self.archive.reused):
+            session.emit_status(self.archive.summary())
+        if self.proxies:
+            session.emit_status(f"Proxies: {self.proxies.healthy_count()}/{len(self.proxies)} healthy")
+            for line in self.proxies.summary():
+                session.emit_status(f"  {line}")
+        stale = self.selector_stats.stale()
+        if stale:
+            session.emit_status(f"Selectors that stopped matching: {'; '.join(stale)}")
+
+    async def _process_urls(self, session: SearchSession, place_urls: List[str], on_result: Optional[Callable] = None) -> int:
+        """Extract places in parallel, retrying transient failures - returns the number extracted
+        
+        on_result(url, record) replaces the default handling of each extracted record.
+        """
+        # task -> (url, attempt number)
+        pending: Dict[asyncio.Task, tuple] = {}
+        for url in place_urls:
+            if not session.is_running:
+                break
+            
+            # Deduplicate by place ID
+            place_id = self._extract_place_id(url)
+            if place_id in session.seen_ids:
+                continue
+            session.seen_ids.add(place_id)
+            
+            pending[session.track(asyncio.create_task(self._process_place(session, url)))] = (url, 1)
+        
+        # Process with progress updates
+        completed = 0
+        total = len(pending)
+        session.meter.add_queued(total)
+        successful = 0
+        
+        while pending and session.is_running:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                url, attempt = pending.pop(task)
+                if task.cancelled():
+                    continue
+                try:
+                    result = task.result()
+                except Exception as e:
+                    kind = classify_failure(e)
+                    if kind == FAILURE_CRASH and not self.is_healthy():
+                        # The browser or context died under this place - relaunch before it is retried
+                        try:
+                            await self.ensure_browser()
+                        except Exception:
+                            pass
+                    if kind in TRANSIENT_FAILURES and attempt <= PLACE_MAX_RETRIES:
+                        # Back of the queue after a jittered exponential backoff
+                        delay = PLACE_RETRY_BASE_DELAY * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                        session.log_event('retry', place_id=extract_place_id(url), outcome=kind,
+                                          attempt=attempt + 1, delay=round(delay, 2))
+                        retry = session.track(asyncio.create_task(self._process_place(session, url, delay=delay)))
+                        pending[retry] = (url, attempt + 1)
+                        continue
+                    self._add_dead_letter(session, url, kind, e, attempt)
+                    result = None
+                
+                completed += 1
+                session.meter.place_finished()
+                
+                # Progress update every 5 items
+                if completed % 5 == 0 or completed == total:
+                    session.emit_status(f"Progress: {completed}/{total} ({successful} extracted)")
+                
+                if result:
+                    successful += 1
+                    if on_result:
+                        on_result(url, result)
+                    else:
+                        self._accept_result(session, result)
+        
+        if pending:
+            # Stopped - give the cancelled tasks a bounded moment to unwind
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending, timeout=STOP_TIMEOUT)
+        
+        return successful
+
+    def _accept_result(self, session: SearchSession, record: BusinessRecord):
+        """Keep, store and emit one new record"""
+        if session.keep_results:
+            session.results.append(record)
+        if self.store:
+            self.store.add(record, session.campaign)
+        self._archive_record(session, record)
+        session.emit_data(record)
+
+    def _archive_record(self, session: SearchSession, record: BusinessRecord):
+        """Index the snapshots of a record that was stored"""
+        snapshots = session.snapshots.pop(record.place_id, None)
+        if self.archive and snapshots:
+            self.archive.index(session.run_id, record.place_id, snapshots, session.campaign)
+
+    def _add_dead_letter(self, session: SearchSession, url: str, kind: str, error: Exception, attempts: int):
+        session.dead_letters.append({
+            'url': url,
+            'kind': kind,
+            'error': str(error)[:200],
+            'attempts': attempts,
+            'failed_at': time.time(),
+        })
+        session.log_event('dead_letter', place_id=extract_place_id(url), outcome=kind,
+                          attempt=attempts, error=str(error)[:200])
+
+    def _save_dead_letters(self, session: SearchSession) -> Optional[Path]:
+        """Write this run's permanently failed places next to the exports"""
+        if not session.dead_letters:
+            return None
+        try:
+            directory = Path(DEAD_LETTER_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            filepath = directory / f"{session.run_id}.json"
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'run_id': session.run_id,
+                    'campaign': session.campaign,
+                    'items': session.dead_letters,
+                }, f, ensure_ascii=False, indent=2)
+            return filepath
+        except OSError:
+            return None
+
+    def new_session(self, **options) -> SearchSession:
+        """Independent search session sharing this scraper's browser and page budget"""
+        return SearchSession(**options)
+
+    def _begin_run(self, session: SearchSession, campaign: Dict[str, str], clear_results: bool = True):
+        """Reset a session before a search, a dead-letter re-run or an enrichment"""
+        session.reset(campaign, clear_results)
+        session.log_event('run', outcome='started', **{k: v for k, v in session.campaign.items() if k != 'run_id'})
+        self.sessions.add(session)
+        self._start_watchdog()
+        if self.profile and self.profiler is None:
+            self.profiler = RunProfiler(session.run_id)
+            self.profiler.start()
+        if RESULT_STORE_ENABLED and self.store is None:
+            self.store = ResultStore()
+        if SNAPSHOT_ARCHIVE_ENABLED and self.archive is None:
+            self.archive = SnapshotArchive()
+
+    async def _finish_run(self, session: SearchSession):
+        """Persist caches, stored results and dead letters at the end of a run"""
+        if session.closing:
+            await asyncio.wait(session.closing, timeout=STOP_TIMEOUT)
+        self.sessions.discard(session)
+        self.reachability.save()
+        self.selector_stats.save()
+        if self.proxies:
+            self.proxies.save()
+        if self.store:
+            self.store.flush()
+        if self.archive:
+            self.archive.flush()
+        self._save_dead_letters(session)
+        if self.profiler and not self.sessions:
+            directory = self.profiler.stop()
+            self.profiler = None
+            session.emit_status(f"Profile written to {directory} (see summary.txt)")
+        if session.stop_requested_at is not None:
+            session.stop_latency = time.monotonic() - session.stop_requested_at
+            session.emit_status(f"Stopped in {session.stop_latency * 1000:.0f} ms - partial results saved")
+        session.log_event('run', outcome='stopped' if session.stop_requested_at is not None else 'finished',
+                          duration=round(session.meter.snapshot()['elapsed_seconds'], 3),
+                          queued=session.meter.queued, done=session.meter.done,
+                          dead_letters=len(session.dead_letters))
             
     def stop(self):
-        """Stop the scraping process"""
-        self.is_running = False
-        self._emit_status("Stopping extraction...")
+        """Stop every running session"""
+        for session in list(self.sessions):
+            session.stop()
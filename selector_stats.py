@@ -0,0 +1,103 @@
+"""Learned hit/miss statistics for fallback selectors, persisted across runs
+
+The engine tries the selector that currently works first and demotes dead
+ones. Print the health report with:  python selector_stats.py
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from config import *
+
+STATS_FILE = "selector_stats.json"
+UNKNOWN_HIT_RATE = 0.5  # Prior for selectors without history
+
+
+class SelectorStats:
+    """Per-field selector hit rates used to order fallback lists"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.path = Path(cache_dir) / STATS_FILE
+        # field -> selector -> {hits, misses, misses_in_row, rate, last_hit}
+        self.fields: Dict[str, Dict[str, Dict]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.fields = json.load(f)
+        except (OSError, ValueError):
+            self.fields = {}
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.fields, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _rate(self, field: str, selector: str) -> float:
+        entry = self.fields.get(field, {}).get(selector)
+        return entry['rate'] if entry else UNKNOWN_HIT_RATE
+
+    def ordered(self, field: str, selectors: List[str]) -> List[str]:
+        """Selectors sorted by current hit rate (configured order breaks ties)"""
+        return sorted(selectors, key=lambda selector: -self._rate(field, selector))
+
+    def record(self, field: str, selector: str, hit: bool):
+        """Update a selector's statistics after one attempt"""
+        entry = self.fields.setdefault(field, {}).setdefault(selector, {
+            'hits': 0, 'misses': 0, 'misses_in_row': 0, 'rate': UNKNOWN_HIT_RATE, 'last_hit': None,
+        })
+        entry['rate'] += SELECTOR_HIT_RATE_ALPHA * ((1.0 if hit else 0.0) - entry['rate'])
+        if hit:
+            entry['hits'] += 1
+            entry['misses_in_row'] = 0
+            entry['last_hit'] = time.time()
+        else:
+            entry['misses'] += 1
+            entry['misses_in_row'] += 1
+
+    def record_field(self, field: str, attempts: List[Tuple[str, bool]], optional: bool = False):
+        """Record one place's (selector, hit) attempts for a field
+        
+        For an optional field (phone, address) a place where no selector matched
+        may simply not have it, so nothing is learned from it.
+        """
+        if optional and not any(hit for _, hit in attempts):
+            return
+        for selector, hit in attempts:
+            self.record(field, selector, hit)
+
+    def stale(self) -> List[str]:
+        """'field: selector' for selectors that have stopped matching"""
+        return [
+            f"{field}: {selector}"
+            for field, selectors in self.fields.items()
+            for selector, entry in selectors.items()
+            if entry['misses_in_row'] >= SELECTOR_STALE_MISSES
+        ]
+
+    def report(self) -> str:
+        """Human-readable table of every known selector"""
+        lines = []
+        for field in sorted(self.fields):
+            lines.append(f"[{field}]")
+            for selector, entry in sorted(self.fields[field].items(), key=lambda item: -item[1]['rate']):
+                if entry['misses_in_row'] >= SELECTOR_STALE_MISSES:
+                    state = "STOPPED MATCHING" if entry['hits'] else "NEVER MATCHED"
+                else:
+                    state = "ok"
+                last_hit = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_hit'])) if entry['last_hit'] else '-'
+                lines.append(f"  {entry['rate']:5.2f}  hits={entry['hits']:<6} misses={entry['misses']:<6} "
+                             f"last hit={last_hit:<16} {state:<16} {selector}")
+        return "\n".join(lines) if lines else "No selector statistics recorded yet"
+
+
+if __name__ == "__main__":
+    print(SelectorStats().report())
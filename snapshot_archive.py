@@ -0,0 +1,308 @@
+"""Compressed, content-addressed archive of the raw inputs behind every stored record
+
+With SNAPSHOT_ARCHIVE_ENABLED the engine keeps, per record:
+    place    - the place details panel HTML and the URL it was read at
+    payload  - the intercepted Maps search payload the record was decoded from
+    website  - the text of each website page the contact extraction read, in order
+Snapshots are gzip files named by the SHA-256 of their content, so a payload
+shared by twenty places or a Linktree page shared by a hundred is stored once;
+index.db maps runs and places to them.
+
+Re-run the current parsing code over the archive - a local, CPU-bound job in a
+process pool (no browser, no network); results replace the stored records:
+    python snapshot_archive.py --reextract
+    python snapshot_archive.py --reextract --city Jeddah --tag "Dental Clinic" --excel
+    python snapshot_archive.py                        # archive statistics
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from config import *
+from models import BusinessRecord
+
+KIND_PLACE = 'place'
+KIND_PAYLOAD = 'payload'
+KIND_WEBSITE = 'website'
+
+INDEX_FILE = "index.db"
+INDEX_BATCH_SIZE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id           INTEGER PRIMARY KEY,
+    run_id       TEXT NOT NULL,
+    place_id     TEXT NOT NULL,
+    kind         TEXT NOT NULL,
+    position     INTEGER NOT NULL,
+    digest       TEXT NOT NULL,
+    url          TEXT,
+    business_tag TEXT COLLATE NOCASE,
+    region       TEXT COLLATE NOCASE,
+    city         TEXT COLLATE NOCASE,
+    district     TEXT COLLATE NOCASE,
+    captured_at  REAL,
+    UNIQUE (run_id, place_id, kind, position)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_place_id ON snapshots (place_id);
+CREATE INDEX IF NOT EXISTS idx_snapshots_city ON snapshots (city);
+"""
+
+
+def blob_path(directory: Path, digest: str) -> Path:
+    return directory / 'blobs' / digest[:2] / f"{digest}.gz"
+
+
+def read_blob(directory: Path, digest: str) -> str:
+    with gzip.open(blob_path(directory, digest), 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+class SnapshotArchive:
+    """Blob store (written from worker threads) plus its SQLite index (event loop only)"""
+
+    def __init__(self, directory: str = SNAPSHOT_ARCHIVE_DIR, level: int = SNAPSHOT_COMPRESSION_LEVEL):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.level = level
+        self.conn = sqlite3.connect(str(self.directory / INDEX_FILE))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.executescript(SCHEMA)
+        self._pending: List[Tuple] = []
+        # This process: new blobs, blobs already there, bytes before/after compression
+        self.stored = 0
+        self.reused = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+
+    def put(self, content: str) -> str:
+        """Store one snapshot unless its content is already archived - returns the digest"""
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = blob_path(self.directory, digest)
+        if path.exists():
+            self.reused += 1
+            return digest
+        compressed = gzip.compress(data, compresslevel=self.level, mtime=0)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        self.stored += 1
+        self.raw_bytes += len(data)
+        self.compressed_bytes += len(compressed)
+        return digest
+
+    def index(self, run_id: str, place_id: str, snapshots: List[Tuple[str, str, str]], campaign: Dict):
+        """Link a stored record to its snapshots - (kind, digest, url) in capture order"""
+        positions: Dict[str, int] = {}
+        now = time.time()
+        for kind, digest, url in snapshots:
+            position = positions.get(kind, 0)
+            positions[kind] = position + 1
+            self._pending.append((
+                run_id, place_id, kind, position, digest, url,
+                campaign.get('business_tag'), campaign.get('region'), campaign.get('city'),
+                campaign.get('district') or None, now,
+            ))
+        if len(self._pending) >= INDEX_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (run_id, place_id, kind, position, digest, url, "
+                "business_tag, region, city, district, captured_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending)
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def summary(self) -> str:
+        """One line for the end-of-run report"""
+        ratio = f", {self.raw_bytes / self.compressed_bytes:.1f}x compressed" if self.compressed_bytes else ""
+        return (f"Snapshots: {self.stored} new ({self.compressed_bytes / 1e6:.1f} MB{ratio}), "
+                f"{self.reused} already archived")
+
+    def stats(self) -> Dict:
+        places, runs, refs, unique = self.conn.execute(
+            "SELECT COUNT(DISTINCT place_id), COUNT(DISTINCT run_id), COUNT(*), COUNT(DISTINCT digest) FROM snapshots"
+        ).fetchone()
+        files = list((self.directory / 'blobs').glob('*/*.gz'))
+        return {
+            'places': places, 'runs': runs, 'references': refs, 'unique_snapshots': unique,
+            'blob_files': len(files), 'blob_bytes': sum(f.stat().st_size for f in files),
+        }
+
+    def jobs(self, city: Optional[str] = None, business_tag: Optional[str] = None,
+             run_id: Optional[str] = None) -> List[Dict]:
+        """One re-extraction job per stored record - the latest run of each place and campaign"""
+        clauses, params = [], []
+        for column, value in (('city', city), ('business_tag', business_tag), ('run_id', run_id)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            "SELECT run_id, place_id, kind, digest, url, business_tag, region, city, district "
+            f"FROM snapshots {where} ORDER BY captured_at, position", params)
+
+        jobs: Dict[Tuple, Dict] = {}
+        for run, place_id, kind, digest, url, tag, region, city_name, district in rows:
+            key = (place_id, (tag or '').lower(), (city_name or '').lower())
+            job = jobs.get(key)
+            if job is None or job['run_id'] != run:
+                # Rows come oldest first - a later run of the same place replaces the job
+                job = jobs[key] = {
+                    'directory': str(self.directory), 'run_id': run, 'place_id': place_id,
+                    'place': None, 'payload': None, 'website': [],
+                    'campaign': {'business_tag': tag, 'region': region, 'city': city_name,
+                                 'district': district, 'run_id': run},
+                }
+            if kind == KIND_WEBSITE:
+                job['website'].append(digest)
+            else:
+                job[kind] = (digest, url)
+        return list(jobs.values())
+
+
+# Per worker process: selector order as learned live (never saved back) and one event loop
+_worker_stats = None
+_worker_loop = None
+
+
+def _init_worker():
+    global _worker_stats, _worker_loop
+    from selector_stats import SelectorStats
+
+    _worker_stats = SelectorStats()
+    _worker_loop = asyncio.new_event_loop()
+
+
+def reextract(job: Dict) -> Tuple[Optional[BusinessRecord], Optional[str]]:
+    """Rebuild one record from its snapshots with the current parsing code - (record, failure)"""
+    from scraper import PlaceExtractionError, contacts_from_pages, read_place_details
+    from maps_payload import decode_payload, place_cid
+    from offline_page import OfflinePage
+
+    if _worker_loop is None:
+        _init_worker()
+    directory = Path(job['directory'])
+    try:
+        if job['place']:
+            digest, url = job['place']
+            page = OfflinePage(read_blob(directory, digest), url)
+            record = _worker_loop.run_until_complete(read_place_details(page, _worker_stats))
+        elif job['payload']:
+            digest, url = job['payload']
+            record = decode_payload(read_blob(directory, digest)).get(place_cid(url))
+            if not record or not record.name:
+                return None, 'not_in_payload'
+            record = record.replace(url=url)
+        else:
+            return None, 'no_place_snapshot'
+
+        if record.website and job['website']:
+            contents = [read_blob(directory, digest) for digest in job['website']]
+            web_data = contacts_from_pages(record.website, contents)
+            record = record.replace(emails=web_data['emails'], socials=web_data['socials'][:3])
+        return record, None
+    except PlaceExtractionError as e:
+        return None, e.kind
+    except (OSError, ValueError, EOFError) as e:
+        return None, f"unreadable: {type(e).__name__}"
+
+
+def run_reextract(jobs: List[Dict], workers: int = REEXTRACT_WORKERS, store=None) -> Tuple[Dict, List[BusinessRecord]]:
+    """Re-extract jobs across processes (records also go to the store if given) - (counts, records)"""
+    workers = workers or os.cpu_count() or 1
+    counts = {'jobs': len(jobs), 'records': 0, 'with_phone': 0, 'with_email': 0, 'with_website': 0, 'failed': {}}
+    records: List[BusinessRecord] = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        chunksize = max(1, min(64, len(jobs) // (workers * 4) or 1))
+        for job, (record, failure) in zip(jobs, pool.map(reextract, jobs, chunksize=chunksize)):
+            if record is None:
+                counts['failed'][failure] = counts['failed'].get(failure, 0) + 1
+                continue
+            counts['records'] += 1
+            counts['with_phone'] += record.has_phone
+            counts['with_email'] += record.has_email
+            counts['with_website'] += record.has_website
+            records.append(record)
+            if store:
+                store.add(record, job['campaign'])
+    if store:
+        store.flush()
+    counts['seconds'] = time.perf_counter() - started
+    return counts, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot archive statistics / offline re-extraction")
+    parser.add_argument('--dir', default=SNAPSHOT_ARCHIVE_DIR, help="Archive directory")
+    parser.add_argument('--reextract', action='store_true', help="Re-run the current parsing code over the archive")
+    parser.add_argument('--city')
+    parser.add_argument('--tag', dest='business_tag')
+    parser.add_argument('--run', dest='run_id', help="Only this run")
+    parser.add_argument('--workers', type=int, default=REEXTRACT_WORKERS, help="Processes (0 = one per CPU)")
+    parser.add_argument('--no-store', action='store_true', help="Do not replace the records in the result store")
+    parser.add_argument('--excel', action='store_true', help="Also export the re-extracted records to Excel")
+    args = parser.parse_args()
+
+    archive = SnapshotArchive(args.dir)
+    try:
+        if not args.reextract:
+            stats = archive.stats()
+            print(f"{stats['places']} places in {stats['runs']} runs - {stats['references']} snapshot references, "
+                  f"{stats['unique_snapshots']} unique ({stats['blob_bytes'] / 1e6:.1f} MB on disk)")
+            return
+
+        jobs = archive.jobs(city=args.city, business_tag=args.business_tag, run_id=args.run_id)
+        if not jobs:
+            print("No archived records match")
+            return
+        store = None
+        if not args.no_store:
+            from result_store import ResultStore
+
+            store = ResultStore()
+        try:
+            counts, records = run_reextract(jobs, args.workers, store)
+        finally:
+            if store:
+                store.close()
+
+        rate = counts['jobs'] / counts['seconds'] if counts['seconds'] else 0
+        print(f"Re-extracted {counts['records']}/{counts['jobs']} records in {counts['seconds']:.1f}s "
+              f"({rate:.0f}/s) - {counts['with_phone']} with phone, {counts['with_email']} with email, "
+              f"{counts['with_website']} with website")
+        for failure, count in sorted(counts['failed'].items()):
+            print(f"  failed ({failure}): {count}")
+        if store:
+            print(f"Result store updated ({RESULT_STORE_PATH})")
+        if args.excel and records:
+            from exporter import export_to_excel
+
+            print(f"Exported -> {export_to_excel(records, 'reextracted')}")
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Optional startup timing report (import breakdown + milestones) for the desktop app
+
+Enable with the SCRAPER_STARTUP_PROFILE=1 environment variable or the
+--startup-profile command line flag. When disabled nothing is hooked.
+"""
+
+import builtins
+import os
+import sys
+import time
+
+ENABLED = os.environ.get('SCRAPER_STARTUP_PROFILE') == '1' or '--startup-profile' in sys.argv
+
+_t0 = time.perf_counter()
+_original_import = builtins.__import__
+_import_stack = []      # accumulated child time per open import
+_import_records = []    # (name, self_seconds, cumulative_seconds, depth)
+_milestones = []        # (label, seconds since start)
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """Time first-time absolute imports, -X importtime style"""
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    depth = len(_import_stack)
+    _import_stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _import_stack.pop()
+        if _import_stack:
+            _import_stack[-1] += elapsed
+        _import_records.append((name, elapsed - children, elapsed, depth))
+
+
+def install():
+    """Start recording imports - call before any heavy import"""
+    if ENABLED and builtins.__import__ is not _timed_import:
+        builtins.__import__ = _timed_import
+
+
+def mark(label: str):
+    """Record a startup milestone"""
+    if ENABLED:
+        _milestones.append((label, time.perf_counter() - _t0))
+
+
+def report(top: int = 25) -> str:
+    """Stop recording and print the startup timing report"""
+    if not ENABLED:
+        return ""
+    builtins.__import__ = _original_import
+
+    lines = ["", "=" * 60, "STARTUP PROFILE", "=" * 60, "Milestones:"]
+    for label, seconds in _milestones:
+        lines.append(f"  {seconds * 1000:9.1f} ms  {label}")
+
+    lines.append(f"\nSlowest imports (top {top} by cumulative time):")
+    lines.append(f"  {'self [ms]':>10} | {'cumulative':>10} | module")
+    for name, own, cumulative, depth in sorted(_import_records, key=lambda r: r[2], reverse=True)[:top]:
+        lines.append(f"  {own * 1000:10.1f} | {cumulative * 1000:10.1f} | {'  ' * depth}{name}")
+    lines.append("=" * 60)
+
+    text = "\n".join(lines)
+    print(text)
+    return text
@@ -0,0 +1,16 @@
+from scraper import _parse_card_lines
+
+
+def test_category_and_address_from_the_info_line():
+    lines = ['4.5(1,234)', 'Dental clinic ·  · King Fahd Rd', 'Open ⋅ Closes 10 PM']
+    assert _parse_card_lines(lines) == ('Dental clinic', 'King Fahd Rd')
+
+
+def test_category_without_an_address():
+    assert _parse_card_lines(['Cafe']) == ('Cafe', None)
+
+
+def test_rating_and_opening_hours_lines_are_skipped():
+    assert _parse_card_lines(['4.8 (320)', 'Closed · Opens 9 AM', 'مغلق · يفتح ٩ ص']) == (None, None)
+    assert _parse_card_lines([]) == (None, None)
+    assert _parse_card_lines(['', '', '\ue8b5 Bakery · \ue0c8 Olaya St']) == ('Bakery', 'Olaya St')
@@ -0,0 +1,19 @@
+from scraper import extract_emails, extract_socials
+
+
+def test_social_domains_must_start_at_a_host_boundary():
+    content = ('https://www.dropbox.com/s/menu.pdf https://inbox.com/alpha notfacebook.com/alpha '
+               'https://x.com/alpha_sa https://www.facebook.com/alpha.sa')
+    assert extract_socials('https://alpha.sa/', content) == [
+        'https://facebook.com/alpha.sa', 'https://x.com/alpha_sa',
+    ]
+
+
+def test_a_social_profile_used_as_the_website_wins():
+    assert extract_socials('https://instagram.com/alpha_sa', 'https://instagram.com/other') == [
+        'https://instagram.com/alpha_sa',
+    ]
+
+
+def test_extract_emails():
+    assert extract_emails('Write to info@alpha.sa or INFO@alpha.sa') == {'info@alpha.sa'}
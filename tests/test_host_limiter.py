@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from config import HOST_BACKOFF_BASE, HOST_BACKOFF_MAX
+from host_limiter import HostLimiter, host_of, is_aggregator_host
+
+
+def test_host_of_strips_www_and_case():
+    assert host_of('https://WWW.Alpha.sa/contact') == 'alpha.sa'
+    assert host_of('not a url') == ''
+
+
+def test_aggregator_hosts_match_subdomains_only():
+    assert is_aggregator_host('linktr.ee')
+    assert is_aggregator_host('shop.linktr.ee')
+    assert not is_aggregator_host('notlinktr.ee')
+
+
+def test_throttle_backs_off_exponentially_up_to_the_cap():
+    limiter = HostLimiter()
+    assert limiter.blocked_for('alpha.sa') == 0.0
+    limiter.report('alpha.sa', 429)
+    assert limiter.blocked_for('alpha.sa') == pytest.approx(HOST_BACKOFF_BASE, abs=0.5)
+    limiter.report('alpha.sa', 503)
+    assert limiter.blocked_for('alpha.sa') == pytest.approx(min(HOST_BACKOFF_BASE * 2, HOST_BACKOFF_MAX), abs=0.5)
+    for _ in range(20):
+        limiter.report('alpha.sa', 429)
+    assert limiter.blocked_for('alpha.sa') == pytest.approx(HOST_BACKOFF_MAX, abs=0.5)
+    assert limiter.blocked_for('beta.sa') == 0.0
+
+
+def test_retry_after_extends_the_backoff_and_success_forgives_a_strike():
+    limiter = HostLimiter()
+    limiter.report('alpha.sa', 429, retry_after=str(HOST_BACKOFF_BASE * 3))
+    assert limiter.blocked_for('alpha.sa') == pytest.approx(HOST_BACKOFF_BASE * 3, abs=0.5)
+    limiter.report('alpha.sa', 429, retry_after='Wed, 21 Oct 2026 07:28:00 GMT')  # Date form is ignored
+    assert limiter.hosts['alpha.sa'].strikes == 2
+    limiter.report('alpha.sa', 200)
+    assert limiter.hosts['alpha.sa'].strikes == 1
+    limiter.report('alpha.sa', 404)  # Errors other than throttling change nothing
+    assert limiter.hosts['alpha.sa'].strikes == 1
+
+
+def test_slots_limit_concurrency_and_space_requests():
+    limiter = HostLimiter(max_concurrent=1, min_interval=0.05)
+    active = []
+    peak = []
+
+    async def visit():
+        async with limiter.slot('alpha.sa'):
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+
+    async def main():
+        started = time.monotonic()
+        await asyncio.gather(*(visit() for _ in range(3)))
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(main())
+    assert max(peak) == 1
+    assert elapsed >= 0.1  # Three requests, two intervals apart
@@ -0,0 +1,74 @@
+import json
+
+from maps_payload import (
+    IDX_ADDRESS_LINES, IDX_CATEGORIES, IDX_CID, IDX_COORDS, IDX_FULL_ADDRESS, IDX_NAME, IDX_PHONE,
+    IDX_RATING_BLOCK, IDX_WEBSITE, XSSI_PREFIX, decode_payload, place_url,
+)
+from snapshot_archive import SnapshotArchive, reextract
+
+CID = '0x3e2f03a1b2c3d4e5:0x8b1f2e3d4c5b6a79'
+
+
+def make_place(cid=CID, name='Alpha Dental Clinic', phone='011 234 5678', full_address='King Fahd Rd, Riyadh'):
+    """Synthetic place array with values only at the decoder's documented indexes"""
+    place = [None] * (IDX_PHONE + 1)
+    place[IDX_ADDRESS_LINES] = ['King Fahd Rd', 'Riyadh']
+    place[IDX_RATING_BLOCK] = [None] * 7 + [4.6, 128]
+    place[IDX_WEBSITE] = ['/url?q=https://alpha.example.sa/&opi=1', 'alpha.example.sa']
+    place[IDX_COORDS] = [None, None, 24.7136, 46.6753]
+    place[IDX_CID] = cid
+    place[IDX_NAME] = name
+    place[IDX_CATEGORIES] = ['Dental clinic', 'Dentist']
+    place[IDX_FULL_ADDRESS] = full_address
+    place[IDX_PHONE] = [[phone, '+966112345678']] if phone else None
+    return place
+
+
+def search_payload(*places):
+    """Search response: places nested a few levels down, after the XSSI prefix"""
+    return XSSI_PREFIX + json.dumps([['riyadh dentist', [[None, list(place)] for place in places]]])
+
+
+def test_decodes_the_documented_fields():
+    record = decode_payload(search_payload(make_place()))[CID]
+    assert record.name == 'Alpha Dental Clinic'
+    assert record.phone == '011 234 5678'
+    assert (record.latitude, record.longitude) == (24.7136, 46.6753)
+    assert (record.rating, record.review_count) == (4.6, 128)
+    assert record.website == 'https://alpha.example.sa/'
+    assert record.category == 'Dental clinic'
+    assert record.address == 'King Fahd Rd, Riyadh'
+    assert record.url == place_url(make_place())
+
+
+def test_missing_fields_fall_back_or_stay_empty():
+    record = decode_payload(search_payload(make_place(phone=None, full_address=None)))[CID]
+    assert record.phone is None
+    assert record.address == 'King Fahd Rd, Riyadh'  # From the address lines
+
+
+def test_place_preview_wrapper_and_several_places():
+    other = '0x3e2f03a1b2c3d4e5:0x0000000000000001'
+    text = json.dumps({'d': search_payload(make_place(), make_place(cid=other, name='Beta Clinic'))})
+    records = decode_payload(text)
+    assert sorted(records) == sorted([CID, other])
+    assert records[other].name == 'Beta Clinic'
+
+
+def test_garbage_input_gives_no_records():
+    for text in ('', 'not json', XSSI_PREFIX + '[1, 2', '{"d": 5}', '{"x": 1}', XSSI_PREFIX + '[[1, "a"], []]',
+                 XSSI_PREFIX + json.dumps([make_place(cid='not-a-feature-id')])):
+        assert decode_payload(text) == {}
+
+
+def test_reextract_reports_a_place_missing_from_its_payload(tmp_path):
+    archive = SnapshotArchive(str(tmp_path))
+    digest = archive.put(search_payload(make_place()))
+    archive.close()
+    job = {'directory': str(tmp_path), 'place': None, 'website': [],
+           'payload': (digest, 'https://www.google.com/maps/place/data=!1s0x1:0x2')}
+    assert reextract(job) == (None, 'not_in_payload')
+
+    job['payload'] = (digest, place_url(make_place()))
+    record, failure = reextract(job)
+    assert failure is None and record.name == 'Alpha Dental Clinic'
@@ -0,0 +1,60 @@
+import pandas as pd
+from openpyxl import Workbook
+
+from exporter import COLUMNS_MAP
+from merge_exports import KeyIndex, add_keys, merge
+
+
+def frame(rows):
+    return pd.DataFrame.from_records(rows).reindex(columns=list(COLUMNS_MAP))
+
+
+def test_name_geo_key_does_not_depend_on_the_coordinate_dtype():
+    integers = add_keys(frame([{'name': 'Cafe Three', 'latitude': 1, 'longitude': 2}]))
+    floats = add_keys(frame([{'name': 'Cafe Three', 'latitude': '1.0', 'longitude': '2.0'}]))
+    assert integers['name_geo_key'][0] == floats['name_geo_key'][0] == 'cafe three@1.000,2.000'
+
+
+def test_keys_follow_the_record_rules():
+    df = add_keys(frame([{
+        'name': 'Alpha Cafe!',
+        'phone': '+966 011 234 5678',
+        'url': 'https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x15c3d1:0xabc123!8m2',
+    }]))
+    assert df['place_key'][0] == '0x15c3d1:0xabc123'
+    assert df['phone_key'][0] == '112345678'
+    assert df['name_geo_key'][0] == 'alpha cafe@'
+
+
+def test_key_index_drops_duplicates_within_and_across_chunks():
+    index = KeyIndex()
+    first = index.filter(add_keys(frame([
+        {'name': 'Cafe One', 'phone': '0112345678'},
+        {'name': 'Cafe Two', 'phone': '0112345678'},  # Same phone as Cafe One
+        {'name': 'Cafe Three', 'latitude': 1.0, 'longitude': 2.0},
+    ])))
+    second = index.filter(add_keys(frame([
+        {'name': 'Cafe Three', 'latitude': 1, 'longitude': 2},
+        {'name': 'Cafe Four', 'phone': '0119999999'},
+    ])))
+    assert list(first['name']) == ['Cafe One', 'Cafe Three']
+    assert list(second['name']) == ['Cafe Four']
+
+
+def test_merge_dedupes_the_same_businesses_across_xlsx_and_csv(tmp_path):
+    rows = [
+        {'name': f'Cafe {number}', 'phone': f'01100000{number:02d}', 'latitude': number, 'longitude': number + 1}
+        for number in range(1, 6)
+    ]
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(list(COLUMNS_MAP.values()))
+    for row in rows:
+        sheet.append([row.get(field) for field in COLUMNS_MAP])
+    workbook.save(tmp_path / 'a.xlsx')
+    # Same businesses, float coordinates and no phone - only the name/geo key matches
+    frame([dict(row, phone=None, latitude=float(row['latitude'])) for row in rows]).rename(
+        columns=COLUMNS_MAP).to_csv(tmp_path / 'b.csv', index=False)
+
+    counts = merge([tmp_path / 'a.xlsx', tmp_path / 'b.csv'], tmp_path / 'master.csv', chunk_size=2)
+    assert counts == {'files': 2, 'read': 10, 'written': 5}
@@ -0,0 +1,12 @@
+from models import extract_place_id
+
+
+def test_extract_place_id_keeps_both_halves_of_the_feature_id():
+    url = "https://www.google.com/maps/place/Cafe/data=!4m7!3m6!1s0x15c3d1:0xabc123!8m2!3d24.7!4d46.6"
+    assert extract_place_id(url) == "0x15c3d1:0xabc123"
+
+
+def test_places_sharing_the_first_half_get_distinct_ids():
+    first = "https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x15c3d1:0xabc123!8m2"
+    second = "https://www.google.com/maps/place/B/data=!4m7!3m6!1s0x15c3d1:0xdef456!8m2"
+    assert extract_place_id(first) != extract_place_id(second)
@@ -0,0 +1,52 @@
+import csv
+
+from models import BusinessRecord
+from result_store import ResultStore, geohash_encode
+
+CAMPAIGN = {'business_tag': 'Dental Clinic', 'region': 'Riyadh Region', 'city': 'Riyadh', 'run_id': 'run-1'}
+
+
+def place(cid, name, phone=None, emails=(), website=None, latitude=24.7136, longitude=46.6753):
+    return BusinessRecord(
+        name=name, phone=phone, emails=emails, website=website, latitude=latitude, longitude=longitude,
+        url=f'https://www.google.com/maps/place/data=!4m2!3m1!1s{cid}',
+    )
+
+
+def test_geohash_encode_matches_the_reference_values():
+    assert geohash_encode(57.64911, 10.40744, precision=11) == 'u4pruydqqvj'
+    assert geohash_encode(0.0, 0.0, precision=5) == 's0000'
+    assert geohash_encode(-90.0, -180.0, precision=3) == '000'
+
+
+def test_store_filters_and_replaces_by_place_and_campaign(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.db'), batch_size=2)
+    store.add(place('0x1:0xa', 'Alpha Dental', phone='+966 11 234 5678', emails=('info@alpha.sa',)), CAMPAIGN)
+    store.add(place('0x1:0xb', 'Beta Dental', website='https://beta.sa'), CAMPAIGN)
+    store.add(place('0x2:0xc', 'Gamma Dental', latitude=21.5433, longitude=39.1728), dict(CAMPAIGN, city='Jeddah'))
+    # Same place and campaign again - replaces, does not duplicate
+    store.add(place('0x1:0xa', 'Alpha Dental Clinic', phone='0112345678'), CAMPAIGN)
+
+    assert store.count() == 3
+    assert store.count(city='riyadh') == 2  # Campaign columns are case-insensitive
+    assert store.count(has_email=True) == 0  # The newer Alpha record has no email
+    assert store.count(has_website=True) == 1
+    assert [r.name for r in store.query(phone='+966112345678')] == ['Alpha Dental Clinic']
+    assert [r.name for r in store.query(geohash_prefix=geohash_encode(21.5433, 39.1728)[:5])] == ['Gamma Dental']
+    assert [r.name for r in store.query(name_contains='beta')] == ['Beta Dental']
+    assert len(store.query(page=2, page_size=2)) == 1
+
+    written = store.export(str(tmp_path / 'riyadh.csv'), city='Riyadh')
+    with open(tmp_path / 'riyadh.csv', encoding='utf-8-sig') as f:
+        rows = list(csv.DictReader(f))
+    assert written == len(rows) == 2
+    assert {row['place_id'] for row in rows} == {'0x1:0xa', '0x1:0xb'}
+    store.close()
+
+
+def test_store_keeps_places_that_share_the_first_half_of_their_id(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.db'))
+    store.add(place('0x15c3d1:0xabc123', 'Cafe One'), CAMPAIGN)
+    store.add(place('0x15c3d1:0xdef456', 'Cafe Two'), CAMPAIGN)
+    assert store.count() == 2
+    store.close()
@@ -0,0 +1,63 @@
+import asyncio
+
+import scraper
+from config import PLACE_MAX_RETRIES
+from models import BusinessRecord
+from scraper import (
+    FAILURE_BLOCKED, FAILURE_CRASH, FAILURE_ERROR, FAILURE_SELECTOR, FAILURE_TIMEOUT,
+    GoogleMapsScraper, PlaceExtractionError, classify_failure,
+)
+
+
+class TimeoutError(Exception):
+    """Stands in for playwright's TimeoutError (matched by name)"""
+
+
+def test_classify_failure():
+    assert classify_failure(PlaceExtractionError(FAILURE_BLOCKED)) == FAILURE_BLOCKED
+    assert classify_failure(TimeoutError('Timeout 25000ms exceeded')) == FAILURE_TIMEOUT
+    assert classify_failure(asyncio.TimeoutError()) == FAILURE_TIMEOUT
+    assert classify_failure(RuntimeError('Target closed')) == FAILURE_CRASH
+    assert classify_failure(RuntimeError('Page crashed')) == FAILURE_CRASH
+    assert classify_failure(ValueError('boom')) == FAILURE_ERROR
+
+
+def url(cid):
+    return f'https://www.google.com/maps/place/data=!4m2!3m1!1s{cid}'
+
+
+def test_transient_failures_are_retried_and_the_rest_dead_lettered(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scraper, 'PLACE_RETRY_BASE_DELAY', 0.0)
+    engine = GoogleMapsScraper()
+    engine.store = None
+    session = engine.new_session()
+    attempts = {}
+    errors = {
+        '0x1:0x2': [],                                          # Works at once
+        '0x1:0x3': [TimeoutError('slow')],                      # Works on the retry
+        '0x1:0x4': [PlaceExtractionError(FAILURE_SELECTOR)],    # Not transient - no retry
+        '0x1:0x5': [PlaceExtractionError(FAILURE_BLOCKED)] * 10,  # Retried until the limit
+    }
+
+    async def process_place(session, place_url, delay=0.0):
+        cid = scraper.place_cid(place_url)
+        attempt = attempts[cid] = attempts.get(cid, 0) + 1
+        if attempt <= len(errors[cid]):
+            raise errors[cid][attempt - 1]
+        return BusinessRecord(name=f'Cafe {cid}', url=place_url)
+
+    engine._process_place = process_place
+
+    async def run():
+        session.reset({'business_tag': 'Cafe', 'city': 'Riyadh'})
+        return await engine._process_urls(session, [url(cid) for cid in errors] + [url('0x1:0x2')])
+
+    extracted = asyncio.run(run())
+
+    assert extracted == 2
+    assert sorted(record.place_id for record in session.results) == ['0x1:0x2', '0x1:0x3']
+    assert attempts == {'0x1:0x2': 1, '0x1:0x3': 2, '0x1:0x4': 1, '0x1:0x5': PLACE_MAX_RETRIES + 1}
+    dead = {scraper.place_cid(item['url']): (item['kind'], item['attempts']) for item in session.dead_letters}
+    assert dead == {'0x1:0x4': (FAILURE_SELECTOR, 1), '0x1:0x5': (FAILURE_BLOCKED, PLACE_MAX_RETRIES + 1)}
+    assert session.meter.done == 4
@@ -0,0 +1,38 @@
+import asyncio
+
+from config import SELECTOR_STALE_MISSES
+from offline_page import OfflinePage
+from scraper import read_place_details
+from selector_stats import SelectorStats
+
+NO_PHONE = '<div role="main"><h1 class="DUwDvf">Quiet Cafe</h1></div>'
+TEL_LINK = '<div role="main"><h1>Call Cafe</h1><a href="tel:+966112345678">Call</a></div>'
+
+
+def read(html, stats):
+    return asyncio.run(read_place_details(OfflinePage(html, 'https://www.google.com/maps/place/x'), stats))
+
+
+def test_places_without_a_phone_do_not_count_as_selector_misses(tmp_path):
+    stats = SelectorStats(str(tmp_path))
+    for _ in range(SELECTOR_STALE_MISSES + 2):
+        assert read(NO_PHONE, stats).phone is None
+    assert 'phone' not in stats.fields
+    assert 'address' not in stats.fields
+    assert stats.stale() == []
+
+
+def test_a_selector_missing_a_present_field_is_recorded(tmp_path):
+    stats = SelectorStats(str(tmp_path))
+    assert read(TEL_LINK, stats).phone == '+966112345678'
+    phone = stats.fields['phone']
+    assert phone['button[data-item-id*="phone"]']['misses'] == 1
+    assert phone['a[href^="tel:"]']['hits'] == 1
+
+
+def test_record_field_keeps_required_field_misses(tmp_path):
+    stats = SelectorStats(str(tmp_path))
+    stats.record_field('name', [('h1', False)])
+    stats.record_field('phone', [('a', False), ('b', False)], optional=True)
+    assert stats.fields['name']['h1']['misses_in_row'] == 1
+    assert 'phone' not in stats.fields
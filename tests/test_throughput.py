@@ -0,0 +1,61 @@
+import pytest
+
+import throughput
+from throughput import ThroughputMeter, format_duration
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(throughput.time, 'monotonic', clock)
+    return clock
+
+
+def test_rate_and_eta(clock):
+    meter = ThroughputMeter(window=60)
+    meter.add_queued(100)
+    for _ in range(10):
+        clock.now += 3
+        meter.place_finished()
+    snapshot = meter.snapshot()  # 10 places in 30 s
+    assert snapshot['places_per_min'] == pytest.approx(20)
+    assert snapshot['done'] == 10
+    assert snapshot['eta_seconds'] == pytest.approx(90 / 20 * 60)
+
+
+def test_rate_only_counts_the_window(clock):
+    meter = ThroughputMeter(window=60)
+    meter.add_queued(10)
+    for _ in range(5):
+        meter.place_finished()
+    clock.now += 120  # All five finished before the window
+    assert meter.places_per_minute() == 0
+    assert meter.snapshot()['eta_seconds'] is None
+
+
+def test_no_eta_when_nothing_is_left_and_stage_averages(clock):
+    meter = ThroughputMeter(window=60)
+    meter.add_queued(1)
+    clock.now += 10
+    meter.place_finished()
+    meter.record_place(2.0)
+    meter.record_place(4.0)
+    snapshot = meter.snapshot()
+    assert snapshot['eta_seconds'] is None
+    assert snapshot['place_seconds'] == 3.0
+    assert snapshot['website_seconds'] is None
+
+
+def test_format_duration():
+    assert format_duration(None) == '-'
+    assert format_duration(42.7) == '42s'
+    assert format_duration(430) == '7m 10s'
+    assert format_duration(3900) == '1h 05m'
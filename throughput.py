@@ -0,0 +1,75 @@
+"""Live run throughput - places/min over a moving window, progress, ETA and stage latencies"""
+
+import time
+from collections import deque
+from typing import Dict, Optional
+from config import *
+
+LATENCY_SAMPLES = 50  # Recent samples averaged per stage
+
+
+class ThroughputMeter:
+    """Counters the engine bumps per place; snapshot() is what the UI panel shows"""
+
+    def __init__(self, window: float = THROUGHPUT_WINDOW):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.queued = 0
+        self.done = 0
+        self._finished = deque()  # monotonic time of each finished place
+        self._place = deque(maxlen=LATENCY_SAMPLES)
+        self._website = deque(maxlen=LATENCY_SAMPLES)
+
+    def add_queued(self, count: int):
+        self.queued += count
+
+    def place_finished(self):
+        """A queued place is done (extracted, duplicate or given up)"""
+        self.done += 1
+        self._finished.append(time.monotonic())
+
+    def record_place(self, seconds: float):
+        self._place.append(seconds)
+
+    def record_website(self, seconds: float):
+        self._website.append(seconds)
+
+    @staticmethod
+    def _average(samples: deque) -> Optional[float]:
+        return sum(samples) / len(samples) if samples else None
+
+    def places_per_minute(self) -> float:
+        now = time.monotonic()
+        while self._finished and self._finished[0] < now - self.window:
+            self._finished.popleft()
+        span = min(self.window, now - self.started)
+        return len(self._finished) / span * 60 if span > 0 else 0.0
+
+    def snapshot(self) -> Dict:
+        """Plain dict (safe to send between processes)"""
+        rate = self.places_per_minute()
+        remaining = max(0, self.queued - self.done)
+        return {
+            'places_per_min': rate,
+            'queued': self.queued,
+            'done': self.done,
+            'eta_seconds': remaining / rate * 60 if rate and remaining else None,
+            'place_seconds': self._average(self._place),
+            'website_seconds': self._average(self._website),
+            'elapsed_seconds': time.monotonic() - self.started,
+        }
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """'7m 10s' / '1h 05m' - '-' when unknown"""
+    if seconds is None:
+        return '-'
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
@@ -0,0 +1,179 @@
+"""Host the scraper engine in a child process and stream its events to the UI over a queue"""
+
+import asyncio
+import atexit
+import multiprocessing as mp
+import queue
+from typing import Any, List, Tuple
+from config import *
+
+# Commands sent to the engine process: (command, params, run_id)
+# Events sent from the engine process: (kind, payload, run_id) - run_id of the command that produced them
+EVENT_STATUS = 'status'       # payload: status message
+EVENT_DATA = 'data'           # payload: BusinessRecord
+EVENT_ENRICHED = 'enriched'   # payload: (list-only record url, full BusinessRecord)
+EVENT_ERROR = 'error'         # payload: error message
+EVENT_COMPLETE = 'complete'   # payload: number of results
+EVENT_METRICS = 'metrics'     # payload: ThroughputMeter.snapshot() dict
+
+
+async def _watch_cancel(cancelled_run, run_id, scraper):
+    """Translate a cancel of this run (shared cancelled run id) into scraper.stop()"""
+    while cancelled_run.value < run_id:
+        await asyncio.sleep(0.1)
+    scraper.stop()
+
+
+async def _stream_metrics(emit, session):
+    """Send the throughput snapshot at a fixed rate while a command runs"""
+    while True:
+        await asyncio.sleep(THROUGHPUT_REFRESH_INTERVAL)
+        emit(EVENT_METRICS, session.meter.snapshot())
+
+
+async def _serve(commands, events, cancelled_run):
+    from scraper import GoogleMapsScraper
+
+    scraper = GoogleMapsScraper()
+    session = scraper.session
+    # The UI holds the results - the engine only streams them
+    session.keep_results = False
+    found = 0
+    run_id = 0
+
+    def emit(kind, payload):
+        events.put((kind, payload, run_id))
+
+    def on_data(record):
+        nonlocal found
+        found += 1
+        emit(EVENT_DATA, record)
+
+    session.on_status_update = lambda message: emit(EVENT_STATUS, message)
+    session.on_data_found = on_data
+
+    def on_enriched(url, record):
+        nonlocal found
+        found += 1
+        emit(EVENT_ENRICHED, (url, record))
+
+    session.on_record_enriched = on_enriched
+
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            command, params, command_run = await loop.run_in_executor(None, commands.get)
+            if command == 'shutdown':
+                break
+            if command not in ('search', 'enrich'):
+                continue
+
+            found = 0
+            run_id = command_run
+            if cancelled_run.value >= run_id:
+                # Stopped before the engine got to it (e.g. while the process was starting)
+                emit(EVENT_COMPLETE, found)
+                continue
+            watcher = asyncio.create_task(_watch_cancel(cancelled_run, run_id, scraper))
+            metrics = asyncio.create_task(_stream_metrics(emit, session))
+            try:
+                if command == 'enrich':
+                    await scraper.enrich(params['urls'])
+                else:
+                    await scraper.search(**params)
+            except Exception as e:
+                emit(EVENT_ERROR, f"{command.capitalize()} error: {e}")
+            finally:
+                watcher.cancel()
+                metrics.cancel()
+            emit(EVENT_METRICS, session.meter.snapshot())
+            emit(EVENT_COMPLETE, found)
+    finally:
+        await scraper.close()
+
+
+def _worker_main(commands, events, cancelled_run):
+    """Entry point of the engine process - keeps one browser warm across searches"""
+    asyncio.run(_serve(commands, events, cancelled_run))
+
+
+class ScraperWorker:
+    """UI-side handle to the engine process"""
+
+    def __init__(self):
+        self._mp = mp.get_context('spawn')
+        self.process = None
+        self.commands = None
+        self.events = None
+        # Highest run id the UI cancelled - a cancel sent before the engine took
+        # the command still applies when the run starts
+        self.cancelled_run = None
+        self.run_id = 0  # Id of the last command sent - events of older commands are dropped
+        atexit.register(self.shutdown)
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self):
+        """Spawn the engine process if it is not running"""
+        if self.is_alive():
+            return
+        self.commands = self._mp.Queue()
+        self.events = self._mp.Queue()
+        self.cancelled_run = self._mp.Value('q', 0)
+        self.process = self._mp.Process(
+            target=_worker_main,
+            args=(self.commands, self.events, self.cancelled_run),
+            name='scraper-engine',
+            daemon=True,
+        )
+        self.process.start()
+
+    def search(self, business_tag: str, region: str, city: str, district: str = "",
+               list_only: bool = False):
+        """Queue a search in the engine process"""
+        self._send('search', {
+            'business_tag': business_tag,
+            'region': region,
+            'city': city,
+            'district': district,
+            'list_only': list_only,
+        })
+
+    def enrich(self, urls: List[str]):
+        """Queue full extraction of places picked from a list-only search"""
+        self._send('enrich', {'urls': list(urls)})
+
+    def _send(self, command: str, params: dict):
+        self.start()
+        self.run_id += 1
+        self.commands.put((command, params, self.run_id))
+
+    def cancel(self):
+        """Ask the running search to stop"""
+        if self.cancelled_run is not None:
+            self.cancelled_run.value = self.run_id
+
+    def drain(self, max_items: int = UI_EVENT_BATCH) -> List[Tuple[str, Any]]:
+        """Return up to max_items pending (kind, payload) events of the current command without blocking"""
+        batch = []
+        if self.events is None:
+            return batch
+        while len(batch) < max_items:
+            try:
+                kind, payload, run_id = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if run_id == self.run_id:
+                batch.append((kind, payload))
+        return batch
+
+    def shutdown(self, timeout: float = 5.0):
+        """Close the engine's browser and stop the process"""
+        if not self.is_alive():
+            return
+        self.cancel()
+        self.commands.put(('shutdown', None, self.run_id))
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()